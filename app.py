@@ -1,18 +1,33 @@
 import streamlit as st
-import pandas as pd
-import base64
 import requests
 import urllib3
-from urllib.parse import quote, urlparse
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
 from datetime import datetime, timedelta, time as dt_time, timezone
 import json
 import os
 import re
 import time
 import logging
-from github import Github
-import concurrent.futures
+import plotly.graph_objects as go
+from article_extractor import extract_bodies
+from endpoints import GEMINI_API_BASE
+from gemini_cache import get_gemini_cache
+from gemini_stream import iter_sse_chunks, stream_url
+from github_store import Batch, GitHubStore
+from history_codec import decode_document
+from history_store import (MANIFEST_FILE, MAX_HISTORY, SEARCH_INDEX_FILE, SEEN_INDEX_FILE, TRENDS_FILE, load_entry,
+                           load_legacy, load_manifest, stage_entry)
+from link_resolver import resolve_article_links
+from model_router import classify_status, get_model_router
+from news_collector import collect_news
+from news_dedupe import dedupe_articles
+from news_window import TimeWindow
+from prompt_packer import PROMPT_TOKEN_BUDGET, format_news_context, pack_news_context
+from retry_policy import GEMINI_RETRY, classify_exception
+from search_index import SearchIndex
+from seen_index import SeenIndex
+from sqlite_store import HISTORY_BACKEND, SqliteStore
+from trend_rollup import TrendRollup
 
 # ==========================================
 # 로깅 설정
@@ -30,11 +45,12 @@ st.set_page_config(layout="wide", page_title="Semi-Insight Hub", page_icon="💠
 
 DAILY_REPORT = "Daily Report"
 KEYWORD_FILE = 'keywords.json'
-HISTORY_FILE = 'daily_history.json'
-MAX_HISTORY = 30   # 아카이브 최대 보관 수 (generate_report.py와 동일하게 유지)
 NEWS_LIMIT = 40    # 기사 제목 40건은 입력 토큰 몇 천 개 수준 → 무료 티어에서도 여유 있음.
                     # 과거 응답 절단 문제의 실제 원인은 기사 수가 아니라 gemini-2.5의
                     # "thinking" 토큰이 출력 예산을 잠식한 것이었고 thinkingBudget=0으로 해결됨.
+STREAM_RENDER_INTERVAL = 0.15  # 스트리밍 중간 결과 다시 그리는 최소 간격(초)
+STREAM_PROBE_CHARS = 600       # 이 길이까지 "##" 섹션 제목이 없으면 형식 이탈로 보고 중단
+APP_GEMINI_BUDGET = 180        # 수동 생성 1회의 Gemini 호출 시간 예산(초, 재시도·대기 포함)
 
 # [수정] api_key 전역 기본값 선언 → NameError 방지
 api_key = ""
@@ -44,6 +60,8 @@ api_key = ""
 # ==========================================
 if "dark_mode" not in st.session_state:
     st.session_state.dark_mode = False
+if "extract_bodies" not in st.session_state:
+    st.session_state.extract_bodies = False
 
 # ── 테마별 토큰 (hex 고정값, CSS 변수 미사용) ──────────
 def get_theme():
@@ -162,36 +180,51 @@ def _inject_css(t):
 _inject_css(T)
 
 # ==========================================
-# 1. 데이터 관리 (GitHub Auto-Sync)
+# 1. 데이터 관리 (GitHub Auto-Sync / 자체 호스팅은 SQLite)
 # ==========================================
-def sync_to_github(filename, content_data):
+@st.cache_resource
+def _history_store():
+    """세션 간 공유하는 저장소 핸들: HISTORY_BACKEND=sqlite면 로컬 SQLite(HISTORY_DB),
+    아니면 GitHub 클라이언트·repo 핸들 (Secrets 미설정 시 None)"""
+    if HISTORY_BACKEND == "sqlite":
+        return SqliteStore()
     if "GITHUB_TOKEN" not in st.secrets or "REPO_NAME" not in st.secrets:
-        return False
+        return None
+    return GitHubStore(st.secrets["GITHUB_TOKEN"], st.secrets["REPO_NAME"])
+
+def commit_to_store(batch, message):
+    """batch의 파일 변경을 커밋 1개로. 반환: 경로 → 커밋된 내용 (미설정/실패 시 None)"""
+    store = _history_store()
+    if store is None:
+        return None
     try:
-        g = Github(st.secrets["GITHUB_TOKEN"])
-        repo = g.get_repo(st.secrets["REPO_NAME"])
-        content_str = json.dumps(content_data, ensure_ascii=False, indent=4, default=str)
-        try:
-            contents = repo.get_contents(filename)
-            repo.update_file(contents.path, f"Update {filename}", content_str, contents.sha)
-        except Exception:
-            repo.create_file(filename, f"Create {filename}", content_str)
-        return True
+        return store.commit(batch, message)
     except Exception as e:
-        logger.warning(f"GitHub sync error [{filename}]: {e}")
-        return False
+        logger.warning(f"Commit error [{message}]: {e}")
+        return None
+
+def sync_to_github(filename, content_data):
+    batch = Batch()
+    batch.put(filename, content_data)
+    return commit_to_store(batch, f"Update {filename}") is not None
+
+def _merge_categories(data, loaded):
+    """Daily Report 외 카테고리(기술 동향 등)도 유지 → 키워드 저장 시 다른 카테고리가 지워지지 않도록"""
+    for category, kws in loaded.items():
+        if category != DAILY_REPORT and isinstance(kws, list):
+            data[category] = kws
 
 def load_keywords():
     data = {DAILY_REPORT: []}
-    if "GITHUB_TOKEN" in st.secrets:
+    store = _history_store()
+    if store is not None:
         try:
-            g = Github(st.secrets["GITHUB_TOKEN"])
-            repo = g.get_repo(st.secrets["REPO_NAME"])
-            contents = repo.get_contents(KEYWORD_FILE)
-            loaded = json.loads(contents.decoded_content.decode("utf-8"))
-            if DAILY_REPORT in loaded:
-                data[DAILY_REPORT] = loaded[DAILY_REPORT]
-            return data
+            loaded = store.read_json(KEYWORD_FILE, None, strict=True)
+            if loaded is not None:
+                if DAILY_REPORT in loaded:
+                    data[DAILY_REPORT] = loaded[DAILY_REPORT]
+                _merge_categories(data, loaded)
+                return data
         except Exception as e:
             logger.warning(f"GitHub keyword load error: {e}")
     if os.path.exists(KEYWORD_FILE):
@@ -200,6 +233,7 @@ def load_keywords():
                 loaded = json.load(f)
             if DAILY_REPORT in loaded:
                 data[DAILY_REPORT] = loaded[DAILY_REPORT]
+            _merge_categories(data, loaded)
         except Exception as e:
             logger.warning(f"Local keyword load error: {e}")
     if not data.get(DAILY_REPORT):
@@ -214,102 +248,131 @@ def save_keywords(data):
         logger.warning(f"Local keyword save error: {e}")
     sync_to_github(KEYWORD_FILE, data)
 
-def load_daily_history_from_source():
-    if "GITHUB_TOKEN" in st.secrets:
+def _read_local(filename, default):
+    if os.path.exists(filename):
         try:
-            g = Github(st.secrets["GITHUB_TOKEN"])
-            repo = g.get_repo(st.secrets["REPO_NAME"])
-            contents = repo.get_contents(HISTORY_FILE)
-            if contents.encoding == "none":
-                # Contents API는 1MB 초과 파일에 inline content를 주지 않음(encoding="none").
-                # 이 경우 decoded_content가 예외를 던지므로 Git Blob API로 원본을 다시 조회한다.
-                blob = repo.get_git_blob(contents.sha)
-                raw = base64.b64decode(blob.content)
-                return json.loads(raw.decode("utf-8"))
-            return json.loads(contents.decoded_content.decode("utf-8"))
+            with open(filename, 'r', encoding='utf-8') as f:
+                return decode_document(json.load(f))
         except Exception as e:
-            logger.warning(f"GitHub history load error: {e}")
-    if os.path.exists(HISTORY_FILE):
+            logger.warning(f"Local load error [{filename}]: {e}")
+    return default
+
+def _read_json(filename, default, strict=False):
+    """GitHub → (없거나 실패 시) 로컬 파일. strict=True면 GitHub의 '파일 없음'(404) 외 오류는 예외로 올림"""
+    store = _history_store()
+    if store is not None:
         try:
-            with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            data = store.read_json(filename, None, strict=True)
+            if data is not None:
+                return data
         except Exception as e:
-            logger.warning(f"Local history load error: {e}")
-    return []
+            if strict:
+                raise
+            logger.warning(f"GitHub load error [{filename}]: {e}")
+    return _read_local(filename, default)
+
+def _apply_locally(batch, committed=None):
+    """batch를 로컬 파일에도 반영 (GitHub 미설정 시 유일한 저장소). 반환: 경로 → 저장한 내용.
+    committed(커밋된 내용)가 있으면 그대로 쓰고, 없을 때만 update를 로컬 파일 기준으로 다시 계산
+    (로컬 사본이 없는 새 컨테이너에서 검색 색인·트렌드를 전체 재생성하지 않도록)"""
+    if committed is not None:
+        contents = dict(committed)
+    else:
+        contents = dict(batch.puts)
+        for path, fn in batch.updates.items():
+            contents[path] = fn(_read_local(path, None))
+    for path, data in contents.items():
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=4, default=str)
+        except Exception as e:
+            logger.warning(f"Local save error [{path}]: {e}")
+    for path in batch.deletes:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except Exception as e:
+            logger.warning(f"Local delete error [{path}]: {e}")
+    return contents
+
+def _read_history_file(filename, default):
+    return _read_json(filename, default, strict=True)
+
+def load_daily_history_from_source():
+    """아카이브 목록(manifest)만 로드 - 리포트 본문은 load_history_entry로 필요할 때"""
+    return load_manifest(_read_json)
 
 # ==========================================
 # Session State 초기화
 # ==========================================
 if 'keywords' not in st.session_state:
     st.session_state.keywords = load_keywords()
-if 'daily_history' not in st.session_state:
-    st.session_state.daily_history = load_daily_history_from_source()
+if 'history_manifest' not in st.session_state:
+    st.session_state.history_manifest = load_daily_history_from_source()
+if 'history_entries' not in st.session_state:
+    st.session_state.history_entries = {}   # 날짜 → 불러온 리포트 전체 항목
+if 'search_index' not in st.session_state:
+    st.session_state.search_index = None    # 아카이브 검색창을 처음 쓸 때 로드
+if 'trend_rollup' not in st.session_state:
+    st.session_state.trend_rollup = None    # 트렌드 탭을 처음 그릴 때 로드
+if 'legacy_history' not in st.session_state:
+    st.session_state.legacy_history = None  # 이전 전 daily_history.json 항목 (날짜 파일이 없을 때 1회 로드)
+
+def load_history_entry(date_str):
+    entries = st.session_state.history_entries
+    if entries.get(date_str) is None:
+        if st.session_state.legacy_history is None:
+            st.session_state.legacy_history = load_legacy(_read_json)
+        entries[date_str] = load_entry(_read_json, date_str, st.session_state.legacy_history)
+    return entries[date_str]
 
 def save_daily_history(new_report_data):
-    current_history = [h for h in st.session_state.daily_history if h['date'] != new_report_data['date']]
-    current_history.insert(0, new_report_data)
-    current_history = current_history[:MAX_HISTORY]  # 무제한 증가 방지 (GitHub Contents API 1MB 제한 대비)
-    st.session_state.daily_history = current_history
+    date_str = new_report_data['date']
+    # 같은 날짜의 카테고리 리포트(generate_report.py가 생성)는 Daily Report만 다시 만들어도 유지
+    if any(h['date'] == date_str for h in st.session_state.history_manifest):
+        previous = load_history_entry(date_str)
+        if previous and previous.get('categories') and 'categories' not in new_report_data:
+            new_report_data = {**new_report_data, 'categories': previous['categories']}
+    # 날짜 파일 1개 + manifest를 커밋 1개로 (첫 저장 때 기존 daily_history.json 이전도 같은 커밋)
+    batch = Batch()
     try:
-        with open(HISTORY_FILE, 'w', encoding='utf-8') as f:
-            json.dump(current_history, f, ensure_ascii=False, indent=4, default=str)
+        stage_entry(_read_history_file, batch, new_report_data, MAX_HISTORY)
     except Exception as e:
-        logger.warning(f"Local history save error: {e}")
-    sync_to_github(HISTORY_FILE, current_history)
+        logger.warning(f"History save error [{date_str}]: {e}")
+        return
+    committed = commit_to_store(batch, f"Update history {date_str}")
+    # SQLite 저장소는 그 자체가 로컬 저장 → JSON 파일 사본은 GitHub 모드에서만
+    saved = _apply_locally(batch, committed) if HISTORY_BACKEND != "sqlite" else committed
+    if not saved:
+        return
+    st.session_state.history_manifest = saved[MANIFEST_FILE]
+    st.session_state.history_entries[date_str] = new_report_data
+    st.session_state.legacy_history = []    # 저장으로 이전 완료 → 기존 단일 파일은 더 읽지 않음
+    st.session_state.search_index = SearchIndex.from_json(decode_document(saved[SEARCH_INDEX_FILE]))
+    st.session_state.trend_rollup = TrendRollup.from_json(decode_document(saved[TRENDS_FILE]))
+
+def load_trend_rollup():
+    """트렌드 집계 (없으면 None - 다음 리포트 저장 때 생성됨)"""
+    if st.session_state.trend_rollup is None:
+        st.session_state.trend_rollup = TrendRollup.from_json(_read_json(TRENDS_FILE, None))
+    return st.session_state.trend_rollup
+
+def load_search_index():
+    """검색 색인 (없으면 None - 다음 리포트 저장 때 생성됨)"""
+    if st.session_state.search_index is None:
+        st.session_state.search_index = SearchIndex.from_json(_read_json(SEARCH_INDEX_FILE, None))
+    return st.session_state.search_index
 
 # ==========================================
 # 2. 뉴스 수집
 # ==========================================
-def _fetch_keyword_news(kw, per_kw_limit, days, strict_time, start_dt, end_dt):
-    """단일 키워드 RSS를 1회만 조회하여 (시간필터 통과 목록, 원본 전체 목록)을 함께 반환.
-    시간필터 결과가 부족할 때 재크롤링 없이 원본 목록을 그대로 폴백에 사용한다."""
-    url = (
-        f"https://news.google.com/rss/search?"
-        f"q={quote(kw)}+when:{days}d&hl=ko&gl=KR&ceid=KR:ko"
-    )
-    filtered, raw = [], []
-    try:
-        res = requests.get(url, timeout=5, verify=False)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.content, 'xml')
-        for item in soup.find_all('item'):
-            title = item.title.text if item.title else ""
-            if not title:
-                continue
-            link = item.link.text if item.link else ""
-            date_raw = item.pubDate.text if item.pubDate else ""
-            src = item.source.text if item.source else "Google News"
-
-            is_valid = True
-            pub_date_str_val = None
-            if strict_time and start_dt and end_dt:
-                try:
-                    pub_date = datetime.strptime(date_raw, "%a, %d %b %Y %H:%M:%S %Z")
-                    pub_date_kst = pub_date + timedelta(hours=9)
-                    pub_date_str_val = pub_date_kst.strftime("%Y-%m-%d %H:%M:%S")
-                    if not (start_dt <= pub_date_kst <= end_dt):
-                        is_valid = False
-                except Exception:
-                    is_valid = True  # 날짜 파싱 실패 시 포함
-
-            entry = {'Title': title, 'Link': link, 'Date': date_raw, 'Source': src, 'ParsedDate': pub_date_str_val}
-            if len(raw) < per_kw_limit:
-                raw.append(entry)
-            if is_valid and len(filtered) < per_kw_limit:
-                filtered.append(entry)
-            if len(filtered) >= per_kw_limit and len(raw) >= per_kw_limit:
-                break
-    except Exception as e:
-        logger.warning(f"News fetch error [kw={kw}]: {e}")
-    return filtered, raw
-
-
 def fetch_news(keywords, days=1, limit=NEWS_LIMIT, strict_time=False, start_dt=None, end_dt=None):
     """
     [수정] strict_time 조건 분리:
     - strict_time=True  → 전달받은 start_dt/end_dt 사용, 결과 부족 시 이미 수집한 뉴스로 자동 폴백(재크롤링 없음)
     - strict_time=False → 현재 시각 기준 기본 window 계산
-    키워드별 요청은 병렬로 실행해 수집 시간을 단축한다.
+    키워드는 query_planner로 OR 쿼리에 묶고, news_collector가 기사 예산 기준으로 동시 수집한다.
     """
     if not strict_time:
         # strict_time=False 일 때만 기본 window 계산 (전달 인자 무시하지 않음)
@@ -319,38 +382,32 @@ def fetch_news(keywords, days=1, limit=NEWS_LIMIT, strict_time=False, start_dt=N
             end_dt -= timedelta(days=1)
         start_dt = end_dt - timedelta(hours=18)
 
-    # [수정] per_kw_limit: 전체 limit을 키워드 수로 동적 배분
-    per_kw_limit = max(3, limit // max(len(keywords), 1))
-
-    filtered_all, raw_all = [], []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(keywords))) as executor:
-        futures = [
-            executor.submit(_fetch_keyword_news, kw, per_kw_limit, days, strict_time, start_dt, end_dt)
-            for kw in keywords
-        ]
-        for future in concurrent.futures.as_completed(futures):
-            filtered, raw = future.result()
-            filtered_all.extend(filtered)
-            raw_all.extend(raw)
-
-    def _to_df(items, sort_by_date):
-        d = pd.DataFrame(items)
-        if not d.empty:
-            d = d.drop_duplicates(subset=['Title'])
-            if sort_by_date:
-                d['TempDate'] = pd.to_datetime(d['ParsedDate'], errors='coerce')
-                d = d.sort_values(by='TempDate', ascending=False)
-                d = d.drop(columns=['TempDate'])
-        return d
-
-    df = _to_df(filtered_all, sort_by_date=strict_time)
-    if strict_time and len(df) < 5:
-        logger.warning(f"시간 필터 결과 {len(df)}건 → 폴백: 이미 수집된 뉴스 재사용")
-        df = _to_df(raw_all, sort_by_date=False)
-
-    if df.empty:
-        return []
-    return df.head(limit).to_dict('records')
+    # pubDate는 TimeWindow가 epoch로 한 번만 파싱 → 필터와 정렬에 그대로 재사용
+    window = TimeWindow(start_dt, end_dt) if strict_time and start_dt and end_dt else None
+
+    # 이전 날짜 리포트가 이미 인용한 기사는 할당량을 차지하기 전에 제외 (같은 날 재생성 시 그날 기사는 유지)
+    seen_index = SeenIndex.from_json(_read_json(SEEN_INDEX_FILE, None)) if end_dt else None
+    seen = seen_index.checker(end_dt.strftime('%Y-%m-%d')) if seen_index else None
+
+    # 우선순위별 할당량으로 수집하고, 앞 순위 요청만으로 예산이 차면 나머지는 취소 (결과 순서는 항상 키워드 순)
+    filtered_all, raw_all = collect_news(keywords, days, window, limit, deadline=5, strip_text=False,
+                                         exclude=seen)
+    if seen is not None and seen.skipped:
+        logger.info(f"최근 리포트에 인용된 기사 {seen.skipped}건 제외")
+
+    def _unique(items, sort_by_date):
+        # 재배포 기사(" - 매체명" 꼬리, 미세한 문구 차이)까지 근사 중복으로 묶어 대표 1건만 남김
+        unique = dedupe_articles(items)
+        if sort_by_date and window:
+            unique = window.sort_recent_first(unique)
+        return unique
+
+    result = _unique(filtered_all, sort_by_date=strict_time)
+    if strict_time and len(result) < 5:
+        logger.warning(f"시간 필터 결과 {len(result)}건 → 폴백: 이미 수집된 뉴스 재사용")
+        result = _unique(raw_all, sort_by_date=False)
+
+    return result[:limit]
 
 # ==========================================
 # 3. AI 리포트 생성
@@ -358,7 +415,7 @@ def fetch_news(keywords, days=1, limit=NEWS_LIMIT, strict_time=False, start_dt=N
 @st.cache_data(ttl=3600)
 def get_available_models(api_key):
     """[수정] @st.cache_data(ttl=3600) 추가 → 매번 API 호출 방지"""
-    url = f"https://generativelanguage.googleapis.com/v1beta/models?key={api_key}"
+    url = f"{GEMINI_API_BASE}/models?key={api_key}"
     try:
         res = requests.get(url, timeout=10)
         if res.status_code == 200:
@@ -398,7 +455,41 @@ def inject_links_to_report(report_text, news_data):
         return match.group(0)
     return re.sub(r'\[(\d+)\]', replace_match, report_text)
 
-def generate_report_with_citations(api_key, news_data):
+def _post_report(url, headers, data, timeout=60):
+    """generateContent 단건 호출 → (응답 텍스트 또는 None, finishReason) (200이 아니면 HTTPError)"""
+    response = requests.post(url, headers=headers, json=data, timeout=timeout)
+    response.raise_for_status()
+    res_json = response.json()
+    if 'candidates' in res_json and res_json['candidates']:
+        candidate = res_json['candidates'][0]
+        return candidate['content']['parts'][0]['text'], candidate.get('finishReason')
+    return None, None
+
+def _stream_report(url, headers, data, on_text, timeout=30, stop_at=None):
+    """streamGenerateContent(SSE) 호출 → (누적 텍스트 또는 None, finishReason) (200이 아니면 HTTPError).
+    조각이 올 때마다 on_text(누적 텍스트)로 중간 결과를 그리고, 구조가 어긋나면 조기 중단.
+    timeout은 조각 사이 대기 한도일 뿐이므로, 조각이 계속 와도 stop_at(monotonic)이 지나면 Timeout으로 중단."""
+    with requests.post(url, headers=headers, json=data, stream=True, timeout=(10, timeout)) as response:
+        response.raise_for_status()
+        text, finish_reason, last_render = "", None, 0.0
+        for chunk in iter_sse_chunks(response):
+            text += chunk.text
+            finish_reason = chunk.finish_reason or finish_reason
+            if len(text) >= STREAM_PROBE_CHARS and "##" not in text:
+                # 섹션 제목 없이 길어지면 보고서 형식이 아님 → 끝까지 받지 않고 재시도
+                logger.warning(f"스트리밍 응답에 섹션 구조 없음 ({len(text)} chars) → 중단")
+                break
+            now = time.monotonic()
+            if stop_at is not None and now >= stop_at and not finish_reason:
+                raise requests.Timeout(f"스트리밍 응답이 시간 예산 안에 끝나지 않음 ({len(text)} chars)")
+            if now - last_render >= STREAM_RENDER_INTERVAL:
+                on_text(text)
+                last_render = now
+        on_text(text)
+        return text or None, finish_reason
+
+def generate_report_with_citations(api_key, news_data, bodies=None, bypass_cache=False, on_text=None):
+    """on_text가 주어지면 스트리밍 모드: 중간 Markdown을 on_text로 전달하고, 인용 링크는 완성본에만 삽입"""
     models = get_available_models(api_key)
     if not models:
         # [수정] 기본 모델 목록을 최신 버전으로 업데이트
@@ -409,10 +500,7 @@ def generate_report_with_citations(api_key, news_data):
         others = [m for m in models if "2.0-flash" not in m]
         models = preferred + others
 
-    news_context = ""
-    for i, item in enumerate(news_data):
-        clean_title = re.sub(r'<[^>]+>', '', item['Title'])
-        news_context += f"[{i+1}] {clean_title} (Source: {item['Source']})\n"
+    news_context = format_news_context(news_data, bodies, source_label="Source")
 
     prompt = f"""당신은 글로벌 반도체 소재 전략 수석 애널리스트입니다.
 아래 뉴스만 근거로, 바쁜 임원이 핵심을 즉시 파악할 [일일 반도체 기술·소재 브리핑]을 작성하세요.
@@ -450,36 +538,70 @@ def generate_report_with_citations(api_key, news_data):
         }
     }
 
-    # [수정] 429 응답 시 Exponential Backoff 적용
-    for model in models:
-        if "vision" in model:
-            continue
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
-        retry_wait = 1
-        for attempt in range(3):
+    # 같은 (모델, 프롬프트, 생성 설정)이면 캐시된 응답 재사용 (bypass_cache=True면 새로 생성 후 덮어씀)
+    cache = get_gemini_cache()
+
+    # 모델별 기록(지연 p50, 429/5xx/절단 비율)으로 예상 완료 시간이 짧은 모델부터 시도
+    router = get_model_router()
+    models = router.order([m for m in models if "vision" not in m])
+
+    # 재시도는 retry_policy 공용 정책: 지터 지수 백오프 + Retry-After, 생성 1회당 APP_GEMINI_BUDGET초 안에서만.
+    # 429/5xx/네트워크 오류는 다른 후보 모델이 남아 있으면 기다리지 않고 넘어가고, 마지막 모델에서만 백오프.
+    # 예산이 소진되면 남은 모델·절단 재시도도 시작하지 않고 실패로 끝냄
+    started = time.monotonic()
+    stop_at = GEMINI_RETRY.stop_at(started, APP_GEMINI_BUDGET)
+    for idx, model in enumerate(models):
+        cached = cache.get(model, prompt, data["generationConfig"], bypass=bypass_cache)
+        if cached:
+            return True, inject_links_to_report(cached, news_data)
+        if stop_at is not None and time.monotonic() >= stop_at:
+            logger.warning(f"리포트 생성 시간 예산({APP_GEMINI_BUDGET}s) 소진 → 남은 모델 {len(models) - idx}개 생략")
+            break
+        has_next = idx + 1 < len(models)
+        failures = truncations = 0
+        while True:
+            if stop_at is not None and time.monotonic() >= stop_at:
+                break
+            call_started = time.monotonic()
+            timeout = GEMINI_RETRY.timeout(60, started, budget=APP_GEMINI_BUDGET)
             try:
-                response = requests.post(url, headers=headers, json=data, timeout=60)
-                if response.status_code == 200:
-                    res_json = response.json()
-                    if 'candidates' in res_json and res_json['candidates']:
-                        raw_text = res_json['candidates'][0]['content']['parts'][0]['text']
-                        if len(raw_text) < 300 or "##" not in raw_text:
-                            # 응답이 비정상적으로 짧거나(조기 절단) 구조가 없으면 폐기하고 재시도
-                            logger.warning(f"리포트가 비정상적으로 짧음 [{model}] ({len(raw_text)} chars) → 재시도")
-                            continue
-                        return True, inject_links_to_report(raw_text, news_data)
-                    break  # candidates 없으면 다음 모델로
-                elif response.status_code == 429:
-                    logger.warning(f"Rate limit hit [{model}], retrying in {retry_wait}s...")
-                    time.sleep(retry_wait)
-                    retry_wait *= 2  # Exponential backoff
-                    continue
+                if on_text is None:
+                    url = f"{GEMINI_API_BASE}/models/{model}:generateContent?key={api_key}"
+                    raw_text, finish_reason = _post_report(url, headers, data, timeout=timeout)
                 else:
-                    logger.warning(f"Model {model} returned status {response.status_code}")
-                    break
+                    raw_text, finish_reason = _stream_report(stream_url(model, api_key), headers, data, on_text,
+                                                             timeout=timeout, stop_at=stop_at)
             except Exception as e:
-                logger.warning(f"Report generation error [{model}]: {e}")
-                break
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                router.record(model, classify_status(status) if status else "error", time.monotonic() - call_started)
+                retryable, retry_after = classify_exception(e)
+                delay = GEMINI_RETRY.backoff(failures, retry_after)
+                if not retryable or has_next or not GEMINI_RETRY.should_retry(failures, delay, started, APP_GEMINI_BUDGET):
+                    logger.warning(f"Report generation error [{model}]: {e}")
+                    break
+                failures += 1
+                logger.warning(f"[{model}] {e} → {delay:.1f}s 후 재시도")
+                time.sleep(delay)
+                continue
+            latency = time.monotonic() - call_started
+            if not raw_text:
+                router.record(model, "error", latency)
+                break  # candidates 없으면 다음 모델로
+            if (finish_reason and finish_reason != "STOP") or len(raw_text) < 300 or "##" not in raw_text:
+                # STOP 외 종료(MAX_TOKENS/SAFETY/RECITATION)이거나 비정상적으로 짧거나 구조가 없으면
+                # 절단으로 보고 캐시하지 않고 재시도 (백오프 횟수와 별도)
+                logger.warning(f"리포트 절단/비정상 [{model}] (finishReason={finish_reason}, "
+                               f"{len(raw_text)} chars) → 재시도")
+                router.record(model, "truncated", latency)
+                if on_text is not None:
+                    on_text("")
+                truncations += 1
+                if truncations > 2:
+                    break
+                continue
+            router.record(model, "ok", latency)
+            cache.put(model, prompt, data["generationConfig"], raw_text)
+            return True, inject_links_to_report(raw_text, news_data)
 
     return False, "AI 분석 실패 (모든 모델 응답 없음)"
 
@@ -487,6 +609,12 @@ def generate_report_with_citations(api_key, news_data):
 # 4. 키워드 관리 UI
 # ==========================================
 def render_keyword_manager():
+    # Daily Report 외 카테고리(keywords.json)는 자동 실행에 REPORT_CATEGORIES=1이면 카테고리별 리포트로 함께 생성됨
+    categories = list(st.session_state.keywords.keys())
+    category = DAILY_REPORT
+    if len(categories) > 1:
+        category = st.selectbox("카테고리", categories, key="kw_category", label_visibility="collapsed")
+
     c1, c2 = st.columns([3, 1])
 
     new_kw = c1.text_input(
@@ -496,19 +624,19 @@ def render_keyword_manager():
         key="kw_input"
     )
     if c2.button("추가", use_container_width=True, key="kw_add"):
-        if new_kw and new_kw not in st.session_state.keywords[DAILY_REPORT]:
-            st.session_state.keywords[DAILY_REPORT].append(new_kw)
+        if new_kw and new_kw not in st.session_state.keywords[category]:
+            st.session_state.keywords[category].append(new_kw)
             save_keywords(st.session_state.keywords)
             st.rerun()
 
-    curr_kws = st.session_state.keywords.get(DAILY_REPORT, [])
+    curr_kws = st.session_state.keywords.get(category, [])
     if curr_kws:
         st.write("")
         num_cols = min(len(curr_kws), 8)
         cols = st.columns(num_cols)
         for i, kw in enumerate(curr_kws):
-            if cols[i % num_cols].button(f"{kw} ×", key=f"kw_del_{i}_{kw}"):
-                st.session_state.keywords[DAILY_REPORT].remove(kw)
+            if cols[i % num_cols].button(f"{kw} ×", key=f"kw_del_{category}_{i}_{kw}"):
+                st.session_state.keywords[category].remove(kw)
                 save_keywords(st.session_state.keywords)
                 st.rerun()
 
@@ -534,6 +662,9 @@ with st.sidebar:
         st.session_state.dark_mode = dark_toggled
         st.rerun()
 
+    # 기사 본문 발췌를 프롬프트에 포함 (리포트 품질↑, 생성 시간↑ - 같은 날 재생성은 캐시 사용)
+    st.session_state.extract_bodies = st.toggle("📰 기사 본문 분석", value=st.session_state.extract_bodies)
+
     st.markdown("<hr>", unsafe_allow_html=True)
 
     with st.expander("🔐 API Key"):
@@ -585,7 +716,10 @@ with col_date:
 with col_refresh:
     if st.button("↻ 새로고침", use_container_width=True, key="reload_history"):
         # GitHub에서 최신 히스토리 강제 재로드
-        st.session_state.daily_history = load_daily_history_from_source()
+        st.session_state.history_manifest = load_daily_history_from_source()
+        st.session_state.history_entries = {}
+        st.session_state.search_index = None
+        st.session_state.trend_rollup = None
         st.rerun()
 
 # ── 키워드 관리 ────────────────────────────────────────
@@ -593,8 +727,9 @@ with st.expander("⚙️ 키워드 관리", expanded=False):
     render_keyword_manager()
 
 # ── 오늘 리포트 상태 확인 ──────────────────────────────
-history = st.session_state.daily_history
-today_report = next((h for h in history if h['date'] == target_date_str), None)
+history = st.session_state.history_manifest
+today_report = (load_history_entry(target_date_str)
+                if any(h['date'] == target_date_str for h in history) else None)
 
 if not today_report:
     # GitHub Actions가 아직 실행 전이거나 실패한 경우
@@ -624,8 +759,19 @@ if not today_report:
             if not news_items:
                 status_box.update(label="❌ 수집된 뉴스가 없습니다.", state="error")
             else:
+                status_box.write("🔗 원문 링크 확인 중...")
+                news_items = resolve_article_links(news_items)
+                bodies = None
+                if st.session_state.extract_bodies:
+                    status_box.write("📰 기사 본문 추출 중...")
+                    bodies = extract_bodies(news_items)
+                packed = pack_news_context(news_items, bodies, source_label="Source")
+                news_items, bodies = packed.articles, packed.bodies
+                status_box.write(f"📦 프롬프트 구성: {len(news_items)}/{len(news_items) + packed.dropped}건, "
+                                 f"약 {packed.tokens:,} 토큰 (예산 {PROMPT_TOKEN_BUDGET:,})")
                 status_box.write(f"🧠 AI 심층 분석 중... ({len(news_items)}건)")
-                success, result = generate_report_with_citations(api_key, news_items)
+                preview = status_box.empty()  # 스트리밍 중간 결과 (인용 링크는 완성 후 삽입)
+                success, result = generate_report_with_citations(api_key, news_items, bodies, on_text=preview.markdown)
                 if success:
                     save_data = {'date': target_date_str, 'report': result, 'articles': news_items}
                     status_box.write("💾 GitHub에 저장 중...")
@@ -647,14 +793,22 @@ else:
         unsafe_allow_html=True
     )
 
-    # 수동 재생성 버튼
+    # 수동 재생성 버튼 (같은 기사 목록이면 캐시된 AI 응답을 재사용 - 새 응답이 필요하면 체크)
+    bypass_cache = st.checkbox("캐시된 AI 응답 무시", value=False, key="bypass_llm_cache")
     if st.button("🔄 리포트 다시 만들기", disabled=not bool(api_key)):
         status_box = st.status("🚀 재생성 중...", expanded=True)
         daily_kws  = st.session_state.keywords[DAILY_REPORT]
         news_items = fetch_news(daily_kws, days=2, limit=NEWS_LIMIT, strict_time=False)
         if news_items:
+            news_items = resolve_article_links(news_items)
+            bodies = extract_bodies(news_items) if st.session_state.extract_bodies else None
+            packed = pack_news_context(news_items, bodies, source_label="Source")
+            news_items, bodies = packed.articles, packed.bodies
+            status_box.write(f"📦 프롬프트 구성: {len(news_items)}건, 약 {packed.tokens:,} 토큰")
             status_box.write("🧠 AI 분석 중...")
-            success, result = generate_report_with_citations(api_key, news_items)
+            preview = status_box.empty()
+            success, result = generate_report_with_citations(api_key, news_items, bodies, bypass_cache=bypass_cache,
+                                                             on_text=preview.markdown)
             if success:
                 save_data = {'date': target_date_str, 'report': result, 'articles': news_items}
                 save_daily_history(save_data)
@@ -665,37 +819,132 @@ else:
                 st.error(result)
 
 # ── 아카이브 ───────────────────────────────────────────
-if history:
-    st.markdown("<div style='height:24px'></div>", unsafe_allow_html=True)
+def render_report_section(section):
+    """리포트 본문 + 참고 기사 목록 (아카이브 항목 / 카테고리 탭 공용)"""
     st.markdown(
-        f"<div style='font-size:14px; font-weight:600; color:{T['text2']}; "
-        f"margin-bottom:12px; padding-bottom:8px; border-bottom:1px solid {T['border']};'>"
-        "🗂️ 리포트 아카이브</div>",
+        f"<div class='si-report-card'>{section['report']}</div>",
         unsafe_allow_html=True
     )
-    for entry in history:
-        is_today = (entry['date'] == target_date_str)
-        with st.expander(
-            f"{'🔥 ' if is_today else ''}{entry['date']} Daily Report",
-            expanded=is_today
-        ):
-            st.markdown(
-                f"<div class='si-report-card'>{entry['report']}</div>",
-                unsafe_allow_html=True
-            )
-            st.markdown(
-                f"<div style='font-size:12px; font-weight:600; color:{T['muted']}; "
-                f"letter-spacing:0.05em; text-transform:uppercase; margin:16px 0 8px;'>"
-                "참고 기사</div>",
-                unsafe_allow_html=True
-            )
-            for item in entry.get('articles', []):
-                safe_link = sanitize_url(item.get('Link', '#'))
-                clean_title = re.sub(r'<[^>]+>', '', item.get('Title', ''))
-                accent = T['accent']
-                st.markdown(
-                    f"<a href='{safe_link}' target='_blank' class='si-archive-ref'>"
-                    f"<span style='color:{accent};flex-shrink:0'>↗</span>"
-                    f"<span>{clean_title}</span></a>",
-                    unsafe_allow_html=True
-                )
+    st.markdown(
+        f"<div style='font-size:12px; font-weight:600; color:{T['muted']}; "
+        f"letter-spacing:0.05em; text-transform:uppercase; margin:16px 0 8px;'>"
+        "참고 기사</div>",
+        unsafe_allow_html=True
+    )
+    for item in section.get('articles', []):
+        safe_link = sanitize_url(item.get('Link', '#'))
+        clean_title = re.sub(r'<[^>]+>', '', item.get('Title', ''))
+        accent = T['accent']
+        st.markdown(
+            f"<a href='{safe_link}' target='_blank' class='si-archive-ref'>"
+            f"<span style='color:{accent};flex-shrink:0'>↗</span>"
+            f"<span>{clean_title}</span></a>",
+            unsafe_allow_html=True
+        )
+
+def _trend_figure(dates, series, kind="line"):
+    fig = go.Figure()
+    for name, counts in series.items():
+        if kind == "bar":
+            fig.add_trace(go.Bar(x=dates, y=counts, name=name))
+        else:
+            fig.add_trace(go.Scatter(x=dates, y=counts, name=name, mode="lines+markers"))
+    fig.update_layout(
+        barmode="stack", height=340, margin=dict(l=8, r=8, t=16, b=8),
+        legend=dict(orientation="h", y=-0.2), hovermode="x unified",
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", font=dict(color=T['text2'], size=12),
+    )
+    return fig
+
+def _total_figure(series, sort=True):
+    """기간 합계 가로 막대 (출처/시간대)"""
+    totals = {name: sum(counts) for name, counts in series.items()}
+    names = sorted(totals, key=totals.get) if sort else sorted(totals, reverse=True)
+    fig = go.Figure(go.Bar(x=[totals[n] for n in names], y=names, orientation="h", marker_color=T['accent']))
+    fig.update_layout(
+        height=max(240, 28 * len(names)), margin=dict(l=8, r=8, t=16, b=8),
+        paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)", font=dict(color=T['text2'], size=12),
+    )
+    return fig
+
+def render_trend_dashboard():
+    """저장 때 미리 집계한 일별 기사 수(history/trends.json)로만 차트를 그림 (기사 목록은 읽지 않음)"""
+    rollup = load_trend_rollup()
+    if rollup is None or not rollup.days:
+        st.caption("트렌드 집계가 아직 없습니다. 다음 리포트 저장 때 만들어집니다.")
+        return
+    c1, c2 = st.columns([3, 1])
+    period = c1.radio("기간", [7, 30, 90, 365], index=1, horizontal=True,
+                      format_func=lambda d: f"{d}일", key="trend_period")
+    top = c2.number_input("상위 항목 수", min_value=3, max_value=20, value=8, key="trend_top")
+    since = (target_date - timedelta(days=period - 1)).isoformat()
+
+    dates, _ = rollup.series("categories", since=since)
+    total = sum(rollup.days[d].get('articles', 0) for d in dates)
+    st.caption(f"{len(dates)}일 · 인용 기사 {total:,}건")
+
+    kw_tab, src_tab, cat_tab, win_tab = st.tabs(["키워드", "출처", "카테고리", "시간대"])
+    with kw_tab:
+        dates, series = rollup.series("keywords", top=top, since=since)
+        if series:
+            st.plotly_chart(_trend_figure(dates, series), use_container_width=True)
+        else:
+            st.caption("키워드 태그가 있는 기사가 없습니다.")
+    with src_tab:
+        _, series = rollup.series("sources", top=top, since=since)
+        st.plotly_chart(_total_figure(series), use_container_width=True)
+    with cat_tab:
+        dates, series = rollup.series("categories", since=since)
+        st.plotly_chart(_trend_figure(dates, series, kind="bar"), use_container_width=True)
+    with win_tab:
+        _, series = rollup.series("windows", since=since)
+        st.caption("보도 시각 (KST) 기준")
+        st.plotly_chart(_total_figure(series, sort=False), use_container_width=True)
+
+if history:
+    st.markdown("<div style='height:24px'></div>", unsafe_allow_html=True)
+    tab_archive, tab_trends = st.tabs(["🗂️ 리포트 아카이브", "📈 트렌드"])
+    with tab_archive:
+        # 검색어가 있으면 역색인으로 찾은 날짜만 점수순으로 (리포트 본문을 매번 훑지 않음)
+        query = st.text_input("🔍 아카이브 검색", key="archive_query",
+                              placeholder="예: 하이브리드 본딩, 네온 가스, HBM4").strip()
+        archive_rows = history
+        if query:
+            search_index = load_search_index()
+            if search_index is None:
+                st.caption("검색 색인이 아직 없습니다. 다음 리포트 저장 때 만들어집니다.")
+            else:
+                started = time.perf_counter()
+                hits = search_index.search(query)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                rows_by_date = {row['date']: row for row in history}
+                archive_rows = [rows_by_date[hit.date] for hit in hits if hit.date in rows_by_date]
+                st.caption(f"'{query}' 검색 결과 {len(archive_rows)}건 ({elapsed_ms:.1f}ms)")
+        for row in archive_rows:
+            is_today = (row['date'] == target_date_str)
+            with st.expander(
+                f"{'🔥 ' if is_today else ''}{row['date']} Daily Report",
+                expanded=is_today
+            ):
+                # 본문은 펼쳐서 요청할 때만 불러옴 (오늘 리포트와 이미 불러온 날짜는 바로 표시)
+                entry = st.session_state.history_entries.get(row['date'])
+                if entry is None and not is_today:
+                    meta = f"기사 {row.get('articles', 0)}건"
+                    if row.get('categories'):
+                        meta += " · " + ", ".join(row['categories'])
+                    st.caption(f"{row.get('headline', '')}  \n{meta}")
+                    if not st.button("📄 리포트 불러오기", key=f"load_history_{row['date']}"):
+                        continue
+                if entry is None:
+                    entry = load_history_entry(row['date'])
+                if not entry:
+                    st.warning("리포트를 불러오지 못했습니다.")
+                    continue
+                # 카테고리 리포트가 있으면 탭으로 (Daily Report가 첫 탭)
+                sections = [(DAILY_REPORT, entry)] + list(entry.get('categories', {}).items())
+                containers = st.tabs([name for name, _ in sections]) if len(sections) > 1 else [st.container()]
+                for container, (_, section) in zip(containers, sections):
+                    with container:
+                        render_report_section(section)
+    with tab_trends:
+        render_trend_dashboard()
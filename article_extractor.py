@@ -0,0 +1,159 @@
+"""
+article_extractor.py
+────────────────────
+(선택) 기사 본문 추출 단계.
+
+- 원문 URL(link_resolver 변환 후)의 HTML을 news_fetcher 엔진으로 동시 수집 (동시 요청 수 제한)
+- lxml.html로 script/nav/footer 등을 걷어낸 뒤 문단 텍스트 밀도가 가장 높은 블록을 본문으로 선택
+- 추출 텍스트는 URL 기준으로 .cache/articles에 보관 → 같은 날 재생성 시 재요청 없음
+- 프롬프트에는 기사당 토큰 예산만큼만 잘라서 넣는다
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+
+import lxml.html
+
+from link_resolver import is_google_link
+from news_fetcher import fetch_feeds
+from prompt_packer import char_tokens
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_CACHE_DIR  = os.environ.get("ARTICLE_CACHE_DIR", os.path.join(".cache", "articles"))
+ARTICLE_CACHE_DAYS = 7
+EXTRACT_CONCURRENCY = 8
+EXTRACT_DEADLINE    = 10.0     # 기사 1건당
+BODY_TOKEN_BUDGET   = 180      # 프롬프트에 넣을 기사당 본문 토큰 수
+MIN_BODY_CHARS      = 120      # 이보다 짧으면 본문 추출 실패로 간주
+
+_DROP_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside",
+              "form", "iframe", "button", "figure", "figcaption")
+_BLOCK_XPATH = "//article | //section | //div | //td"
+_WS = re.compile(r"\s+")
+
+
+def _cache_path(url: str) -> str:
+    return os.path.join(ARTICLE_CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".txt")
+
+
+def _read_cache(url: str) -> str | None:
+    try:
+        with open(_cache_path(url), "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_cache(url: str, text: str) -> None:
+    try:
+        os.makedirs(ARTICLE_CACHE_DIR, exist_ok=True)
+        with open(_cache_path(url), "w", encoding="utf-8") as f:
+            f.write(text)
+    except OSError as e:
+        logger.warning(f"본문 캐시 저장 실패: {e}")
+
+
+def _prune_cache() -> None:
+    cutoff = time.time() - ARTICLE_CACHE_DAYS * 86400
+    try:
+        names = os.listdir(ARTICLE_CACHE_DIR)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(ARTICLE_CACHE_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def extract_main_text(html: bytes) -> str:
+    """HTML → 본문 텍스트 (문단 텍스트가 가장 많고 링크 비율이 낮은 블록)"""
+    # 응답 헤더의 charset은 전달되지 않으므로: UTF-8로 읽히면 UTF-8, 아니면 <meta charset> → 없으면 CP949
+    try:
+        html.decode("utf-8")
+        encoding = "utf-8"
+    except UnicodeDecodeError:
+        encoding = None if re.search(rb"charset=", html[:4096], re.I) else "cp949"
+    try:
+        doc = lxml.html.fromstring(html, parser=lxml.html.HTMLParser(encoding=encoding))
+    except (ValueError, lxml.etree.ParserError):
+        return ""
+    for el in doc.xpath("//" + " | //".join(_DROP_TAGS)):
+        el.drop_tree()
+
+    best, best_score = None, 0.0
+    for block in doc.xpath(_BLOCK_XPATH):
+        # 직계 텍스트 + 직계 <p> 텍스트만 점수로 사용 (상위 래퍼 div가 이기지 않도록)
+        own = (block.text or "") + "".join((child.tail or "") for child in block)
+        paras = [p.text_content() for p in block if getattr(p, "tag", None) == "p"]
+        text_len = len(own.strip()) + sum(len(p.strip()) for p in paras)
+        if text_len < 80:
+            continue
+        link_len = sum(len(a.text_content()) for a in block.iter("a"))
+        score = text_len * (1 - min(link_len / max(text_len, 1), 0.9))
+        if block.tag == "article":
+            score *= 1.2
+        if score > best_score:
+            best, best_score = block, score
+
+    if best is not None:
+        text = _WS.sub(" ", " ".join(best.itertext())).strip()
+        if len(text) >= MIN_BODY_CHARS:
+            return text
+    # 본문 블록을 못 찾으면 og:description으로 대체
+    desc = doc.xpath('//meta[@property="og:description"]/@content | //meta[@name="description"]/@content')
+    return _WS.sub(" ", desc[0]).strip() if desc else ""
+
+
+def trim_to_budget(text: str, max_tokens: int = BODY_TOKEN_BUDGET) -> str:
+    """prompt_packer의 로컬 토큰 추정 기준으로 앞부분만 남김"""
+    used, cut = 0.0, len(text)
+    for i, ch in enumerate(text):
+        used += char_tokens(ch)
+        if used > max_tokens:
+            cut = i
+            break
+    trimmed = text[:cut]
+    if cut < len(text):
+        # 문장 중간에서 끊기지 않도록 마지막 문장 경계까지 되돌림
+        boundary = max(trimmed.rfind(". "), trimmed.rfind("다."), trimmed.rfind("。"))
+        if boundary > len(trimmed) // 2:
+            trimmed = trimmed[:boundary + 2]
+        trimmed = trimmed.rstrip() + "…"
+    return trimmed
+
+
+def extract_bodies(articles: list[dict], max_tokens: int = BODY_TOKEN_BUDGET) -> dict[str, str]:
+    """{Link: 토큰 예산으로 자른 본문}. Google 리다이렉트 링크나 추출 실패 기사는 제외."""
+    links = [a.get("Link", "") for a in articles]
+    links = [l for l in dict.fromkeys(links) if l.startswith("http") and not is_google_link(l)]
+
+    texts: dict[str, str] = {}
+    missing = []
+    for link in links:
+        cached = _read_cache(link)
+        if cached is not None:
+            texts[link] = cached
+        else:
+            missing.append(link)
+
+    if missing:
+        pages = fetch_feeds(missing, concurrency=EXTRACT_CONCURRENCY, deadline=EXTRACT_DEADLINE, use_cache=False)
+        for link in missing:
+            html = pages.get(link)
+            if not html:
+                continue
+            text = extract_main_text(html)
+            _write_cache(link, text)  # 빈 결과도 저장해 같은 날 재요청 방지
+            texts[link] = text
+        _prune_cache()
+
+    bodies = {link: trim_to_budget(text, max_tokens) for link, text in texts.items() if text}
+    logger.info(f"기사 본문 추출: {len(bodies)}/{len(links)}건 (신규 요청 {len(missing)}건)")
+    return bodies
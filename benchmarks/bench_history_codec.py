@@ -0,0 +1,91 @@
+"""
+benchmarks/bench_history_codec.py
+─────────────────────────────────
+히스토리 날짜 파일 저장 형식(history_codec) 비교: 크기와 인코딩/디코딩 시간.
+
+daily_history.json의 실제 항목을 날짜만 바꿔 복제해 --days일치(기본 1년)를 만들고
+  1) 형식별 총 저장 크기 (기존 단일 파일의 indent=4, 공백 제거만, json(indent=2), columnar, gzip)
+  2) 날짜 1건당 인코딩/디코딩 시간 (디코딩 = 앱의 archive 항목 열기 / 전체 기간 읽기)
+을 출력한다. 모든 형식은 왕복 결과가 원본과 같은지 먼저 검증한다.
+
+실행: python benchmarks/bench_history_codec.py [--days 365] [--categories 3] [--repeat 3]
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from github_store import dump_json  # noqa: E402
+from history_codec import CODECS, decode_document, encode_entry  # noqa: E402
+from history_store import LEGACY_HISTORY_FILE  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def build_history(days: int, n_categories: int) -> list[dict]:
+    """실제 항목을 순환 복제. 카테고리 리포트는 Daily 기사 일부를 다시 쓰는 실제 구조를 흉내 냄"""
+    with open(os.path.join(ROOT, LEGACY_HISTORY_FILE), encoding="utf-8") as f:
+        samples = [h for h in json.load(f) if isinstance(h, dict) and h.get("articles")]
+    if not samples:
+        raise SystemExit(f"{LEGACY_HISTORY_FILE}에 기사가 있는 항목이 없음")
+
+    start = date(2026, 1, 1)
+    history = []
+    for i in range(days):
+        entry = copy.deepcopy(samples[i % len(samples)])
+        entry["date"] = (start + timedelta(days=i)).isoformat()
+        articles = entry["articles"]
+        entry["categories"] = {
+            f"카테고리{c}": {"report": entry.get("report", ""), "articles": articles[c::n_categories + 1]}
+            for c in range(n_categories)
+        }
+        history.append(entry)
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser(description="히스토리 저장 형식 크기/속도 비교")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--categories", type=int, default=3, help="날짜별 카테고리 리포트 수 (0이면 없음)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    history = build_history(args.days, args.categories)
+    baseline = sum(len(json.dumps(h, ensure_ascii=False, indent=4).encode("utf-8")) for h in history)
+    minified = sum(len(json.dumps(h, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                   for h in history)
+
+    print(f"{args.days}일치, 카테고리 {args.categories}개/일 (기존 daily_history.json 형식 indent=4: "
+          f"{baseline / 1e6:.2f}MB, 공백 제거만: {minified / 1e6:.2f}MB)")
+    for codec in CODECS:
+        stored = [dump_json(encode_entry(h, codec)) for h in history]
+        restored = [decode_document(json.loads(s)) for s in stored]
+        if restored != history:
+            raise SystemExit(f"{codec}: 왕복 결과가 원본과 다름")
+
+        encode_s = decode_s = 0.0
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for h in history:
+                dump_json(encode_entry(h, codec))
+            encode_s += time.perf_counter() - started
+            started = time.perf_counter()
+            for s in stored:
+                decode_document(json.loads(s))
+            decode_s += time.perf_counter() - started
+
+        size = sum(len(s.encode("utf-8")) for s in stored)
+        per_day = 1e3 / (args.repeat * len(history))
+        print(f"  {codec:9s}: {size / 1e6:6.2f}MB ({size / baseline:6.1%})  "
+              f"평균 {size / len(history) / 1e3:6.1f}KB/일  "
+              f"인코딩 {encode_s * per_day:5.2f}ms/일  디코딩 {decode_s * per_day:5.2f}ms/일  "
+              f"전체 읽기 {decode_s / args.repeat:5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+benchmarks/bench_pipeline.py
+────────────────────────────
+generate_report.main() 전체(수집 → 링크 변환 → 리포트 생성 → 저장)를 로컬 대역 서버
+(benchmarks/mock_services.py)에 대고 반복 실행해 처리량과 꼬리 지연을 측정한다.
+외부 네트워크·API 키 없이 노트북에서 실행 가능.
+
+- 매 반복 전에 대역 GitHub 저장소를 초기화 ('오늘 리포트 이미 존재' 스킵 방지)
+- --cold면 매 반복마다 디스크 캐시(.cache 대신 임시 디렉토리)와 프로세스 전역 캐시를 비움
+- 지연/429/절단 비율/피드 크기는 mock_services.py와 같은 옵션으로 조절
+
+실행: python benchmarks/bench_pipeline.py [--runs 5] [--cold] [--gemini-latency 1.0 --rate-429 0.05 ...]
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mock_services import MockServices, add_config_args, config_from_args  # noqa: E402
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def _set_env(services: MockServices, cache_root: str, args) -> None:
+    os.environ.update(services.env())
+    os.environ.update({
+        "FEED_CACHE_DIR":    os.path.join(cache_root, "feeds"),
+        "GEMINI_CACHE_DIR":  os.path.join(cache_root, "gemini"),
+        "ARTICLE_CACHE_DIR": os.path.join(cache_root, "articles"),
+        "LINK_CACHE_FILE":   os.path.join(cache_root, "links.json"),
+        "MODEL_STATS_FILE":  os.path.join(cache_root, "model_stats.json"),
+        "REPORT_MODE":       args.mode,
+        "REPORT_CATEGORIES": "1" if args.categories else "0",
+        "EXTRACT_ARTICLE_BODIES": "1" if args.bodies else "0",
+    })
+
+
+def _clear_caches(cache_root: str) -> None:
+    import feed_cache
+    import gemini_cache
+    import model_router
+
+    shutil.rmtree(cache_root, ignore_errors=True)
+    os.makedirs(cache_root, exist_ok=True)
+    feed_cache._default_cache = None
+    gemini_cache._default_cache = None
+    model_router._default_router = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="generate_report.main() 종단 부하 측정 (로컬 대역 서버)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--cold", action="store_true", help="매 반복마다 캐시 비우기")
+    parser.add_argument("--mode", choices=["single", "mapreduce"], default="single")
+    parser.add_argument("--categories", action="store_true", help="keywords.json의 모든 카테고리 리포트 생성")
+    parser.add_argument("--bodies", action="store_true", help="기사 본문 발췌 포함")
+    parser.add_argument("--verbose", action="store_true")
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    services = MockServices(config_from_args(args)).start()
+    cache_root = tempfile.mkdtemp(prefix="bench-pipeline-")
+    _set_env(services, cache_root, args)
+
+    import generate_report  # 환경변수 설정 뒤 import (모듈 상수가 import 시점에 결정됨)
+    from history_store import MANIFEST_FILE, shard_path
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    latencies, failures = [], 0
+    totals: dict[str, int] = {}
+    try:
+        for i in range(args.runs):
+            services.reset()
+            if args.cold or i == 0:
+                _clear_caches(cache_root)
+            started = time.perf_counter()
+            try:
+                generate_report.main()
+                manifest = json.loads(services.state.files.get(MANIFEST_FILE, b"[]"))
+                ok = bool(manifest) and shard_path(manifest[0]["date"]) in services.state.files
+            except (Exception, SystemExit) as e:
+                print(f"  run {i + 1}: 실패 {type(e).__name__}: {e}")
+                ok = False
+            elapsed = time.perf_counter() - started
+            failures += not ok
+            if ok:
+                latencies.append(elapsed)
+            counts = dict(services.state.counts)
+            for key, value in counts.items():
+                totals[key] = totals.get(key, 0) + value
+            print(f"  run {i + 1}: {elapsed:6.2f}s  {'ok' if ok else 'FAIL'}  "
+                  + " ".join(f"{k}={v}" for k, v in sorted(counts.items())))
+    finally:
+        services.stop()
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    print(f"\n{args.runs}회 ({'cold' if args.cold else 'warm'}, mode={args.mode}, "
+          f"gemini {args.gemini_latency}s, rss {args.rss_latency}s, 429 {args.rate_429:.0%}, "
+          f"절단 {args.truncate_rate:.0%}, feed {args.feed_size}건)")
+    if latencies:
+        total = sum(latencies)
+        print(f"  처리량  : {len(latencies) / total * 60:.1f} 리포트/분")
+        print(f"  지연    : p50 {_percentile(latencies, 0.5):.2f}s  p95 {_percentile(latencies, 0.95):.2f}s  "
+              f"max {max(latencies):.2f}s")
+    print(f"  실패    : {failures}회")
+    print("  요청 수 : " + " ".join(f"{k}={v}" for k, v in sorted(totals.items())))
+
+
+if __name__ == "__main__":
+    main()
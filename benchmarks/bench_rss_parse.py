@@ -0,0 +1,137 @@
+"""
+benchmarks/bench_rss_parse.py
+─────────────────────────────
+BeautifulSoup 전체 트리 파싱(기존) vs rss_parser 스트리밍 파싱 마이크로 벤치마크.
+
+100건짜리 Google News 형식 합성 피드로
+  1) 두 방식의 결과가 app.py / generate_report.py 모드 모두에서 동일한지 검증하고
+  2) 피드 1건당 파싱 시간과 tracemalloc 기준 최대 메모리를 비교한다.
+(tracemalloc은 libxml2 내부 할당을 집계하지 않으므로 메모리 수치는 Python 객체 기준)
+
+실행: python benchmarks/bench_rss_parse.py [--items 100] [--per-kw 3] [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from news_window import TimeWindow  # noqa: E402
+from rss_parser import parse_keyword_feed  # noqa: E402
+
+
+def build_feed(n_items: int, base: datetime) -> bytes:
+    items = []
+    for i in range(n_items):
+        pub = (base - timedelta(minutes=37 * i)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+        items.append(
+            "<item>"
+            f"<title>반도체 소재 공급망 이슈 {i} - 매체{i % 7}</title>"
+            f"<link>https://news.google.com/rss/articles/CBMi{'x' * 180}{i}?oc=5</link>"
+            f"<guid isPermaLink=\"false\">CBMi{'y' * 120}{i}</guid>"
+            f"<pubDate>{pub}</pubDate>"
+            f"<description>&lt;a href=\"https://news.google.com/rss/articles/{i}\"&gt;"
+            f"반도체 소재 공급망 이슈 {i}&lt;/a&gt;&amp;nbsp;&amp;nbsp;&lt;font color=\"#6f6f6f\"&gt;매체{i % 7}&lt;/font&gt;"
+            "</description>"
+            f"<source url=\"https://media{i % 7}.example.com\">매체{i % 7}</source>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        "<generator>NFE/5.0</generator><title>\"반도체\" - Google 뉴스</title>"
+        "<link>https://news.google.com/search?q=반도체</link><language>ko</language>"
+        + "".join(items) + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def legacy_parse(content, per_kw, start_dt, end_dt, strip_text=True, time_filter=True):
+    """기존 _fetch_keyword_news의 BeautifulSoup 파싱 루프 (비교 기준)"""
+    filtered, raw = [], []
+    soup = BeautifulSoup(content, "xml")
+    for item in soup.find_all("item"):
+        title = item.title.text if item.title else ""
+        if strip_text:
+            title = title.strip()
+        if not title:
+            continue
+        link = item.link.text if item.link else ""
+        src = item.source.text if item.source else "Google News"
+        if strip_text:
+            link, src = link.strip(), src.strip()
+        date_raw = item.pubDate.text if item.pubDate else ""
+        is_valid, parsed = True, None
+        if time_filter:
+            try:
+                pub_dt = datetime.strptime(date_raw, "%a, %d %b %Y %H:%M:%S %Z") + timedelta(hours=9)
+                parsed = pub_dt.strftime("%Y-%m-%d %H:%M:%S")
+                if not (start_dt <= pub_dt <= end_dt):
+                    is_valid = False
+            except Exception:
+                pass
+        entry = {"Title": title, "Link": link, "Date": date_raw, "Source": src, "ParsedDate": parsed}
+        if len(raw) < per_kw:
+            raw.append(entry)
+        if is_valid and len(filtered) < per_kw:
+            filtered.append(entry)
+        if len(filtered) >= per_kw and len(raw) >= per_kw:
+            break
+    return filtered, raw
+
+
+def measure(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--per-kw", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    end_dt = datetime(2026, 8, 22, 6, 0, 0)
+    start_dt = end_dt - timedelta(hours=18)
+    # 최신 기사 몇 건은 윈도우 밖(미래)으로 두어 시간필터/원본 할당량이 서로 다르게 차도록 구성
+    content = build_feed(args.items, end_dt - timedelta(hours=7))
+
+    cases = {
+        "generate_report": dict(strip_text=True, time_filter=True),
+        "app strict_time": dict(strip_text=False, time_filter=True),
+        "app default":     dict(strip_text=False, time_filter=False),
+    }
+    for name, opts in cases.items():
+        for per_kw in (args.per_kw, args.items):
+            old = legacy_parse(content, per_kw, start_dt, end_dt, **opts)
+            window = TimeWindow(start_dt, end_dt) if opts["time_filter"] else None
+            new = parse_keyword_feed(content, per_kw, window, strip_text=opts["strip_text"])
+            assert old == new, f"결과 불일치: {name} per_kw={per_kw}"
+    print(f"출력 동일성 확인 완료 ({len(cases)}개 모드 × per_kw {args.per_kw}/{args.items})")
+
+    print(f"\n피드 {args.items}건, {len(content) / 1024:.1f} KB, 반복 {args.repeat}회")
+    print(f"{'case':<28}{'time/feed (ms)':>16}{'peak (KiB)':>14}")
+    for per_kw in (args.per_kw, args.items):
+        runs = (
+            ("bs4 (legacy)", lambda: legacy_parse(content, per_kw, start_dt, end_dt)),
+            ("iterparse", lambda: parse_keyword_feed(content, per_kw, TimeWindow(start_dt, end_dt))),
+        )
+        for label, fn in runs:
+            ms, peak = measure(fn, args.repeat)
+            print(f"{label + f' per_kw={per_kw}':<28}{ms:>16.3f}{peak:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
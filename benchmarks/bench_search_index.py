@@ -0,0 +1,96 @@
+"""
+benchmarks/bench_search_index.py
+────────────────────────────────
+아카이브 전문 검색: search_index 역색인 vs 매번 모든 날짜 파일을 읽어 본문을 훑는 방식.
+
+bench_history_codec.py와 같은 방식으로 --days일치 히스토리를 만들고
+  1) 전체 색인 생성 시간과 저장 크기 (history/search_index.json, gzip 봉투)
+  2) 저장 1회당 증분 갱신 비용 (색인 읽기 → 날짜 1건 추가 → 오래된 날짜 정리 → 다시 압축)
+  3) 질의별 검색 시간 (색인 vs 날짜 파일 전체 디코딩 + 부분 문자열 검색)
+을 출력한다. 부분 문자열로 찾은 날짜는 모두 색인 결과에도 있는지 먼저 검증한다.
+(샘플 항목을 복제하므로 어휘 수가 실제보다 작아 색인 크기는 하한에 가까움)
+
+실행: python benchmarks/bench_search_index.py [--days 365] [--repeat 20] [--query "네온 가스" ...]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_history_codec import build_history  # noqa: E402
+from github_store import dump_json  # noqa: E402
+from history_codec import compress_document, decode_document, encode_entry  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+
+QUERIES = ["하이브리드 본딩", "네온 가스", "특수 소재", "EUV", "북방화창", "반도체", "HBM"]
+
+
+def _scan(stored: list[str], query: str) -> list[str]:
+    """색인 없이: 날짜 파일을 모두 디코딩해 본문·기사 제목에서 부분 문자열 검색"""
+    needle = query.lower()
+    found = []
+    for doc in stored:
+        entry = decode_document(json.loads(doc))
+        sections = [entry] + list((entry.get("categories") or {}).values())
+        text = " ".join(s.get("report", "") + " ".join(a.get("Title", "") for a in s.get("articles", []))
+                        for s in sections)
+        if needle in re.sub(r"<[^>]+>", " ", text).lower():
+            found.append(entry["date"])
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="아카이브 검색 역색인 vs 전체 스캔")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--categories", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--query", action="append", help="검색어 (여러 번 지정 가능, 기본: 내장 목록)")
+    args = parser.parse_args()
+
+    history = build_history(args.days, args.categories)
+    stored = [dump_json(encode_entry(h)) for h in history]
+
+    started = time.perf_counter()
+    index = SearchIndex()
+    for entry in history:
+        index.add(entry)
+    build_s = time.perf_counter() - started
+    saved = dump_json(compress_document(index.to_json()))
+    raw = json.dumps(index.to_json(), ensure_ascii=False, separators=(",", ":"))
+    print(f"{args.days}일치 색인: 생성 {build_s:.2f}s, 토큰 {len(index.postings):,}개, "
+          f"저장 {len(saved.encode()) / 1e6:.2f}MB (압축 전 {len(raw.encode()) / 1e6:.2f}MB)")
+
+    new_day = dict(history[-1], date=(date.fromisoformat(history[-1]["date"]) + timedelta(days=1)).isoformat())
+    started = time.perf_counter()
+    current = SearchIndex.from_json(decode_document(json.loads(saved)))
+    current.add(new_day)
+    current.prune(args.days)
+    dump_json(compress_document(current.to_json()))
+    print(f"  증분 갱신 (읽기 + 1일 추가 + 정리 + 압축): {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    for query in args.query or QUERIES:
+        expected = _scan(stored, query)
+        hits = index.search(query, limit=args.days)
+        missed = set(expected) - {hit.date for hit in hits}
+        if missed:
+            raise SystemExit(f"'{query}': 색인 결과에 없는 날짜 {sorted(missed)[:5]}")
+
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            index.search(query)
+        index_ms = (time.perf_counter() - started) * 1000 / args.repeat
+        started = time.perf_counter()
+        _scan(stored, query)
+        scan_ms = (time.perf_counter() - started) * 1000
+        print(f"  {query:12s}: 색인 {index_ms:7.2f}ms ({len(hits):3d}일)  전체 스캔 {scan_ms:8.1f}ms "
+              f"({len(expected):3d}일 일치)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+benchmarks/bench_trend_rollup.py
+────────────────────────────────
+트렌드 대시보드 1회 렌더링에 필요한 데이터 준비 시간: 저장 때 만든 집계(history/trends.json) 읽기
+vs 매번 모든 날짜 파일을 디코딩해 기사 목록을 다시 집계.
+
+bench_history_codec.py와 같은 방식으로 --days일치 히스토리를 만들고, 두 방식의 시계열이
+같은지 먼저 검증한 뒤 시간과 집계 파일 크기를 출력한다.
+
+실행: python benchmarks/bench_trend_rollup.py [--days 365] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_history_codec import build_history  # noqa: E402
+from github_store import dump_json  # noqa: E402
+from history_codec import compress_document, decode_document, encode_entry  # noqa: E402
+from trend_rollup import TrendRollup  # noqa: E402
+
+FIELDS = ("keywords", "sources", "categories", "windows")
+
+
+def _series(rollup: TrendRollup) -> list:
+    return [rollup.series(field, top=8) for field in FIELDS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="트렌드 집계 파일 vs 전체 스캔")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--categories", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    history = build_history(args.days, args.categories)
+    shards = [dump_json(encode_entry(h)) for h in history]
+    rollup = TrendRollup()
+    for entry in history:
+        rollup.add(entry)
+    saved = dump_json(compress_document(rollup.to_json()))
+
+    def _scan():
+        scanned = TrendRollup()
+        for doc in shards:
+            scanned.add(decode_document(json.loads(doc)))
+        return _series(scanned)
+
+    def _load():
+        return _series(TrendRollup.from_json(decode_document(json.loads(saved))))
+
+    if _scan() != _load():
+        raise SystemExit("집계 파일과 전체 스캔의 시계열이 다름")
+
+    print(f"{args.days}일치, 카테고리 {args.categories}개/일, 집계 파일 {len(saved.encode()) / 1e3:.1f}KB")
+    for label, fn in (("집계 파일", _load), ("전체 스캔", _scan)):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            fn()
+        print(f"  {label}: {(time.perf_counter() - started) * 1000 / args.repeat:8.1f}ms/렌더링")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,527 @@
+"""
+benchmarks/mock_services.py
+───────────────────────────
+Google News RSS / Gemini API / GitHub Contents API를 흉내 내는 로컬 대역 서버 (부하·회귀 측정용).
+
+- RSS    : GET /rss/search?q=...  → 검색어(OR 쿼리 포함)가 제목에 들어간 합성 피드 (feed_size건,
+           일부는 매체만 다른 재배포 기사)
+- Gemini : GET /v1beta/models, POST /v1beta/models/{m}:generateContent | :streamGenerateContent(SSE)
+           → 프롬프트의 뉴스 번호를 인용하는 가짜 리포트
+- GitHub : Contents API(GET/PUT .../contents/{path}, ?ref=), git/blobs, Git Data API(ref / commits / trees,
+           ref 갱신은 fast-forward만 허용) - 커밋 이력을 메모리에 보관
+- 링크   : GET /rss/articles/{id} → 서명값(data-n-a-sg/ts)이 든 Google News 기사 페이지,
+           POST /_/DotsSplashUi/data/batchexecute → 원문 URL (link_resolver의 신형 ID 변환 경로)
+- 기사   : GET /articles/{id} → 본문 추출용 HTML. 원문 URL은 다른 호스트 이름(localhost ↔ 127.0.0.1)으로
+           만들어 Google News 호스트와 구분됨
+지연 시간(로그정규 꼬리), 429 주입(Retry-After), 절단 응답 비율, 피드 크기, 동시 커밋 충돌 비율을 조절할 수 있고
+같은 seed면 같은 응답을 돌려준다.
+
+단독 실행: python benchmarks/mock_services.py --port 8765 [--rss-latency 0.3 --rate-429 0.05 ...]
+  → 출력되는 환경변수(GOOGLE_NEWS_BASE / GEMINI_API_BASE / GITHUB_API_BASE ...)를 설정하고
+    generate_report.py 또는 streamlit run app.py 실행
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+from xml.sax.saxutils import escape
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+_SOURCES = ["전자신문", "디일렉", "연합뉴스", "한국경제", "매일경제", "조선비즈", "ZDNet Korea", "머니투데이",
+            "서울경제", "이데일리", "The Elec", "Reuters", "Bloomberg", "뉴스핌", "아시아경제"]
+_PHRASES = ["공급 확대", "가격 인상", "신규 공장 착공", "수출 규제 강화", "기술 개발 성공", "투자 발표",
+            "점유율 상승", "실적 개선", "양산 돌입", "국산화 추진", "협력 강화", "재고 감소"]
+
+
+class MockConfig:
+    def __init__(self, rss_latency: float = 0.2, gemini_latency: float = 2.0, latency_sigma: float = 0.5,
+                 rate_429: float = 0.0, retry_after: int = 1, truncate_rate: float = 0.0,
+                 feed_size: int = 100, dup_rate: float = 0.2, conflict_rate: float = 0.0, seed: int = 0):
+        self.rss_latency = rss_latency         # RSS 응답 지연 중앙값(초)
+        self.gemini_latency = gemini_latency   # generateContent 지연 중앙값(초)
+        self.latency_sigma = latency_sigma     # 로그정규 분포 sigma (클수록 꼬리가 김)
+        self.rate_429 = rate_429               # 429 응답 비율 (RSS / Gemini / GitHub 공통)
+        self.retry_after = retry_after         # 429 응답의 Retry-After(초)
+        self.truncate_rate = truncate_rate     # Gemini 절단(짧은) 응답 비율
+        self.feed_size = feed_size             # 피드 1건당 item 수
+        self.dup_rate = dup_rate               # 재배포(매체만 다른 같은 기사) 비율
+        self.conflict_rate = conflict_rate     # ref 갱신 직전에 다른 작성자의 커밋이 끼어드는 비율
+        self.seed = seed
+
+
+def _rng(*parts) -> random.Random:
+    digest = hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+
+def _terms(query: str) -> list[str]:
+    terms = [t.strip().strip('"()') for t in query.split(" OR ")]
+    return [t for t in terms if t] or ["반도체"]
+
+
+def build_feed(query: str, config: MockConfig, base_url: str, now: datetime) -> bytes:
+    """base_url = GOOGLE_NEWS_BASE. 기사 링크는 실제 피드처럼 {base_url}/rss/articles/{id}"""
+    rng = _rng(config.seed, "feed", query)
+    terms = _terms(query)
+    items = []
+    for i in range(config.feed_size):
+        if items and rng.random() < config.dup_rate:
+            title, _ = items[rng.randrange(len(items))]
+            source = rng.choice(_SOURCES)   # 같은 기사, 다른 매체
+        else:
+            title = f"{rng.choice(terms)} {rng.choice(_PHRASES)}… {rng.choice(_PHRASES)} 전망 {rng.randrange(10_000)}"
+            source = rng.choice(_SOURCES)
+        items.append((title, source))
+
+    body = []
+    for i, (title, source) in enumerate(items):
+        pub = now - timedelta(minutes=rng.randrange(36 * 60))
+        article_id = hashlib.sha1(f"{query}|{i}".encode("utf-8")).hexdigest()[:16]
+        body.append(
+            "<item>"
+            f"<title>{escape(title)} - {escape(source)}</title>"
+            f"<link>{base_url}/rss/articles/{article_id}</link>"
+            f"<pubDate>{format_datetime(pub.astimezone(timezone.utc), usegmt=True)}</pubDate>"
+            f"<source url=\"{base_url}\">{escape(source)}</source>"
+            "</item>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>{escape(query)}</title>{''.join(body)}</channel></rss>").encode("utf-8")
+
+
+def build_report(prompt: str, config: MockConfig, truncated: bool) -> str:
+    numbers = [int(n) for n in re.findall(r"^\[(\d+)\]", prompt, re.M)] or [1]
+    rng = _rng(config.seed, "report", hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+    if truncated:
+        return "## 📌 핵심 요약 (Executive Brief)\n반도체 소재 수급이"
+
+    def cite():
+        return "".join(f"[{n}]" for n in sorted(rng.sample(numbers, min(2, len(numbers)))))
+
+    sections = ["📌 핵심 요약 (Executive Brief)", "🚨 핵심 이슈 심층 분석", "🕸️ 공급망 및 기술 동향",
+                "💡 Analyst's View (시사점)"]
+    lines = []
+    for section in sections:
+        lines.append(f"## {section}")
+        for _ in range(3):
+            lines.append(f"- {rng.choice(_PHRASES)} 흐름이 {rng.choice(_PHRASES)}로 이어지는 중이다 {cite()}.")
+        lines.append("")
+    return "\n".join(lines)
+
+
+class _State:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.files: dict[str, bytes] = {}            # head 커밋의 파일 (경로 → 내용)
+        self.commits: dict[str, dict] = {}           # sha → {"files", "tree", "parents", "message"}
+        self.trees: dict[str, dict[str, bytes]] = {}
+        self.head = ""
+        self.counts: dict[str, int] = {}
+
+    def new_commit(self, files: dict[str, bytes], message: str, parents: list[str]) -> str:
+        """커밋 객체만 만듦 (head 이동은 호출 측). lock을 잡은 상태에서 호출."""
+        tree = self.new_tree(files)
+        sha = hashlib.sha1(f"{tree}|{','.join(parents)}|{message}|{len(self.commits)}".encode("utf-8")).hexdigest()
+        self.commits[sha] = {"files": dict(files), "tree": tree, "parents": parents, "message": message}
+        return sha
+
+    def new_tree(self, files: dict[str, bytes]) -> str:
+        sha = hashlib.sha1("|".join(f"{p}:{_sha(c)}" for p, c in sorted(files.items())).encode("utf-8")).hexdigest()
+        self.trees[sha] = dict(files)
+        return sha
+
+    def move_head(self, sha: str) -> None:
+        self.head = sha
+        self.files = dict(self.commits[sha]["files"])
+
+    def count(self, key: str):
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+
+class MockServices:
+    """ThreadingHTTPServer 하나로 세 서비스를 모두 흉내 냄 (start() 후 env()의 값을 환경변수로 사용)"""
+
+    def __init__(self, config: MockConfig | None = None, host: str = "127.0.0.1", port: int = 0,
+                 owner_repo: str = "mock/semi-info"):
+        self.config = config or MockConfig()
+        self.owner_repo = owner_repo
+        self.state = _State()
+        self._seed_files()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://{host}:{self.server.server_port}"
+        # 원문(언론사) URL: 같은 서버를 다른 호스트 이름으로 (link_resolver가 Google 링크와 구분하도록)
+        publisher_host = "localhost" if host == "127.0.0.1" else "127.0.0.1"
+        self.publisher_url = f"http://{publisher_host}:{self.server.server_port}"
+        self._thread: threading.Thread | None = None
+
+    def _seed_files(self):
+        with open(os.path.join(REPO_ROOT, "keywords.json"), "rb") as f:
+            files = {"keywords.json": f.read()}
+        with self.state.lock:
+            self.state.commits.clear()
+            self.state.trees.clear()
+            self.state.move_head(self.state.new_commit(files, "initial", []))
+
+    def seed(self, path: str, content: bytes) -> None:
+        """head에 파일 추가 커밋 (예: 기존 daily_history.json으로 이전 시나리오 준비)"""
+        with self.state.lock:
+            files = dict(self.state.files, **{path: content})
+            self.state.move_head(self.state.new_commit(files, f"seed {path}", [self.state.head]))
+
+    def reset(self):
+        """GitHub 저장 파일과 카운터 초기화 (반복 실행 시 '오늘 리포트 이미 존재' 스킵 방지)"""
+        with self.state.lock:
+            self.state.counts.clear()
+        self._seed_files()
+
+    def env(self) -> dict[str, str]:
+        return {
+            "GOOGLE_NEWS_BASE": self.base_url,
+            "GEMINI_API_BASE": f"{self.base_url}/v1beta",
+            "GITHUB_API_BASE": self.base_url,
+            "GEMINI_API_KEY": "mock-key",
+            "GITHUB_TOKEN": "mock-token",
+            "REPO_NAME": self.owner_repo,
+        }
+
+    def start(self) -> "MockServices":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # ── 요청 처리 ───────────────────────────────────────────
+    def _handler(self):
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json", headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, status: int, payload, headers=None):
+                self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), headers=headers)
+
+            def _delay(self, median: float, key: str):
+                config = services.config
+                if median > 0:
+                    rng = _rng(config.seed, "latency", key, time.monotonic_ns())
+                    time.sleep(median * rng.lognormvariate(0, config.latency_sigma))
+
+            def _throttle(self, kind: str) -> bool:
+                config = services.config
+                if config.rate_429 and random.random() < config.rate_429:
+                    services.state.count(f"{kind}_429")
+                    self._json(429, {"error": {"code": 429, "message": "mock rate limit"}},
+                               headers={"Retry-After": str(config.retry_after)})
+                    return True
+                return False
+
+            def _body(self) -> bytes:
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                path = url.path
+                if path == "/rss/search":
+                    services.state.count("rss")
+                    query = parse_qs(url.query).get("q", [""])[0].split(" when:")[0]
+                    self._delay(services.config.rss_latency, path + query)
+                    if self._throttle("rss"):
+                        return
+                    body = build_feed(query, services.config, services.base_url, datetime.now(timezone.utc))
+                    return self._send(200, body, "application/rss+xml; charset=UTF-8")
+                if path.startswith("/rss/articles/"):
+                    services.state.count("link_page")
+                    self._delay(services.config.rss_latency, path)
+                    article_id = path.rsplit("/", 1)[-1]
+                    html = (f'<html><body><c-wiz><div jscontroller="aLI87" data-n-a-id="{article_id}" '
+                            f'data-n-a-ts="1700000000" data-n-a-sg="mock-{article_id}"></div></c-wiz></body></html>')
+                    return self._send(200, html.encode("utf-8"), "text/html; charset=UTF-8")
+                if path.startswith("/articles/"):
+                    services.state.count("article")
+                    self._delay(services.config.rss_latency, path)
+                    paragraph = "<p>" + "반도체 소재 공급망 관련 세부 내용을 설명하는 문단이다. " * 8 + "</p>"
+                    html = f"<html><body><nav>메뉴</nav><article>{paragraph * 4}</article></body></html>"
+                    return self._send(200, html.encode("utf-8"), "text/html; charset=UTF-8")
+                if path == "/v1beta/models":
+                    services.state.count("gemini_models")
+                    models = ["gemini-2.0-flash", "gemini-2.5-flash", "gemini-2.0-flash-lite"]
+                    return self._json(200, {"models": [
+                        {"name": f"models/{m}", "supportedGenerationMethods": ["generateContent"]} for m in models
+                    ]})
+                if path.startswith("/repos/"):
+                    return self._github_get(path, url.query)
+                self._json(404, {"message": "Not Found"})
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path.startswith("/repos/"):
+                    return self._github_post(url.path)
+                if url.path == "/_/DotsSplashUi/data/batchexecute":
+                    return self._batchexecute()
+                match = re.match(r"^/v1beta/models/([^:]+):(generateContent|streamGenerateContent)$", url.path)
+                if not match:
+                    return self._json(404, {"message": "Not Found"})
+                request = json.loads(self._body() or b"{}")
+                services.state.count("gemini")
+                self._delay(services.config.gemini_latency, url.path)
+                if self._throttle("gemini"):
+                    return
+                prompt = request["contents"][0]["parts"][0]["text"]
+                truncated = random.random() < services.config.truncate_rate
+                if truncated:
+                    services.state.count("gemini_truncated")
+                text = build_report(prompt, services.config, truncated)
+                if match.group(2) == "generateContent":
+                    return self._json(200, {"candidates": [
+                        {"content": {"parts": [{"text": text}]}, "finishReason": "MAX_TOKENS" if truncated else "STOP"}
+                    ]})
+                # SSE: 줄 단위로 나눠 전송
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                lines = text.splitlines(keepends=True)
+                for i, line in enumerate(lines):
+                    event = {"candidates": [{"content": {"parts": [{"text": line}]}}]}
+                    if i == len(lines) - 1:
+                        event["candidates"][0]["finishReason"] = "MAX_TOKENS" if truncated else "STOP"
+                    self.wfile.write(f"data: {json.dumps(event, ensure_ascii=False)}\r\n\r\n".encode("utf-8"))
+                    self.wfile.flush()
+                    time.sleep(0.01)
+                self.close_connection = True
+
+            def do_PUT(self):
+                path = urlparse(self.path).path
+                match = re.match(r"^/repos/([^/]+/[^/]+)/contents/(.+)$", path)
+                if not match:
+                    return self._json(404, {"message": "Not Found"})
+                services.state.count("github_write")
+                if self._throttle("github"):
+                    return
+                payload = json.loads(self._body() or b"{}")
+                name = unquote(match.group(2))
+                state = services.state
+                with state.lock:
+                    existing = state.files.get(name)
+                    if existing is not None and payload.get("sha") != _sha(existing):
+                        return self._json(409, {"message": f"{name} does not match {payload.get('sha')}"})
+                    content = base64.b64decode(payload.get("content", ""))
+                    files = dict(state.files, **{name: content})
+                    commit = state.new_commit(files, payload.get("message", ""), [state.head])
+                    state.move_head(commit)
+                status = 200 if existing is not None else 201
+                self._json(status, {"content": self._file_json(match.group(1), name, content, inline=False),
+                                    "commit": self._commit_json(match.group(1), commit)})
+
+            def _github_post(self, path: str):
+                match = re.match(r"^/repos/([^/]+/[^/]+)/git/(trees|commits)$", path)
+                if not match:
+                    return self._json(404, {"message": "Not Found"})
+                services.state.count("github_write")
+                if self._throttle("github"):
+                    return
+                repo, kind = match.groups()
+                payload = json.loads(self._body() or b"{}")
+                state = services.state
+                with state.lock:
+                    if kind == "commits":
+                        if payload.get("tree") not in state.trees:
+                            return self._json(422, {"message": "Tree SHA does not exist"})
+                        sha = state.new_commit(state.trees[payload["tree"]], payload.get("message", ""),
+                                               payload.get("parents", []))
+                        return self._json(201, self._commit_json(repo, sha))
+                    files = dict(state.trees.get(payload.get("base_tree"), {}))
+                    for element in payload.get("tree", []):
+                        if "content" in element:
+                            files[element["path"]] = element["content"].encode("utf-8")
+                        elif element.get("sha") is None:
+                            files.pop(element["path"], None)
+                        else:
+                            blob = next((c for t in state.trees.values() for c in t.values()
+                                         if _sha(c) == element["sha"]), None)
+                            if blob is None:
+                                return self._json(422, {"message": "Invalid tree info"})
+                            files[element["path"]] = blob
+                    tree = state.new_tree(files)
+                self._json(201, {"sha": tree, "url": f"{services.base_url}/repos/{repo}/git/trees/{tree}",
+                                 "tree": [{"path": p, "mode": "100644", "type": "blob", "sha": _sha(c),
+                                           "size": len(c)} for p, c in sorted(files.items())]})
+
+            def do_PATCH(self):
+                path = urlparse(self.path).path
+                match = re.match(r"^/repos/([^/]+/[^/]+)/git/refs/heads/main$", path)
+                if not match:
+                    return self._json(404, {"message": "Not Found"})
+                services.state.count("github_write")
+                if self._throttle("github"):
+                    return
+                payload = json.loads(self._body() or b"{}")
+                state = services.state
+                with state.lock:
+                    if random.random() < services.config.conflict_rate:
+                        # 다른 작성자가 먼저 커밋한 상황: 파일 변경 없이 head만 앞으로
+                        state.move_head(state.new_commit(state.files, "concurrent writer", [state.head]))
+                        state.counts["github_conflict"] = state.counts.get("github_conflict", 0) + 1
+                    new = state.commits.get(payload.get("sha"))
+                    if new is None:
+                        return self._json(422, {"message": "Object does not exist"})
+                    if not payload.get("force") and state.head not in new["parents"]:
+                        return self._json(422, {"message": "Update is not a fast forward"})
+                    state.move_head(payload["sha"])
+                self._json(200, self._ref_json(match.group(1)))
+
+            def _batchexecute(self):
+                """link_resolver._decode_online의 garturlreq → Google 응답 형식 그대로 원문 URL 반환"""
+                services.state.count("link_batch")
+                self._delay(services.config.rss_latency, "batchexecute")
+                f_req = parse_qs(self._body().decode("utf-8")).get("f.req", ["[]"])[0]
+                try:
+                    article_id = json.loads(json.loads(f_req)[0][0][1])[2]
+                except (ValueError, IndexError, TypeError):
+                    return self._send(400, b"bad request", "text/plain")
+                url = f"{services.publisher_url}/articles/{article_id}"
+                payload = [["wrb.fr", "Fbv4je", json.dumps(["garturlres", url, 1]), None, None, None, "generic"],
+                           ["di", 10], ["af.httprm", 10, "", 1]]
+                self._send(200, (")]}'\n\n" + json.dumps(payload)).encode("utf-8"), "application/json; charset=utf-8")
+
+            def _github_get(self, path: str, query: str = ""):
+                services.state.count("github_read")
+                if self._throttle("github"):
+                    return
+                match = re.match(r"^/repos/([^/]+/[^/]+)(?:/(contents|git/blobs|git/ref|git/commits)/(.+))?$", path)
+                if not match:
+                    return self._json(404, {"message": "Not Found"})
+                repo, kind, rest = match.groups()
+                if kind is None:
+                    owner, name = repo.split("/")
+                    return self._json(200, {"id": 1, "name": name, "full_name": repo,
+                                            "owner": {"login": owner, "id": 1},
+                                            "url": f"{services.base_url}/repos/{repo}",
+                                            "default_branch": "main"})
+                state = services.state
+                with state.lock:
+                    if kind == "git/ref":
+                        return self._json(200, self._ref_json(repo)) if rest == "heads/main" else \
+                            self._json(404, {"message": "Not Found"})
+                    if kind == "git/commits":
+                        return self._json(200, self._commit_json(repo, rest)) if rest in state.commits else \
+                            self._json(404, {"message": "Not Found"})
+                    ref = parse_qs(query).get("ref", [""])[0]
+                    files = dict(state.commits[ref]["files"] if ref in state.commits else state.files)
+                    if kind == "git/blobs":
+                        files = {p: c for t in state.trees.values() for p, c in t.items()}
+                if kind == "git/blobs":
+                    content = next((c for c in files.values() if _sha(c) == rest), None)
+                    if content is None:
+                        return self._json(404, {"message": "Not Found"})
+                    return self._json(200, {"sha": rest, "size": len(content), "encoding": "base64",
+                                            "content": base64.b64encode(content).decode("ascii"),
+                                            "url": f"{services.base_url}/repos/{repo}/git/blobs/{rest}"})
+                name = unquote(rest)
+                if name not in files:
+                    return self._json(404, {"message": "Not Found"})
+                self._json(200, self._file_json(repo, name, files[name]))
+
+            def _ref_json(self, repo: str) -> dict:
+                url = f"{services.base_url}/repos/{repo}/git/refs/heads/main"
+                head = services.state.head
+                return {"ref": "refs/heads/main", "url": url,
+                        "object": {"sha": head, "type": "commit",
+                                   "url": f"{services.base_url}/repos/{repo}/git/commits/{head}"}}
+
+            def _commit_json(self, repo: str, sha: str) -> dict:
+                commit = services.state.commits[sha]
+                base = f"{services.base_url}/repos/{repo}/git"
+                return {"sha": sha, "url": f"{base}/commits/{sha}", "message": commit["message"],
+                        "tree": {"sha": commit["tree"], "url": f"{base}/trees/{commit['tree']}"},
+                        "parents": [{"sha": p, "url": f"{base}/commits/{p}"} for p in commit["parents"]]}
+
+            def _file_json(self, repo: str, name: str, content: bytes, inline: bool = True) -> dict:
+                big = len(content) > 1_000_000   # 실제 Contents API처럼 1MB 초과는 inline content 없음
+                return {
+                    "type": "file", "name": os.path.basename(name), "path": name, "size": len(content),
+                    "sha": _sha(content),
+                    "encoding": "none" if big else "base64",
+                    "content": "" if big or not inline else base64.b64encode(content).decode("ascii"),
+                    "url": f"{services.base_url}/repos/{repo}/contents/{name}",
+                }
+
+        return Handler
+
+
+def _sha(content: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def add_config_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--rss-latency", type=float, default=0.2)
+    parser.add_argument("--gemini-latency", type=float, default=2.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--feed-size", type=int, default=100)
+    parser.add_argument("--dup-rate", type=float, default=0.2)
+    parser.add_argument("--conflict-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def config_from_args(args) -> MockConfig:
+    return MockConfig(rss_latency=args.rss_latency, gemini_latency=args.gemini_latency,
+                      latency_sigma=args.latency_sigma, rate_429=args.rate_429, retry_after=args.retry_after,
+                      truncate_rate=args.truncate_rate, feed_size=args.feed_size, dup_rate=args.dup_rate,
+                      conflict_rate=args.conflict_rate,
+                      seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 Google News / Gemini / GitHub 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_config_args(parser)
+    args = parser.parse_args()
+
+    services = MockServices(config_from_args(args), host=args.host, port=args.port)
+    print("# 아래 환경변수를 설정한 뒤 generate_report.py / app.py를 실행")
+    for key, value in services.env().items():
+        print(f"export {key}={value}")
+    try:
+        services.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        services.server.server_close()
+        print(json.dumps(services.state.counts, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+cassette.py
+───────────
+generate_report.py 실행 1회의 모든 HTTP 교환(RSS 본문, 링크 변환, 기사 본문, Gemini 요청/응답,
+GitHub 읽기/쓰기)을 gzip JSON 카세트 1개에 녹화하고, 나중에 네트워크 없이 그대로 재생한다.
+
+- 가로채는 지점: requests.adapters.HTTPAdapter.send (news_fetcher 세션, Gemini 호출, PyGithub 모두 통과)
+- 매칭 키: 메서드 + URL(API 키 쿼리 제거) + POST 본문 SHA-256. 같은 키의 응답이 여럿이면 녹화 순서대로
+  재생 (429 → 200 같은 재시도 흐름도 재현), 다 쓰면 마지막 응답을 반복
+- GitHub 쓰기(Contents PUT, Git Data API의 tree/commit POST·ref PATCH)는 본문(generated_at 등 실행마다
+  바뀜)을 키에서 빼고, 재생 시 실제로 보내지 않고 녹화된 응답을 돌려준다. 재생 중 쓰려던 파일 내용은 Cassette.written에 모아 비교/저장에 사용
+- 녹화/재생 모두 디스크 캐시(.cache)를 임시 디렉토리로 돌려 캐시 적중으로 빠지는 요청이 없게 하고,
+  기준 시각(RUN_AT)을 녹화 시각으로 고정해 뉴스 시간 윈도우·최신성 가중치가 같게 계산되도록 한다
+- Authorization 등 요청 헤더와 API 키는 저장하지 않는다
+
+실행:
+  python cassette.py record runs/2026-10-17.json.gz        # 실제 서비스로 실행하며 녹화
+  python cassette.py replay runs/2026-10-17.json.gz --check  # 오프라인 재생 + 녹화 당시 저장 결과와 비교
+  python cassette.py replay runs/2026-10-17.json.gz --repeat 10 [--profile]   # 고정 입력 벤치마크
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import unquote, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from history_codec import decode_document
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+_SECRET_PARAM    = re.compile(r"([?&])key=[^&]*&?")
+_DROP_HEADERS    = {"set-cookie", "content-encoding", "content-length", "transfer-encoding", "connection"}
+_VOLATILE_KEYS   = {"generated_at"}
+
+
+class CassetteMiss(requests.ConnectionError):
+    """재생 중 카세트에 없는 요청 (파이프라인에는 네트워크 오류처럼 보임)"""
+
+
+def _clean_url(url: str) -> str:
+    return _SECRET_PARAM.sub(lambda m: m.group(1) if m.group(0).endswith("&") else "", url).rstrip("?&")
+
+
+def _body_bytes(body) -> bytes:
+    if body is None:
+        return b""
+    return body.encode("utf-8") if isinstance(body, str) else bytes(body)
+
+
+def is_repo_write(method: str, url: str) -> bool:
+    path = urlsplit(url).path
+    return method in ("PUT", "PATCH") or (method == "POST" and path.startswith("/repos/") and "/git/" in path)
+
+
+def request_key(method: str, url: str, body) -> str:
+    key = f"{method} {_clean_url(url)}"
+    if method == "POST" and not is_repo_write(method, url):
+        key += " " + hashlib.sha256(_body_bytes(body)).hexdigest()[:16]
+    return key
+
+
+def _encode(data: bytes) -> dict:
+    try:
+        return {"text": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(data).decode("ascii")}
+
+
+def _decode(field: dict) -> bytes:
+    return field["text"].encode("utf-8") if "text" in field else base64.b64decode(field.get("b64", ""))
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"알 수 없는 카세트 모드: {mode}")
+        self.path = path
+        self.mode = mode
+        self.recorded_at = time.time()
+        self.interactions: list[dict] = []
+        self.written: dict[str, bytes] = {}   # 재생 중 GitHub에 쓰려던 파일 (경로 → 내용)
+        self.misses: list[str] = []
+        self._cursor: dict[str, int] = {}
+        self._by_key: dict[str, list[dict]] = {}
+        self._lock = threading.Lock()
+        self._original_send = None
+        if mode == "replay":
+            self._load()
+
+    # ── 파일 ───────────────────────────────────────────────
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"지원하지 않는 카세트 버전: {data.get('version')}")
+        self.recorded_at = data["recorded_at"]
+        self.interactions = data["interactions"]
+        for item in self.interactions:
+            self._by_key.setdefault(item["key"], []).append(item)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        payload = {"version": CASSETTE_VERSION, "recorded_at": self.recorded_at, "interactions": self.interactions}
+        tmp = f"{self.path}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=9) as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        logger.info(f"카세트 저장: {self.path} ({len(self.interactions)}건, {os.path.getsize(self.path) / 1024:.0f}KB)")
+
+    # ── 가로채기 ───────────────────────────────────────────
+    def __enter__(self) -> "Cassette":
+        self._original_send = HTTPAdapter.send
+        cassette = self
+
+        def send(adapter, request, **kwargs):
+            return cassette._send(adapter, request, **kwargs)
+
+        HTTPAdapter.send = send
+        return self
+
+    def __exit__(self, *exc):
+        HTTPAdapter.send = self._original_send
+        if self.mode == "record":
+            self.save()
+        return False
+
+    def _send(self, adapter, request, **kwargs):
+        key = request_key(request.method, request.url, request.body)
+        if self.mode == "record":
+            response = self._original_send(adapter, request, **kwargs)
+            self._record(key, request, response)
+            return response
+        return self._replay(key, request)
+
+    def _record(self, key: str, request, response):
+        body = response.content   # stream=True 응답도 여기서 끝까지 읽어 둠 (이후 iter_lines는 메모리에서)
+        item = {
+            "key": key,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+            "body": _encode(body),
+        }
+        if request.method in ("POST", "PUT", "PATCH"):
+            item["request"] = _encode(_body_bytes(request.body))
+        with self._lock:
+            self.interactions.append(item)
+
+    def _replay(self, key: str, request):
+        with self._lock:
+            items = self._by_key.get(key)
+            if not items:
+                self.misses.append(key)
+                raise CassetteMiss(f"카세트에 없는 요청: {key}", request=request)
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            item = items[min(index, len(items) - 1)]
+            if is_repo_write(request.method, request.url):
+                self.written.update(_written_files(request.url, _body_bytes(request.body)))
+
+        response = requests.Response()
+        response.status_code = item["status"]
+        response.reason = item.get("reason") or ""
+        response.headers = CaseInsensitiveDict(item["headers"])
+        response._content = _decode(item["body"])
+        response.url = request.url
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    # ── 비교 ───────────────────────────────────────────────
+    def recorded_writes(self) -> dict[str, bytes]:
+        """녹화 당시 GitHub에 쓴 파일 (같은 경로는 마지막 쓰기)"""
+        result = {}
+        for item in self.interactions:
+            method, url = item["key"].split(" ")[:2]
+            if "request" in item and is_repo_write(method, url):
+                result.update(_written_files(url, _decode(item["request"])))
+        return result
+
+
+def _written_files(url: str, body: bytes) -> dict[str, bytes]:
+    """쓰기 요청 본문 → {경로: 파일 내용} (Contents API PUT / Git Data API tree 생성)"""
+    path = urlsplit(url).path
+    try:
+        payload = json.loads(body)
+        if "/contents/" in path:
+            return {unquote(path.split("/contents/", 1)[1]): base64.b64decode(payload["content"])}
+        if path.endswith("/git/trees"):
+            return {e["path"]: e["content"].encode("utf-8") for e in payload.get("tree", []) if "content" in e}
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f"쓰기 요청 해석 실패 [{path}]: {e}")
+    return {}
+
+
+def _strip_volatile(value):
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in _VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def compare_writes(expected: dict[str, bytes], actual: dict[str, bytes]) -> list[str]:
+    """녹화 vs 재생 저장 결과 차이 (JSON은 압축 형식을 풀고 generated_at 등 실행 시각 필드를 빼고 비교)"""
+    problems = []
+    for path in sorted(set(expected) | set(actual)):
+        if path not in actual:
+            problems.append(f"{path}: 재생에서 저장되지 않음")
+            continue
+        if path not in expected:
+            problems.append(f"{path}: 녹화에 없던 저장")
+            continue
+        try:
+            same = (_strip_volatile(decode_document(json.loads(expected[path])))
+                    == _strip_volatile(decode_document(json.loads(actual[path]))))
+        except ValueError:
+            same = expected[path] == actual[path]
+        if not same:
+            problems.append(f"{path}: 내용이 다름")
+    return problems
+
+
+# ════════════════════════════════════════════════════════════
+# 실행
+# ════════════════════════════════════════════════════════════
+def _isolate_caches(root: str, run_at: float | None) -> None:
+    """generate_report import 전에 호출: 디스크 캐시를 임시 디렉토리로, 기준 시각 고정"""
+    os.environ.update({
+        "FEED_CACHE_DIR":    os.path.join(root, "feeds"),
+        "GEMINI_CACHE_DIR":  os.path.join(root, "gemini"),
+        "ARTICLE_CACHE_DIR": os.path.join(root, "articles"),
+        "LINK_CACHE_FILE":   os.path.join(root, "links.json"),
+        "MODEL_STATS_FILE":  os.path.join(root, "model_stats.json"),
+    })
+    if run_at is not None:
+        os.environ["RUN_AT"] = str(run_at)
+
+
+def _reset_caches(root: str) -> None:
+    """반복 재생 사이에 디스크 캐시와 프로세스 전역 캐시 인스턴스를 비움"""
+    import shutil
+
+    import feed_cache
+    import gemini_cache
+    import model_router
+
+    shutil.rmtree(root, ignore_errors=True)
+    os.makedirs(root, exist_ok=True)
+    feed_cache._default_cache = None
+    gemini_cache._default_cache = None
+    model_router._default_router = None
+
+
+def _run_main(generate_report) -> bool:
+    try:
+        generate_report.main()
+        return True
+    except SystemExit as e:
+        return not e.code
+    except Exception as e:
+        logger.error(f"파이프라인 실행 실패: {e}")
+        return False
+
+
+def record(path: str) -> int:
+    with tempfile.TemporaryDirectory(prefix="cassette-") as root:
+        cassette = Cassette(path, "record")
+        _isolate_caches(root, cassette.recorded_at)
+        import generate_report
+
+        with cassette:
+            ok = _run_main(generate_report)
+    return 0 if ok else 1
+
+
+def replay(path: str, check: bool = False, repeat: int = 1, out_dir: str | None = None,
+           profile: bool = False) -> int:
+    cassette = Cassette(path, "replay")
+    # 키가 없어도 되도록 더미 값 (요청 키에서 API 키는 제거되므로 매칭에 영향 없음)
+    for name in ("GEMINI_API_KEY", "GITHUB_TOKEN"):
+        os.environ.setdefault(name, "replay")
+    # 저장소 이름은 요청 URL에 들어가므로 녹화 당시 값으로 맞춤
+    for item in cassette.interactions:
+        match = re.match(r"GET https?://[^/]+/repos/([^/]+/[^/?]+)", item["key"])
+        if match:
+            os.environ["REPO_NAME"] = match.group(1)
+            break
+
+    with tempfile.TemporaryDirectory(prefix="cassette-") as root:
+        _isolate_caches(root, cassette.recorded_at)
+        import generate_report
+
+        profiler = None
+        if profile:
+            import cProfile
+            profiler = cProfile.Profile()
+
+        timings, ok = [], True
+        for _ in range(repeat):
+            _reset_caches(root)
+            cassette._cursor.clear()
+            cassette.misses.clear()
+            started = time.perf_counter()
+            with cassette:
+                if profiler:
+                    profiler.enable()
+                ok = _run_main(generate_report) and ok
+                if profiler:
+                    profiler.disable()
+            timings.append(time.perf_counter() - started)
+
+    if cassette.misses:
+        logger.warning(f"카세트에 없는 요청 {len(cassette.misses)}건 (코드 변경으로 요청이 달라졌을 수 있음): "
+                       f"{cassette.misses[:5]}")
+    timings.sort()
+    print(f"재생 {repeat}회: p50 {timings[len(timings) // 2]:.3f}s  min {timings[0]:.3f}s  max {timings[-1]:.3f}s")
+    if profiler:
+        import pstats
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+    if out_dir:
+        for name, content in cassette.written.items():
+            target = os.path.join(out_dir, name)
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(content)
+        print(f"재생 저장 결과 → {out_dir} ({len(cassette.written)}개 파일)")
+
+    if check:
+        problems = compare_writes(cassette.recorded_writes(), cassette.written)
+        for problem in problems:
+            print(f"  ✗ {problem}")
+        print("녹화 결과와 일치" if not problems else f"녹화 결과와 불일치 {len(problems)}건")
+        ok = ok and not problems
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="generate_report.py 녹화/재생")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    rec = sub.add_parser("record", help="실제 서비스로 실행하며 카세트 녹화")
+    rec.add_argument("path")
+    rep = sub.add_parser("replay", help="카세트로 오프라인 재생")
+    rep.add_argument("path")
+    rep.add_argument("--check", action="store_true", help="녹화 당시 GitHub 저장 결과와 비교 (다르면 종료 코드 1)")
+    rep.add_argument("--repeat", type=int, default=1, help="반복 횟수 (고정 입력 벤치마크)")
+    rep.add_argument("--out", help="재생 중 저장하려던 파일을 이 디렉토리에 기록")
+    rep.add_argument("--profile", action="store_true", help="cProfile 누적 시간 상위 25개 출력")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        sys.exit(record(args.path))
+    sys.exit(replay(args.path, check=args.check, repeat=args.repeat, out_dir=args.out, profile=args.profile))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+endpoints.py
+────────────
+외부 서비스 기본 URL. 환경변수로 바꾸면 benchmarks/mock_services.py 같은 로컬 대역 서버로
+전체 파이프라인(generate_report.main, app.py)을 실제 서비스 호출 없이 돌릴 수 있다.
+
+  GOOGLE_NEWS_BASE  (기본 https://news.google.com)
+  GEMINI_API_BASE   (기본 https://generativelanguage.googleapis.com/v1beta)
+  GITHUB_API_BASE   (기본 https://api.github.com)
+"""
+
+import os
+
+GOOGLE_NEWS_BASE = os.environ.get("GOOGLE_NEWS_BASE", "https://news.google.com").rstrip("/")
+GEMINI_API_BASE  = os.environ.get("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta").rstrip("/")
+GITHUB_API_BASE  = os.environ.get("GITHUB_API_BASE", "https://api.github.com").rstrip("/")
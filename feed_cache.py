@@ -0,0 +1,146 @@
+"""
+feed_cache.py
+─────────────
+Google News RSS 응답을 디스크에 보관하는 Conditional-GET 캐시.
+
+- 키: RSS 쿼리 URL의 SHA-1 → <key>.body(원문) + <key>.json(메타: ETag, Last-Modified, 저장 시각)
+- TTL 이내면 네트워크 없이 캐시 본문 사용, TTL이 지나면 If-None-Match / If-Modified-Since로 재검증
+- 전체 용량이 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+FEED_CACHE_DIR       = os.environ.get("FEED_CACHE_DIR", os.path.join(".cache", "feeds"))
+FEED_CACHE_TTL       = int(os.environ.get("FEED_CACHE_TTL", 15 * 60))   # 15분 이내 재생성은 네트워크 0회
+FEED_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+
+class FeedCache:
+    def __init__(self, cache_dir: str = FEED_CACHE_DIR, ttl: int = FEED_CACHE_TTL,
+                 max_bytes: int = FEED_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    # ── 내부 경로 ─────────────────────────────────────────
+    def _paths(self, url: str) -> tuple[str, str]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    # ── 조회 / 저장 ───────────────────────────────────────
+    def lookup(self, url: str) -> dict | None:
+        """캐시 항목 {"meta": {...}, "body": bytes} 반환 (없거나 손상되면 None)"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+            os.utime(meta_path)  # LRU 기준: 마지막 사용 시각
+        except (OSError, ValueError):
+            return None
+        return {"meta": meta, "body": body}
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry["meta"].get("stored_at", 0) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: dict | None) -> dict:
+        if not entry:
+            return {}
+        headers = {}
+        meta = entry["meta"]
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def store(self, url: str, body: bytes, headers) -> None:
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url":           url,
+            "etag":          headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at":     time.time(),
+            "size":          len(body),
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._atomic_write(body_path, body)
+            self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"피드 캐시 저장 실패: {e}")
+            return
+        self._evict()
+
+    def refresh(self, url: str, entry: dict) -> None:
+        """304 Not Modified 응답 → 본문은 그대로 두고 저장 시각만 갱신 (TTL 재시작)"""
+        meta_path, _ = self._paths(url)
+        meta = dict(entry["meta"], stored_at=time.time())
+        try:
+            self._atomic_write(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"피드 캐시 갱신 실패: {e}")
+
+    # ── 용량 관리 ─────────────────────────────────────────
+    def _evict(self):
+        with self._lock:
+            try:
+                names = [n for n in os.listdir(self.cache_dir) if n.endswith(".json")]
+            except OSError:
+                return
+            entries, total = [], 0
+            for name in names:
+                meta_path = os.path.join(self.cache_dir, name)
+                body_path = meta_path[:-len(".json")] + ".body"
+                try:
+                    size = os.path.getsize(body_path)
+                    used = os.path.getmtime(meta_path)
+                except OSError:
+                    # 본문 없이 남은 메타 파일(동시 삭제 후 304 갱신 등)은 정리
+                    try:
+                        os.remove(meta_path)
+                    except OSError:
+                        pass
+                    continue
+                entries.append((used, size, meta_path, body_path))
+                total += size
+            if total <= self.max_bytes:
+                return
+            for _, size, meta_path, body_path in sorted(entries):
+                for path in (meta_path, body_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+
+_default_cache: FeedCache | None = None
+
+
+def get_feed_cache() -> FeedCache:
+    """프로세스 전역 기본 캐시 인스턴스"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = FeedCache()
+    return _default_cache
@@ -0,0 +1,109 @@
+"""
+gemini_cache.py
+───────────────
+Gemini generateContent 응답 캐시 (content-addressed).
+
+- 키: SHA-256(model, prompt, generationConfig) → 같은 기사 목록이면 같은 키
+- 로컬 파일 백엔드(.cache/gemini/<key>.json), TTL 만료 + 항목 수 초과 시 LRU 삭제
+- get(..., bypass=True)면 항상 미적중 → 호출 측이 새로 생성해 put으로 덮어씀
+  (app.py "캐시된 AI 응답 무시" 체크박스, generate_report.py GEMINI_CACHE_BYPASS=1)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+GEMINI_CACHE_DIR         = os.environ.get("GEMINI_CACHE_DIR", os.path.join(".cache", "gemini"))
+GEMINI_CACHE_TTL         = int(os.environ.get("GEMINI_CACHE_TTL", 24 * 3600))
+GEMINI_CACHE_MAX_ENTRIES = 200
+
+
+def cache_key(model: str, prompt: str, generation_config: dict) -> str:
+    payload = json.dumps(
+        {"model": model, "prompt": prompt, "generationConfig": generation_config},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class GeminiCache:
+    def __init__(self, cache_dir: str = GEMINI_CACHE_DIR, ttl: int = GEMINI_CACHE_TTL,
+                 max_entries: int = GEMINI_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, model: str, prompt: str, generation_config: dict, bypass: bool = False) -> str | None:
+        """캐시된 응답 텍스트 (없거나 만료, bypass=True면 None)"""
+        if bypass:
+            return None
+        path = self._path(cache_key(model, prompt, generation_config))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry.get("stored_at", 0) >= self.ttl:
+                os.remove(path)
+                return None
+            os.utime(path)  # LRU 기준: 마지막 사용 시각
+        except (OSError, ValueError):
+            return None
+        logger.info(f"Gemini 응답 캐시 적중 [{model}]")
+        return entry.get("text")
+
+    def put(self, model: str, prompt: str, generation_config: dict, text: str) -> None:
+        path = self._path(cache_key(model, prompt, generation_config))
+        entry = {"model": model, "text": text, "stored_at": time.time()}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Gemini 캐시 저장 실패: {e}")
+            return
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            try:
+                paths = [os.path.join(self.cache_dir, n) for n in os.listdir(self.cache_dir)
+                         if n.endswith(".json")]
+            except OSError:
+                return
+            now = time.time()
+            entries = []
+            for path in paths:
+                try:
+                    used = os.path.getmtime(path)
+                except OSError:
+                    continue
+                entries.append((used, path))
+            entries.sort(reverse=True)
+            # 최근 사용 순으로 max_entries개만 남기고, 그 안에서도 TTL 지난 파일은 삭제
+            for rank, (used, path) in enumerate(entries):
+                if rank >= self.max_entries or now - used >= self.ttl:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+
+_default_cache: GeminiCache | None = None
+
+
+def get_gemini_cache() -> GeminiCache:
+    """프로세스 전역 기본 캐시 인스턴스"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = GeminiCache()
+    return _default_cache
@@ -0,0 +1,45 @@
+"""
+gemini_stream.py
+────────────────
+Gemini streamGenerateContent(SSE) 응답 파서.
+
+- `?alt=sse`로 요청하면 응답이 `data: {GenerateContentResponse JSON}` 줄 단위로 도착
+- 각 이벤트의 텍스트 조각과 finishReason을 순서대로 돌려줌 (누적/렌더링은 호출 측 몫)
+"""
+
+import json
+import logging
+from typing import Iterator, NamedTuple
+
+from endpoints import GEMINI_API_BASE
+
+logger = logging.getLogger(__name__)
+
+
+class StreamChunk(NamedTuple):
+    text: str
+    finish_reason: str | None   # 마지막 이벤트에서만 채워짐 ("STOP", "MAX_TOKENS", "SAFETY" ...)
+
+
+def stream_url(model: str, api_key: str) -> str:
+    return f"{GEMINI_API_BASE}/models/{model}:streamGenerateContent?alt=sse&key={api_key}"
+
+
+def iter_sse_chunks(response) -> Iterator[StreamChunk]:
+    """requests.post(..., stream=True) 응답 → StreamChunk 순서대로"""
+    response.encoding = "utf-8"  # 한글이 청크 경계에서 잘려도 iter_lines가 점진적으로 디코딩
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        try:
+            event = json.loads(line[5:])
+        except ValueError:
+            logger.debug(f"SSE 이벤트 파싱 실패: {line[:80]}")
+            continue
+        candidates = event.get("candidates") or []
+        if not candidates:
+            continue
+        candidate = candidates[0]
+        parts = (candidate.get("content") or {}).get("parts") or []
+        text = "".join(p.get("text", "") for p in parts if not p.get("thought"))
+        yield StreamChunk(text, candidate.get("finishReason"))
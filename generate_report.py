@@ -8,26 +8,38 @@ Streamlit / session_state 완전 미사용.
   GEMINI_API_KEY  - Gemini API 키
   GITHUB_TOKEN    - (Actions에서 자동 제공) repo read/write 권한
   REPO_NAME       - "username/repo-name" 형태의 저장소 이름
+  (HISTORY_BACKEND=sqlite면 GitHub 대신 로컬 SQLite(HISTORY_DB)에 저장 - GITHUB_TOKEN/REPO_NAME 불필요)
 
 실행 방법 (로컬 테스트):
   GEMINI_API_KEY=... GITHUB_TOKEN=... REPO_NAME=user/repo python generate_report.py
+  (실행 1회를 녹화/오프라인 재생하려면 cassette.py 참고)
 """
 
-import base64
-import concurrent.futures
-import json
 import logging
 import os
-import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from urllib.parse import quote
 
 import requests
 import urllib3
-from bs4 import BeautifulSoup
-from github import Github
+
+from article_extractor import extract_bodies
+from endpoints import GEMINI_API_BASE
+from gemini_cache import get_gemini_cache
+from github_store import Batch, GitHubStore
+from history_store import MANIFEST_FILE, MAX_HISTORY, SEEN_INDEX_FILE, load_manifest, stage_entry
+from link_resolver import resolve_article_links
+from model_router import classify_status, get_model_router
+from news_collector import assign_categories, collect_news, merge_category_keywords
+from news_dedupe import dedupe_articles
+from news_window import TimeWindow, kst_to_epoch
+from prompt_packer import format_news_context, pack_news_context
+from report_mapreduce import build_map_prompt, cluster_articles, remap_citations, sanitize_citations
+from retry_policy import GEMINI_RETRY, parse_retry_after, set_run_deadline
+from seen_index import SeenFilter, SeenIndex
+from sqlite_store import HISTORY_BACKEND, SqliteStore
 
 # ── 로깅 ────────────────────────────────────────────────────
 logging.basicConfig(
@@ -41,75 +53,71 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # ── 상수 ────────────────────────────────────────────────────
 KEYWORD_FILE  = "keywords.json"
-HISTORY_FILE  = "daily_history.json"
+DAILY_REPORT  = "Daily Report"   # keywords.json의 기본 카테고리 (히스토리 최상위 report/articles)
 DEFAULT_KEYWORDS = ["반도체", "삼성전자", "SK하이닉스", "HBM", "NAND", "파운드리"]
-MAX_HISTORY   = 30          # 아카이브 최대 보관 수
 NEWS_LIMIT    = 40          # 기사 제목 40건은 입력 토큰 몇 천 개 수준 → 무료 티어에서도 여유 있음.
                              # 과거 응답 절단 문제의 실제 원인은 기사 수가 아니라 gemini-2.5의
                              # "thinking" 토큰이 출력 예산을 잠식한 것이었고 thinkingBudget=0으로 해결됨.
 NEWS_DAYS     = 2           # 수집 기간 (일)
 NEWS_WINDOW_H = 18          # 수집 시간 윈도우 (시간): 전날 12:00 ~ 당일 06:00
+FEED_DEADLINE = 8           # RSS 피드 1건당 최대 대기 시간 (초)
+RUN_DEADLINE  = int(os.environ.get("RUN_DEADLINE_SEC", 12 * 60))   # 실행 전체 마감 (워크플로 timeout 15분 이내)
+EXTRACT_BODIES = os.environ.get("EXTRACT_ARTICLE_BODIES", "") == "1"   # 기사 본문 발췌를 프롬프트에 포함
+REPORT_MODE   = os.environ.get("REPORT_MODE", "") or "single"   # "mapreduce"면 클러스터별 요약 후 병합
+MAPREDUCE_NEWS_LIMIT = 120  # map-reduce 모드 수집 예산 (클러스터마다 MAP_TOKEN_BUDGET 안에서 선별)
+REPORT_CATEGORIES = os.environ.get("REPORT_CATEGORIES", "") == "1"   # keywords.json의 다른 카테고리도 리포트 생성 (선택)
+CATEGORY_CONCURRENCY = 4    # 카테고리 리포트 동시 생성 수
+SKIP_SEEN     = os.environ.get("SKIP_SEEN_ARTICLES", "1") != "0"   # 최근 리포트가 인용한 기사는 수집에서 제외
+CACHE_BYPASS  = os.environ.get("GEMINI_CACHE_BYPASS", "") == "1"   # 캐시된 Gemini 응답을 무시하고 새로 생성해 덮어씀
+RUN_AT        = os.environ.get("RUN_AT", "")   # 기준 시각(epoch 초). 비우면 현재 시각 (cassette.py 재생 시 녹화 시각)
 
 # ── 환경변수 로드 ────────────────────────────────────────────
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 GITHUB_TOKEN   = os.environ.get("GITHUB_TOKEN", "")
 REPO_NAME      = os.environ.get("REPO_NAME", "")
 
+def _run_time() -> float:
+    """대상 날짜 계산의 기준 시각 (최신성 가중치는 뉴스 수집 범위의 끝 기준 - _write_report)"""
+    return float(RUN_AT) if RUN_AT else time.time()
+
 def _require_env():
-    missing = [k for k, v in {
-        "GEMINI_API_KEY": GEMINI_API_KEY,
-        "GITHUB_TOKEN":   GITHUB_TOKEN,
-        "REPO_NAME":      REPO_NAME,
-    }.items() if not v]
+    required = {"GEMINI_API_KEY": GEMINI_API_KEY}
+    if HISTORY_BACKEND != "sqlite":
+        required.update({"GITHUB_TOKEN": GITHUB_TOKEN, "REPO_NAME": REPO_NAME})
+    missing = [k for k, v in required.items() if not v]
     if missing:
         logger.error(f"필수 환경변수 누락: {missing}")
         sys.exit(1)
 
 
 # ════════════════════════════════════════════════════════════
-# 1. GitHub I/O
+# 1. GitHub I/O (HISTORY_BACKEND=sqlite면 로컬 SQLite)
 # ════════════════════════════════════════════════════════════
-def _get_repo():
-    return Github(GITHUB_TOKEN).get_repo(REPO_NAME)
+_history_store: GitHubStore | SqliteStore | None = None
+
+
+def _store() -> GitHubStore | SqliteStore:
+    """실행 동안 Github 클라이언트·repo 핸들(또는 SQLite 저장소)을 재사용"""
+    global _history_store
+    if _history_store is None:
+        _history_store = SqliteStore() if HISTORY_BACKEND == "sqlite" else GitHubStore(GITHUB_TOKEN, REPO_NAME)
+    return _history_store
+
 
-def _read_json_from_github(filename: str, default):
+def _read_json_from_github(filename: str, default, strict: bool = False):
+    """strict=True면 파일 없음(404)일 때만 default, 그 밖의 오류는 그대로 올림
+    (히스토리 manifest처럼 '없음'과 '읽기 실패'를 구분해야 하는 경우)"""
     try:
-        repo = _get_repo()
-        contents = repo.get_contents(filename)
-        if contents.encoding == "none":
-            # Contents API는 1MB 초과 파일에 inline content를 주지 않음(encoding="none").
-            # 이 경우 decoded_content가 예외를 던지므로 Git Blob API로 원본을 다시 조회한다.
-            blob = repo.get_git_blob(contents.sha)
-            raw = base64.b64decode(blob.content)
-            return json.loads(raw.decode("utf-8"))
-        return json.loads(contents.decoded_content.decode("utf-8"))
+        return _store().read_json(filename, default, strict=strict)
     except Exception as e:
+        if strict:
+            raise
         logger.warning(f"GitHub 읽기 실패 [{filename}]: {e}")
         return default
 
-def _write_json_to_github(filename: str, data):
-    try:
-        repo = _get_repo()
-        content_str = json.dumps(data, ensure_ascii=False, indent=2, default=str)
-        try:
-            existing = repo.get_contents(filename)
-            repo.update_file(
-                existing.path,
-                f"[Auto] Update {filename} - {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}",
-                content_str,
-                existing.sha,
-            )
-        except Exception:
-            repo.create_file(
-                filename,
-                f"[Auto] Create {filename}",
-                content_str,
-            )
-        logger.info(f"GitHub 저장 완료: {filename}")
-        return True
-    except Exception as e:
-        logger.error(f"GitHub 저장 실패 [{filename}]: {e}")
-        return False
+
+def _read_history_file(filename: str, default):
+    return _read_json_from_github(filename, default, strict=True)
 
 
 # ════════════════════════════════════════════════════════════
@@ -117,7 +125,7 @@ def _write_json_to_github(filename: str, data):
 # ════════════════════════════════════════════════════════════
 def load_keywords() -> list[str]:
     data = _read_json_from_github(KEYWORD_FILE, {})
-    keywords = data.get("Daily Report", [])
+    keywords = data.get(DAILY_REPORT, [])
     if not keywords:
         logger.warning("키워드 없음 → 기본 키워드 사용")
         keywords = DEFAULT_KEYWORDS
@@ -125,98 +133,102 @@ def load_keywords() -> list[str]:
     return keywords
 
 
+def load_keyword_categories() -> dict[str, list[str]]:
+    """{카테고리: 키워드 목록} - DAILY_REPORT가 항상 첫 번째"""
+    data = _read_json_from_github(KEYWORD_FILE, {})
+    categories = {DAILY_REPORT: data.get(DAILY_REPORT) or DEFAULT_KEYWORDS}
+    for category, keywords in data.items():
+        if category != DAILY_REPORT and isinstance(keywords, list) and keywords:
+            categories[category] = keywords
+    logger.info("카테고리: " + ", ".join(f"{c}({len(k)})" for c, k in categories.items()))
+    return categories
+
+
 # ════════════════════════════════════════════════════════════
 # 3. 뉴스 수집
 # ════════════════════════════════════════════════════════════
-def _fetch_keyword_news(kw: str, per_kw: int, start_dt: datetime, end_dt: datetime) -> tuple[list[dict], list[dict]]:
-    """단일 키워드 RSS를 1회만 조회하여 (시간필터 통과 목록, 원본 전체 목록)을 함께 반환.
-    폴백 시 재크롤링 없이 이 원본 목록을 그대로 재사용한다."""
-    url = (
-        f"https://news.google.com/rss/search?"
-        f"q={quote(kw)}+when:{NEWS_DAYS}d&hl=ko&gl=KR&ceid=KR:ko"
-    )
-    filtered: list[dict] = []
-    raw: list[dict] = []
-    try:
-        res = requests.get(url, timeout=8, verify=False)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.content, "xml")
-        for item in soup.find_all("item"):
-            title = item.title.text.strip() if item.title else ""
-            if not title:
-                continue
-            link  = item.link.text.strip()  if item.link  else ""
-            src   = item.source.text.strip() if item.source else "Google News"
-            date_raw = item.pubDate.text if item.pubDate else ""
-            parsed_date_str = None
-
-            # 시간 필터
-            is_valid = True
-            try:
-                pub_dt = datetime.strptime(date_raw, "%a, %d %b %Y %H:%M:%S %Z")
-                pub_dt_kst = pub_dt + timedelta(hours=9)
-                parsed_date_str = pub_dt_kst.strftime("%Y-%m-%d %H:%M:%S")
-                if not (start_dt <= pub_dt_kst <= end_dt):
-                    is_valid = False
-            except Exception:
-                pass  # 파싱 실패 시 포함
-
-            entry = {
-                "Title": title, "Link": link, "Date": date_raw,
-                "Source": src, "ParsedDate": parsed_date_str,
-            }
-            if len(raw) < per_kw:
-                raw.append(entry)
-            if is_valid and len(filtered) < per_kw:
-                filtered.append(entry)
-            if len(filtered) >= per_kw and len(raw) >= per_kw:
-                break
-    except Exception as e:
-        logger.warning(f"뉴스 수집 오류 [kw={kw}]: {e}")
-    return filtered, raw
+def _window_end(target_date_str: str) -> datetime:
+    """뉴스 수집 범위의 끝: target_date 06:00 KST"""
+    return datetime.strptime(target_date_str, "%Y-%m-%d").replace(hour=6, minute=0, second=0)
 
 
-def _dedupe(items: list[dict]) -> list[dict]:
-    seen, unique = set(), []
-    for item in items:
-        if item["Title"] not in seen:
-            seen.add(item["Title"])
-            unique.append(item)
-    return unique
+def _news_window(target_date_str: str) -> TimeWindow:
+    """target_date 전날 12:00 KST ~ target_date 06:00 KST"""
+    end_dt   = _window_end(target_date_str)
+    start_dt = end_dt - timedelta(hours=NEWS_WINDOW_H)
+    logger.info(f"뉴스 수집 범위: {start_dt} ~ {end_dt} KST")
+    return TimeWindow(start_dt, end_dt)
 
 
-def fetch_news(keywords: list[str], target_date_str: str) -> list[dict]:
+def _select(unique_filtered: list[dict], unique_raw, limit: int, label: str = "") -> list[dict]:
+    """시간 필터 결과가 5건 미만이면 이미 수집된 전체 뉴스로 폴백 (unique_raw는 목록 또는 지연 계산 함수)"""
+    if len(unique_filtered) < 5:
+        logger.warning(f"{label}시간 필터 결과 {len(unique_filtered)}건 → 폴백: 이미 수집된 전체 뉴스 재사용")
+        result_pool = unique_raw() if callable(unique_raw) else unique_raw
+    else:
+        result_pool = unique_filtered
+    return result_pool[:limit]
+
+
+def _seen_filter(target_date_str: str) -> SeenFilter | None:
+    """target_date 이전 리포트가 이미 인용한 기사 판별 함수 (색인이 없거나 SKIP_SEEN=0이면 None)"""
+    if not SKIP_SEEN:
+        return None
+    seen = SeenIndex.from_json(_read_json_from_github(SEEN_INDEX_FILE, None))
+    return seen.checker(target_date_str) if seen else None
+
+
+def _log_seen(seen: SeenFilter | None) -> None:
+    if seen is not None and seen.skipped:
+        logger.info(f"최근 리포트에 인용된 기사 {seen.skipped}건 제외 (수집 예산은 새 기사로 채움)")
+
+
+def fetch_news(keywords: list[str], target_date_str: str, limit: int = NEWS_LIMIT) -> list[dict]:
     """
     target_date 전날 12:00 KST ~ target_date 06:00 KST 범위 뉴스 수집.
     범위 내 뉴스가 없으면 이미 수집해 둔 전체 뉴스로 폴백(재크롤링 없음).
-    키워드별 요청은 병렬로 실행해 크롤링 시간을 단축한다.
+    키워드는 query_planner로 OR 쿼리에 묶고, news_collector가 기사 예산 기준으로 동시 수집한다.
+    최근 리포트가 이미 인용한 기사는 할당량을 차지하기 전에 제외한다 (폴백 목록 포함).
     """
-    target_date = datetime.strptime(target_date_str, "%Y-%m-%d")
-    end_dt   = target_date.replace(hour=6, minute=0, second=0)
-    start_dt = end_dt - timedelta(hours=NEWS_WINDOW_H)
-
-    logger.info(f"뉴스 수집 범위: {start_dt} ~ {end_dt} KST")
+    window = _news_window(target_date_str)
+    seen = _seen_filter(target_date_str)
 
-    per_kw = max(3, NEWS_LIMIT // max(len(keywords), 1))
-    filtered_all: list[dict] = []
-    raw_all: list[dict] = []
+    # 우선순위별 할당량으로 수집하고, 앞 순위 요청만으로 예산이 차면 나머지는 취소 (결과 순서는 항상 키워드 순)
+    filtered_all, raw_all = collect_news(keywords, NEWS_DAYS, window, limit, deadline=FEED_DEADLINE, exclude=seen)
+    _log_seen(seen)
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(keywords))) as executor:
-        futures = [executor.submit(_fetch_keyword_news, kw, per_kw, start_dt, end_dt) for kw in keywords]
-        for future in concurrent.futures.as_completed(futures):
-            filtered, raw = future.result()
-            filtered_all.extend(filtered)
-            raw_all.extend(raw)
+    # 재배포 기사(" - 매체명" 꼬리, 미세한 문구 차이)까지 근사 중복으로 묶어 대표 1건만 남김
+    result = _select(dedupe_articles(filtered_all), lambda: dedupe_articles(raw_all), limit)
+    logger.info(f"뉴스 수집 완료: {len(result)}건")
+    return result
 
-    unique_filtered = _dedupe(filtered_all)
-    if len(unique_filtered) < 5:
-        logger.warning(f"시간 필터 결과 {len(unique_filtered)}건 → 폴백: 이미 수집된 전체 뉴스 재사용")
-        result_pool = _dedupe(raw_all)
-    else:
-        result_pool = unique_filtered
 
-    result = result_pool[:NEWS_LIMIT]
-    logger.info(f"뉴스 수집 완료: {len(result)}건")
+def fetch_news_by_category(categories: dict[str, list[str]], target_date_str: str,
+                           limit: int = NEWS_LIMIT) -> dict[str, list[dict]]:
+    """모든 카테고리 키워드의 합집합을 한 번만 수집·중복 제거한 뒤 "Keywords" 태그로 카테고리별 분배.
+    (카테고리마다 fetch_news를 따로 돌리는 것과 달리 RSS 요청·근사중복 계산이 1회)
+    OR 요청은 카테고리 안에서만 묶어, 기사는 자기 카테고리 키워드에 매칭됐을 때만 그 카테고리로 간다."""
+    window = _news_window(target_date_str)
+    seen = _seen_filter(target_date_str)
+    keywords = merge_category_keywords(categories)
+    logger.info(f"카테고리 {len(categories)}개 → 합집합 키워드 {len(keywords)}개 일괄 수집")
+    filtered_all, raw_all = collect_news(keywords, NEWS_DAYS, window, limit * len(categories),
+                                         deadline=FEED_DEADLINE, exclude=seen, groups=list(categories.values()))
+    _log_seen(seen)
+
+    by_filtered = assign_categories(dedupe_articles(filtered_all), categories)
+    raw_split: dict[str, list[dict]] = {}
+
+    def _raw(category):
+        if not raw_split:
+            raw_split.update(assign_categories(dedupe_articles(raw_all), categories))
+        return raw_split[category]
+
+    result = {
+        category: _select(by_filtered[category], lambda c=category: _raw(c), limit, label=f"[{category}] ")
+        for category in categories
+    }
+    logger.info("뉴스 수집 완료: " + ", ".join(f"{c} {len(a)}건" for c, a in result.items()))
     return result
 
 
@@ -224,12 +236,18 @@ def fetch_news(keywords: list[str], target_date_str: str) -> list[dict]:
 # 4. AI 리포트 생성
 # ════════════════════════════════════════════════════════════
 DEFAULT_MODEL = "gemini-2.0-flash"  # 매번 모델 목록을 조회하지 않고 바로 사용 (지연 시간 단축)
+FALLBACK_MODELS = ("gemini-2.5-flash", "gemini-2.0-flash-lite")  # 기본 모델이 느리거나 막혔을 때 후보
+# 설정 시 주 모델 응답이 이 시간(초, 기록이 충분하면 주 모델 p95)을 넘기면 예비 모델에도 요청
+HEDGE_AFTER = float(os.environ["GEMINI_HEDGE_AFTER"]) if os.environ.get("GEMINI_HEDGE_AFTER") else None
+MAX_TRUNCATED_RETRIES = 2   # 절단/형식 이탈 응답 재요청 횟수 (백오프 재시도 횟수와 별도)
+MAP_CONCURRENCY   = 3       # 클러스터 요약 동시 호출 수 (무료 티어 RPM 고려)
+MAP_TOKEN_BUDGET  = 2500    # 클러스터 1개 프롬프트의 뉴스 컨텍스트 토큰 예산
 
 
 def _get_best_model() -> str:
     """사용 가능한 Gemini 모델 중 최선 선택 (DEFAULT_MODEL 실패 시에만 조회)"""
     try:
-        url = f"https://generativelanguage.googleapis.com/v1beta/models?key={GEMINI_API_KEY}"
+        url = f"{GEMINI_API_BASE}/models?key={GEMINI_API_KEY}"
         res = requests.get(url, timeout=10)
         if res.status_code == 200:
             models = [
@@ -249,23 +267,15 @@ def _get_best_model() -> str:
     return DEFAULT_MODEL
 
 
-def generate_report(news_data: list[dict]) -> str:
-    """뉴스 데이터로 AI 리포트 생성 (링크 주입 없이 순수 Markdown 반환)"""
-    news_context = "\n".join(
-        f"[{i+1}] {re.sub(r'<[^>]+>', '', item['Title'])} (출처: {item['Source']})"
-        for i, item in enumerate(news_data)
-    )
-
-    prompt = f"""당신은 글로벌 반도체 소재 전략 수석 애널리스트입니다.
+# 리포트 프롬프트 공통부 (단일 프롬프트 / map-reduce 최종 병합이 함께 사용)
+REPORT_GUIDE = """당신은 글로벌 반도체 소재 전략 수석 애널리스트입니다.
 아래 뉴스만 근거로, 바쁜 임원이 핵심을 즉시 파악할 [일일 반도체 기술·소재 브리핑]을 작성하세요.
 
 [절대 금지] "오늘날 반도체 산업은" 같은 상투적 도입 문장 금지 - 바로 사실로 시작. 제목 나열/번역 금지. 뉴스에 없는 내용 추측 금지.
 [작성 원칙] 1) 두괄식: 각 섹션 첫 문장에 결론 제시 후 근거. 2) 서술형, 군더더기 없이 간결하게. 3) 모든 주장에 뉴스 번호 [1][2] 인용.
+"""
 
-[뉴스 데이터]
-{news_context}
-
-[보고서 구조 - Markdown]
+REPORT_STRUCTURE = """[보고서 구조 - Markdown]
 ## 📌 핵심 요약 (Executive Brief)
 가장 중요한 판단 3~4개를 각 1문장, 결론부터. 인용 번호 포함.
 
@@ -279,83 +289,213 @@ def generate_report(news_data: list[dict]) -> str:
 시사점과 향후 관전 포인트를 결론부터 서술.
 """
 
+REPORT_CONFIG = {
+    "temperature": 0.4,
+    "maxOutputTokens": 2048,  # 무료 Gemini API 토큰 한도에 맞춘 보수적인 출력 예산
+    # gemini-2.5 계열은 기본적으로 "thinking" 토큰이 maxOutputTokens를 잠식해
+    # 실제 응답이 조기 절단될 수 있으므로 명시적으로 비활성화
+    "thinkingConfig": {"thinkingBudget": 0},
+}
+
+
+MAP_CONFIG = {**REPORT_CONFIG, "maxOutputTokens": 1024}   # 클러스터 요약은 불릿 몇 개 분량
+
+
+def _valid_report(text: str) -> bool:
+    return len(text) >= 300 and "##" in text
+
+
+def _generate(prompt: str, generation_config: dict = REPORT_CONFIG,
+              validate=_valid_report, what: str = "리포트") -> str:
+    """Gemini 호출 공통 경로: 응답 캐시 → 모델 라우터(+hedge) → 공용 재시도 정책.
+    validate(text)가 False인 응답은 절단으로 보고 재요청한다."""
     headers = {"Content-Type": "application/json"}
     body    = {
         "contents": [{"parts": [{"text": prompt}]}],
         "safetySettings": [{"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"}],
-        "generationConfig": {
-            "temperature": 0.4,
-            "maxOutputTokens": 2048,  # 무료 Gemini API 토큰 한도에 맞춘 보수적인 출력 예산
-            # gemini-2.5 계열은 기본적으로 "thinking" 토큰이 maxOutputTokens를 잠식해
-            # 실제 응답이 조기 절단될 수 있으므로 명시적으로 비활성화
-            "thinkingConfig": {"thinkingBudget": 0},
-        },
+        "generationConfig": generation_config,
     }
 
-    def _call(model: str):
-        url = (
-            f"https://generativelanguage.googleapis.com/v1beta/models/"
-            f"{model}:generateContent?key={GEMINI_API_KEY}"
-        )
-        return requests.post(url, headers=headers, json=body, timeout=120)
-
-    model = DEFAULT_MODEL
-    retry_wait = 2
-    for attempt in range(4):
-        try:
-            resp = _call(model)
-            if resp.status_code == 200:
-                candidates = resp.json().get("candidates", [])
-                if candidates:
-                    text = candidates[0]["content"]["parts"][0]["text"]
-                    if len(text) < 300 or "##" not in text:
-                        # 응답이 비정상적으로 짧거나(조기 절단) 구조가 없으면 폐기하고 재시도
-                        logger.warning(f"리포트가 비정상적으로 짧음 ({len(text)} chars) → 재시도")
-                        continue
-                    logger.info(f"리포트 생성 완료 ({len(text)} chars)")
-                    return text
-                logger.warning("candidates 없음 → 재시도")
-            elif resp.status_code == 404 and model == DEFAULT_MODEL:
-                # 기본 모델 사용 불가 → 사용 가능한 모델로 교체 후 재시도
-                model = _get_best_model()
-                logger.warning(f"기본 모델 사용 불가 → {model}(으)로 전환")
-                continue
-            elif resp.status_code == 429:
-                logger.warning(f"Rate limit → {retry_wait}s 대기 후 재시도 (attempt {attempt+1})")
-                time.sleep(retry_wait)
-                retry_wait *= 2
-                continue
-            else:
-                logger.error(f"API 오류: {resp.status_code} {resp.text[:200]}")
+    retry_hints: dict[str, float | None] = {}   # 모델별 마지막 Retry-After
+
+    def _call(model: str) -> tuple[str, str | None]:
+        url = f"{GEMINI_API_BASE}/models/{model}:generateContent?key={GEMINI_API_KEY}"
+        resp = requests.post(url, headers=headers, json=body, timeout=GEMINI_RETRY.timeout(120))
+        if resp.status_code != 200:
+            logger.warning(f"API 오류 [{model}]: {resp.status_code} {resp.text[:200]}")
+            retry_hints[model] = parse_retry_after(resp.headers)
+            return classify_status(resp.status_code), None
+        candidates = resp.json().get("candidates", [])
+        if not candidates:
+            logger.warning(f"candidates 없음 [{model}]")
+            return "error", None
+        text = candidates[0]["content"]["parts"][0]["text"]
+        if not validate(text):
+            # 응답이 비정상적으로 짧거나(조기 절단) 구조가 없으면 폐기하고 재시도
+            logger.warning(f"{what} 응답이 비정상적으로 짧음 [{model}] ({len(text)} chars) → 재시도")
+            return "truncated", None
+        return "ok", text
+
+    # 같은 (모델, 프롬프트, 생성 설정)이면 캐시된 응답 재사용 → 재실행 시 API 호출 없음 (CACHE_BYPASS면 새로 생성)
+    cache = get_gemini_cache()
+    router = get_model_router()
+    candidates = router.candidates([DEFAULT_MODEL, *FALLBACK_MODELS])
+    for model in candidates:
+        cached = cache.get(model, prompt, generation_config, bypass=CACHE_BYPASS)
+        if cached:
+            return cached
+
+    started = time.monotonic()
+    failures = 0         # 백오프 대상 실패(429/5xx/네트워크) 횟수 → GEMINI_RETRY.max_attempts까지
+    truncations = 0      # 절단 응답은 대기 없이 즉시 재요청하고 실패 횟수와 따로 셈
+    discovered = False
+    while True:
+        # 모델별 기록(지연 p50, 429/5xx/절단 비율)으로 예상 완료 시간이 짧은 모델부터
+        order = router.order(candidates)
+        primary = order[0]
+        backup = order[1] if len(order) > 1 else None
+        hedge_after = router.hedge_delay(primary, HEDGE_AFTER) if HEDGE_AFTER else None
+        result = router.run(_call, primary, backup, hedge_after)
+        if result.outcome == "ok":
+            logger.info(f"{what} 생성 완료 [{result.model}] ({len(result.text)} chars, {result.latency:.1f}s)")
+            cache.put(result.model, prompt, generation_config, result.text)
+            return result.text
+        if result.outcome == "truncated":
+            truncations += 1
+            if truncations > MAX_TRUNCATED_RETRIES:
                 break
-        except Exception as e:
-            logger.error(f"리포트 생성 예외: {e}")
+            continue
+        if result.outcome == "404":
+            # 404 모델은 라우터가 후보에서 제외(record) → 남은 후보로 계속.
+            # 처음 404가 나면 사용 가능한 모델 목록을 한 번만 조회해 후보에 추가
+            if not discovered:
+                discovered = True
+                best = _get_best_model()
+                if best not in candidates:
+                    logger.warning(f"{result.model} 사용 불가 → 후보에 {best} 추가")
+                    candidates.append(best)
+            if not router.available(candidates):
+                break  # 모든 후보가 404
+            continue
+        if result.outcome == "4xx":
+            break  # 요청 자체의 문제 (키 오류, 잘못된 요청) → 재시도해도 같은 결과
+        # 429 / 5xx / 네트워크 오류: 다른 정상 후보가 있으면 바로 넘어가고, 없으면 백오프
+        next_primary = router.order(candidates)[0]
+        delay = 0.0
+        if next_primary == result.model or router.throttled(next_primary):
+            delay = GEMINI_RETRY.backoff(failures, retry_hints.pop(result.model, None))
+        if not GEMINI_RETRY.should_retry(failures, delay, started):
             break
+        failures += 1
+        if delay:
+            logger.warning(f"{result.model} {result.outcome} → {delay:.1f}s 대기 후 재시도 "
+                           f"({failures}/{GEMINI_RETRY.max_attempts - 1})")
+            time.sleep(delay)
+
+    raise RuntimeError(f"AI {what} 생성 실패 (모든 재시도 소진)")
+
 
-    raise RuntimeError("AI 리포트 생성 실패 (모든 재시도 소진)")
+def _focus(category: str) -> str:
+    """DAILY_REPORT 외 카테고리는 프롬프트에 관점 한 줄 추가 (Daily Report 프롬프트는 그대로)"""
+    return "" if category == DAILY_REPORT else f"[주제 초점] 이번 브리핑은 '{category}' 관점의 뉴스에 집중하세요.\n"
+
+
+def generate_report(news_data: list[dict], bodies: dict[str, str] | None = None,
+                    category: str = DAILY_REPORT) -> str:
+    """뉴스 데이터로 AI 리포트 생성 (링크 주입 없이 순수 Markdown 반환).
+    news_data/bodies는 pack_news_context로 예산에 맞춰 고른 결과 (번호 = 목록 순서)."""
+    news_context = format_news_context(news_data, bodies, source_label="출처")
+    prompt = f"""{REPORT_GUIDE}{_focus(category)}
+[뉴스 데이터]
+{news_context}
+
+{REPORT_STRUCTURE}"""
+    return _generate(prompt)
+
+
+def _valid_summary(text: str) -> bool:
+    return len(text) >= 80 and "[" in text
+
+
+def generate_report_mapreduce(news_data: list[dict], bodies: dict[str, str] | None = None,
+                              category: str = DAILY_REPORT, now: float | None = None) -> tuple[str, list[dict]]:
+    """클러스터별 요약(map, 동시 MAP_CONCURRENCY건) → 최종 리포트(reduce).
+    now: 최신성 가중치 기준 시각 (pack_news_context). 반환: (리포트 Markdown, 인용 번호 순서의 전체 기사 목록)"""
+    clusters = cluster_articles(news_data)
+    articles: list[dict] = []
+    jobs = []
+    for cluster in clusters:
+        packed = pack_news_context(cluster.articles, bodies, budget=MAP_TOKEN_BUDGET, now=now)
+        offset = len(articles)
+        articles.extend(packed.articles)
+        mapping = {i + 1: offset + i + 1 for i in range(len(packed.articles))}
+        jobs.append((cluster.label, build_map_prompt(cluster.label, packed.text), mapping))
+    logger.info(f"map-reduce: 기사 {len(articles)}건 → 클러스터 {len(jobs)}개 "
+                f"({', '.join(f'{label} {len(m)}' for label, _, m in jobs)})")
+
+    def _map(job):
+        label, prompt, mapping = job
+        try:
+            summary = _generate(prompt, MAP_CONFIG, _valid_summary, what=f"[{category}] '{label}' 요약")
+        except Exception as e:
+            logger.warning(f"'{label}' 클러스터 요약 실패 → 최종 병합에서 제외: {e}")
+            return label, None
+        return label, remap_citations(summary, mapping)
+
+    with ThreadPoolExecutor(max_workers=MAP_CONCURRENCY) as executor:
+        summaries = [(label, text) for label, text in executor.map(_map, jobs) if text]
+    if not summaries:
+        raise RuntimeError("AI 리포트 생성 실패 (모든 클러스터 요약 실패)")
+
+    sections = "\n\n".join(f"### {label}\n{text.strip()}" for label, text in summaries)
+    prompt = f"""{REPORT_GUIDE}{_focus(category)}
+[주제별 요약] 각 요약의 [번호]는 전체 뉴스 목록 번호입니다. 인용할 때 번호를 그대로 쓰고 새 번호를 만들지 마세요.
+{sections}
+
+{REPORT_STRUCTURE}"""
+    report = _generate(prompt, what=f"[{category}] 최종 리포트")
+    return sanitize_citations(report, len(articles)), articles
+
+
+def _write_report(category: str, articles: list[dict],
+                  bodies: dict[str, str] | None, now: float) -> tuple[str, list[dict]]:
+    """카테고리 1개 리포트 → (Markdown, 인용 번호 순서의 기사 목록).
+    now: 최신성 가중치 기준 시각 = 뉴스 수집 범위의 끝 (실행 시각과 무관하게 같은 입력이면 같은 프롬프트
+    → 재실행·재시도도 Gemini 응답 캐시에 적중)"""
+    if REPORT_MODE == "mapreduce":
+        # 클러스터별 요약 → 최종 병합 (인용 번호 = 반환된 전체 기사 목록 순서)
+        return generate_report_mapreduce(articles, bodies, category, now)
+    # 입력 토큰 예산 안에서 최신성·키워드 커버리지 순으로 기사 선별 (인용 번호 = 선별 순서)
+    packed = pack_news_context(articles, bodies, now=now)
+    return generate_report(packed.articles, packed.bodies, category), packed.articles
 
 
 # ════════════════════════════════════════════════════════════
 # 5. 히스토리 저장
 # ════════════════════════════════════════════════════════════
-def save_report(date_str: str, report_text: str, articles: list[dict]):
-    history = _read_json_from_github(HISTORY_FILE, [])
-
-    # 같은 날짜 항목 제거 후 맨 앞에 추가
-    history = [h for h in history if h.get("date") != date_str]
-    history.insert(0, {
+def save_report(date_str: str, report_text: str, articles: list[dict],
+                categories: dict[str, dict] | None = None):
+    """categories: {카테고리: {"report", "articles"}} - Daily Report 외 카테고리 리포트 (같은 날짜 항목에 저장)"""
+    entry = {
         "date":           date_str,
         "report":         report_text,
         "articles":       articles,
         "auto_generated": True,
         "generated_at":   datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC"),
-    })
-
-    # 오래된 항목 정리
-    history = history[:MAX_HISTORY]
+    }
+    if categories:
+        entry["categories"] = categories
 
-    _write_json_to_github(HISTORY_FILE, history)
-    logger.info(f"히스토리 저장 완료 (총 {len(history)}건)")
+    # 날짜 파일 1개 + manifest를 커밋 1개로 (첫 저장 때 기존 daily_history.json 이전도 같은 커밋)
+    batch = Batch()
+    try:
+        stage_entry(_read_history_file, batch, entry, MAX_HISTORY)
+        committed = _store().commit(batch, f"[Auto] Update history {date_str} - "
+                                           f"{datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
+    except Exception as e:
+        logger.error(f"히스토리 저장 실패 [{date_str}]: {e}")
+        return
+    logger.info(f"히스토리 저장 완료 (총 {len(committed[MANIFEST_FILE])}건)")
 
 
 # ════════════════════════════════════════════════════════════
@@ -367,9 +507,11 @@ def main():
     logger.info("=" * 60)
 
     _require_env()
+    # 이후 모든 외부 호출(재시도·대기 포함)은 이 마감 안에서만 시도
+    set_run_deadline(RUN_DEADLINE)
 
     # 실행 시각 기준 KST 날짜 (06:00 이후이면 당일, 이전이면 전날)
-    now_kst = datetime.now(timezone.utc) + timedelta(hours=9)
+    now_kst = datetime.fromtimestamp(_run_time(), timezone.utc) + timedelta(hours=9)
     if now_kst.hour < 6:
         target_date = (now_kst - timedelta(days=1)).date()
     else:
@@ -379,25 +521,56 @@ def main():
     logger.info(f"대상 날짜: {target_date_str}")
 
     # 이미 오늘 리포트가 있으면 스킵 (중복 실행 방지)
-    history = _read_json_from_github(HISTORY_FILE, [])
-    if any(h.get("date") == target_date_str for h in history):
+    manifest = load_manifest(_read_json_from_github)
+    if any(h.get("date") == target_date_str for h in manifest):
         logger.info(f"{target_date_str} 리포트 이미 존재 → 스킵")
         return
 
-    # 키워드 로드
-    keywords = load_keywords()
+    # 키워드 로드 (카테고리별)
+    categories = load_keyword_categories() if REPORT_CATEGORIES else {DAILY_REPORT: load_keywords()}
+    limit = MAPREDUCE_NEWS_LIMIT if REPORT_MODE == "mapreduce" else NEWS_LIMIT
 
-    # 뉴스 수집
-    articles = fetch_news(keywords, target_date_str)
-    if not articles:
+    # 뉴스 수집: 카테고리가 여럿이면 키워드 합집합을 한 번만 수집해 나눔
+    if len(categories) > 1:
+        news_by_category = fetch_news_by_category(categories, target_date_str, limit)
+    else:
+        news_by_category = {DAILY_REPORT: fetch_news(categories[DAILY_REPORT], target_date_str, limit)}
+    if not news_by_category[DAILY_REPORT]:
         logger.error("수집된 뉴스 없음 → 종료")
         sys.exit(1)
 
-    # AI 리포트 생성
-    report_text = generate_report(articles)
-
-    # 저장
-    save_report(target_date_str, report_text, articles)
+    # 링크 변환 / 본문 추출은 디스크 캐시를 공유하므로 카테고리 순서대로 (겹치는 기사는 재요청 없음)
+    prepared = {}
+    for category, articles in news_by_category.items():
+        if not articles:
+            logger.warning(f"[{category}] 수집된 뉴스 없음 → 건너뜀")
+            continue
+        # Google News 리다이렉트 링크 → 원문 URL (같은 원문 기사는 합침)
+        articles = resolve_article_links(articles)
+        # (선택) 기사 본문 발췌 추출
+        bodies = extract_bodies(articles) if EXTRACT_BODIES else None
+        prepared[category] = (articles, bodies)
+
+    # AI 리포트 생성: 카테고리별 Gemini 호출을 동시에. map-reduce는 카테고리마다 이미 MAP_CONCURRENCY건씩
+    # 동시에 부르므로 카테고리는 하나씩 (무료 티어 동시 호출 수 제한)
+    pack_time = kst_to_epoch(_window_end(target_date_str))
+    workers = 1 if REPORT_MODE == "mapreduce" else CATEGORY_CONCURRENCY
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {category: executor.submit(_write_report, category, *args, pack_time)
+                   for category, args in prepared.items()}
+    results = {}
+    for category, future in futures.items():
+        try:
+            results[category] = future.result()
+        except Exception as e:
+            if category == DAILY_REPORT:
+                raise
+            logger.warning(f"[{category}] 리포트 생성 실패 → 건너뜀: {e}")
+
+    # 저장 (Daily Report는 기존 최상위 필드, 나머지는 같은 날짜 항목의 categories 아래)
+    report_text, articles = results.pop(DAILY_REPORT)
+    save_report(target_date_str, report_text, articles,
+                {category: {"report": text, "articles": arts} for category, (text, arts) in results.items()})
 
     logger.info("✅ Daily Report 생성 완료!")
 
@@ -0,0 +1,167 @@
+"""
+github_store.py
+───────────────
+GitHub 저장소 읽기/쓰기 계층 (app.py / generate_report.py 공용).
+
+- Github 클라이언트와 repo 핸들을 인스턴스에 보관해 재사용 (호출마다 get_repo 하지 않음)
+- 쓰기는 Batch에 모아 Git Data API로 커밋 1개: ref → commit → tree 생성 → commit 생성 → ref 갱신
+  (파일 삭제도 같은 tree에 sha=None 항목으로)
+  (Contents API처럼 파일마다 get_contents + update_file 왕복·커밋이 생기지 않음)
+- ref 갱신은 force=False로 보내 SHA 기반 compare-and-swap. 그 사이 다른 작성자(Actions ↔ 앱)가
+  커밋했으면 GitHub가 fast-forward가 아니라며 거절(422) → 새 head에서 update 함수를 다시 적용해 재시도
+- 개별 API 호출의 일시 오류(429/5xx/2차 rate limit)는 GITHUB_RETRY가 재시도
+"""
+
+import base64
+import json
+import logging
+import threading
+from typing import Callable
+
+from github import Github, GithubException, InputGitTreeElement
+
+from endpoints import GITHUB_API_BASE
+from history_codec import ENVELOPE_KEY, decode_document
+from retry_policy import GITHUB_RETRY
+
+logger = logging.getLogger(__name__)
+
+CAS_ATTEMPTS = 4      # ref 갱신 충돌 시 최대 시도 횟수
+JSON_INDENT  = 2
+
+
+class Batch:
+    """한 커밋으로 묶을 파일 변경들.
+    put: 내용을 그대로 덮어씀 / update: fn(현재 내용 또는 None) → 새 내용 (충돌 재시도 때 최신 내용으로 다시 호출)
+    delete: 파일 삭제 (이미 없으면 무시)"""
+
+    def __init__(self):
+        self.puts: dict[str, object] = {}
+        self.updates: dict[str, Callable[[object], object]] = {}
+        self.deletes: set[str] = set()
+
+    def put(self, path: str, data) -> None:
+        self.updates.pop(path, None)
+        self.deletes.discard(path)
+        self.puts[path] = data
+
+    def update(self, path: str, fn: Callable[[object], object]) -> None:
+        self.puts.pop(path, None)
+        self.deletes.discard(path)
+        self.updates[path] = fn
+
+    def delete(self, path: str) -> None:
+        self.puts.pop(path, None)
+        self.updates.pop(path, None)
+        self.deletes.add(path)
+
+    def __bool__(self) -> bool:
+        return bool(self.puts or self.updates or self.deletes)
+
+
+def _is_conflict(exc: BaseException) -> bool:
+    """ref 갱신 CAS 실패 (fast-forward 아님 / ref 변경 경합)"""
+    return isinstance(exc, GithubException) and exc.status in (409, 422)
+
+
+def dump_json(data) -> str:
+    if isinstance(data, dict) and ENVELOPE_KEY in data:   # 압축 형식은 공백 없이
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+    return json.dumps(data, ensure_ascii=False, indent=JSON_INDENT, default=str)
+
+
+class GitHubStore:
+    def __init__(self, token: str, repo_name: str, base_url: str = GITHUB_API_BASE, branch: str | None = None):
+        self.token = token
+        self.repo_name = repo_name
+        self.base_url = base_url
+        self._branch = branch
+        self._repo = None
+        self._lock = threading.Lock()
+
+    @property
+    def repo(self):
+        with self._lock:
+            if self._repo is None:
+                client = Github(self.token, base_url=self.base_url)
+                self._repo = GITHUB_RETRY.call(lambda: client.get_repo(self.repo_name), "GitHub 저장소 조회")
+            return self._repo
+
+    @property
+    def branch(self) -> str:
+        return self._branch or self.repo.default_branch
+
+    # ── 읽기 ────────────────────────────────────────────────
+    def read_bytes(self, path: str, ref: str | None = None) -> bytes:
+        """파일 원문. 없으면 GithubException(404)."""
+        repo = self.repo
+        what = f"GitHub 읽기 [{path}]"
+        kwargs = {"ref": ref} if ref else {}
+        contents = GITHUB_RETRY.call(lambda: repo.get_contents(path, **kwargs), what)
+        if contents.encoding == "none":
+            # Contents API는 1MB 초과 파일에 inline content를 주지 않음(encoding="none").
+            # 이 경우 decoded_content가 예외를 던지므로 Git Blob API로 원본을 다시 조회한다.
+            blob = GITHUB_RETRY.call(lambda: repo.get_git_blob(contents.sha), what)
+            return base64.b64decode(blob.content)
+        return contents.decoded_content
+
+    def exists(self, path: str, ref: str | None = None) -> bool:
+        repo = self.repo
+        kwargs = {"ref": ref} if ref else {}
+        try:
+            GITHUB_RETRY.call(lambda: repo.get_contents(path, **kwargs), f"GitHub 조회 [{path}]")
+        except GithubException as e:
+            if e.status == 404:
+                return False
+            raise
+        return True
+
+    def read_json(self, path: str, default, strict: bool = False, ref: str | None = None):
+        """JSON 파일 → 객체 (history_codec 압축 형식은 자동 복원). 없으면 default. strict=False면 읽기 실패도 default (경고 로그),
+        strict=True면 파일 없음(404) 외 오류는 그대로 올림"""
+        try:
+            return decode_document(json.loads(self.read_bytes(path, ref).decode("utf-8")))
+        except Exception as e:
+            if getattr(e, "status", None) == 404:
+                return default
+            if strict:
+                raise
+            logger.warning(f"GitHub 읽기 실패 [{path}]: {e}")
+            return default
+
+    # ── 쓰기 ────────────────────────────────────────────────
+    def commit(self, batch: Batch, message: str) -> dict[str, object]:
+        """batch를 커밋 1개로 반영. 반환: 경로 → 실제로 커밋된 내용 (update는 충돌 해소 후 값)"""
+        if not batch:
+            return {}
+        repo = self.repo
+        ref_name = f"heads/{self.branch}"
+        for attempt in range(CAS_ATTEMPTS):
+            ref = GITHUB_RETRY.call(lambda: repo.get_git_ref(ref_name), "GitHub ref 조회")
+            head_sha = ref.object.sha
+            head = GITHUB_RETRY.call(lambda: repo.get_git_commit(head_sha), "GitHub commit 조회")
+
+            contents = dict(batch.puts)
+            for path, fn in batch.updates.items():
+                contents[path] = fn(self.read_json(path, None, strict=True, ref=head_sha))
+
+            elements = [InputGitTreeElement(path, "100644", "blob", content=dump_json(data))
+                        for path, data in contents.items()]
+            # 삭제는 sha=None 항목. 없는 경로를 지우면 tree 생성이 실패하므로 head에 있는 것만
+            deleted = [path for path in sorted(batch.deletes) if self.exists(path, head_sha)]
+            elements += [InputGitTreeElement(path, "100644", "blob", sha=None) for path in deleted]
+            tree = GITHUB_RETRY.call(lambda: repo.create_git_tree(elements, head.tree), "GitHub tree 생성")
+            new_commit = GITHUB_RETRY.call(lambda: repo.create_git_commit(message, tree, [head]),
+                                           "GitHub commit 생성")
+            try:
+                GITHUB_RETRY.call(lambda: ref.edit(new_commit.sha, force=False), "GitHub ref 갱신")
+            except GithubException as e:
+                if not _is_conflict(e) or attempt + 1 >= CAS_ATTEMPTS:
+                    raise
+                logger.warning(f"GitHub 동시 커밋 충돌 ({head_sha[:7]} 이후 변경) → 최신 head에서 재시도 "
+                               f"{attempt + 1}/{CAS_ATTEMPTS - 1}")
+                continue
+            logger.info(f"GitHub 커밋 {new_commit.sha[:7]}: {message} ({len(contents)}개 파일"
+                        + (f", 삭제 {len(deleted)}개)" if deleted else ")"))
+            return contents
+        raise AssertionError("unreachable")
@@ -0,0 +1,126 @@
+"""
+history_codec.py
+────────────────
+히스토리 날짜 파일(history/YYYY-MM-DD.json)의 압축 저장 형식. 읽기 쪽은 형식을 몰라도 되도록
+decode_document()가 봉투(envelope)를 알아보고 원래 JSON 객체로 되돌린다 (무손실 왕복).
+
+- "json"     : 그대로 (기존 형식, 사람이 읽기 쉬움)
+- "columnar" : 기사 목록을 열 단위 표로. Daily Report와 카테고리 리포트의 기사를 표 1개에 모아
+               같은 기사는 한 번만 저장하고, 각 목록은 행 번호만 가짐 (키 이름 반복 제거)
+- "gzip"     : columnar → 최소 공백 JSON → gzip → base64 (Git Data API tree에 텍스트로 넣기 위해)
+
+사용할 형식은 HISTORY_CODEC 환경변수 (기본 json - 저장소에서 diff·열람 가능, 용량을 줄이려면 gzip 선택).
+형식과 무관하게 모든 읽기 경로(GitHubStore.read_json, app.py 로컬 파일)가 decode_document를 거친다.
+"""
+
+import base64
+import gzip
+import json
+import os
+
+HISTORY_CODEC = os.environ.get("HISTORY_CODEC", "") or "json"
+CODECS        = ("json", "columnar", "gzip")
+ENVELOPE_KEY  = "__codec__"
+GZIP_LEVEL    = 9
+
+
+def _collect_lists(entry: dict) -> list[tuple[tuple, list]]:
+    """entry 안의 기사 목록 위치 → [(경로, 목록)] (최상위 articles + categories.*.articles)"""
+    found = []
+    if isinstance(entry.get("articles"), list):
+        found.append((("articles",), entry["articles"]))
+    for name, section in (entry.get("categories") or {}).items():
+        if isinstance(section, dict) and isinstance(section.get("articles"), list):
+            found.append((("categories", name, "articles"), section["articles"]))
+    return found
+
+
+def _to_columnar(entry: dict) -> dict:
+    lists = _collect_lists(entry)
+    if not all(isinstance(item, dict) for _, items in lists for item in items):
+        return entry   # 예상 밖 구조는 그대로 (무손실이 우선)
+
+    columns: list[str] = []
+    index: dict[str, int] = {}
+    rows: list[list] = []
+    missing: dict[str, list[int]] = {}
+    row_of: dict[str, int] = {}
+    refs = []
+    for path, items in lists:
+        ids = []
+        for item in items:
+            for key in item:
+                if key not in index:
+                    index[key] = len(columns)
+                    columns.append(key)
+            signature = json.dumps(item, ensure_ascii=False, sort_keys=True, default=str)
+            if signature not in row_of:
+                row_of[signature] = len(rows)
+                rows.append([item.get(key) for key in columns])
+                absent = [index[key] for key in columns if key not in item]
+                if absent:
+                    missing[str(row_of[signature])] = absent
+            ids.append(row_of[signature])
+        refs.append([list(path), ids])
+
+    # 뒤늦게 추가된 열은 앞선 행에서 "없음"으로 채움
+    for r, row in enumerate(rows):
+        if len(row) < len(columns):
+            missing.setdefault(str(r), []).extend(range(len(row), len(columns)))
+            row.extend([None] * (len(columns) - len(row)))
+
+    body = json.loads(json.dumps(entry, default=str))   # 사본 (원본 entry는 호출 측 상태이므로 건드리지 않음)
+    for path, _ in lists:
+        _set(body, path, None)
+    return {ENVELOPE_KEY: "columnar", "entry": body, "columns": columns, "rows": rows,
+            "missing": missing, "refs": refs}
+
+
+def _from_columnar(doc: dict) -> dict:
+    columns, rows, missing = doc["columns"], doc["rows"], doc.get("missing", {})
+    articles = []
+    for r, row in enumerate(rows):
+        absent = set(missing.get(str(r), ()))
+        articles.append({key: value for c, (key, value) in enumerate(zip(columns, row)) if c not in absent})
+    entry = doc["entry"]
+    for path, ids in doc["refs"]:
+        _set(entry, tuple(path), [dict(articles[i]) for i in ids])
+    return entry
+
+
+def _set(obj: dict, path: tuple, value) -> None:
+    for key in path[:-1]:
+        obj = obj[key]
+    obj[path[-1]] = value
+
+
+def encode_entry(entry: dict, codec: str = HISTORY_CODEC):
+    """날짜 1건 → 저장할 JSON 객체"""
+    if codec not in CODECS:
+        raise ValueError(f"알 수 없는 히스토리 형식: {codec}")
+    if codec == "json":
+        return entry
+    columnar = _to_columnar(entry)
+    if codec == "columnar":
+        return columnar
+    return compress_document(columnar)
+
+
+def compress_document(doc):
+    """임의의 JSON 객체 → gzip 봉투 (검색 색인처럼 날짜 항목이 아닌 큰 파일용)"""
+    raw = json.dumps(doc, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    return {ENVELOPE_KEY: "gzip",
+            "data": base64.b64encode(gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)).decode("ascii")}
+
+
+def decode_document(doc):
+    """저장된 JSON 객체 → 원래 객체 (봉투가 아니면 그대로)"""
+    while isinstance(doc, dict) and ENVELOPE_KEY in doc:
+        codec = doc[ENVELOPE_KEY]
+        if codec == "gzip":
+            doc = json.loads(gzip.decompress(base64.b64decode(doc["data"])).decode("utf-8"))
+        elif codec == "columnar":
+            doc = _from_columnar(doc)
+        else:
+            raise ValueError(f"알 수 없는 히스토리 형식: {codec}")
+    return doc
@@ -0,0 +1,213 @@
+"""
+history_store.py
+────────────────
+리포트 히스토리의 날짜별 분할 저장 레이아웃 (app.py / generate_report.py 공용).
+
+- history/YYYY-MM-DD.json    : 날짜 1건의 전체 항목 (report, articles, categories ...), history_codec 형식
+- history/index.json         : 최신순 manifest (날짜, 생성 정보, 기사 수, 카테고리 이름, 요약 한 줄)
+- history/search_index.json  : 아카이브 전문 검색 역색인 (search_index.py, gzip 봉투)
+- history/seen_articles.json : 최근 SEEN_DAYS일 동안 인용한 기사 키 (seen_index.py, fetch_news가 대조)
+- history/trends.json        : 키워드/출처/카테고리/시간대별 일별 기사 수 (trend_rollup.py, gzip 봉투)
+- 저장은 해당 날짜 파일 1개 + manifest·파생 파일만 다시 씀 (커밋 1개). 날짜 파일은 Contents API 1MB
+  제한과 무관하고, 파생 파일은 하루치만 증분 반영 (전체 항목을 다시 읽는 것은 파일이 없을 때 1회).
+  manifest에서 MAX_HISTORY일 밖으로 밀려난 날짜 파일은 같은 커밋에서 삭제
+- 기존 단일 파일(daily_history.json)만 있으면 읽기는 그 파일로 대신하고, 첫 저장 때 날짜별 파일 +
+  manifest로 옮긴다 (기존 파일은 그대로 두고 더 이상 갱신하지도 읽지도 않음)
+
+읽기는 호출 측이 read(path, default) 함수로, 쓰기는 github_store.Batch로 넘긴다.
+"""
+
+import logging
+import re
+from datetime import date, timedelta
+from typing import Callable
+
+from history_codec import compress_document, encode_entry
+from search_index import SearchIndex
+from seen_index import SEEN_DAYS, SeenIndex, entry_articles
+from trend_rollup import TrendRollup
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DIR         = "history"
+MANIFEST_FILE       = f"{HISTORY_DIR}/index.json"
+SEARCH_INDEX_FILE   = f"{HISTORY_DIR}/search_index.json"
+SEEN_INDEX_FILE     = f"{HISTORY_DIR}/seen_articles.json"
+TRENDS_FILE         = f"{HISTORY_DIR}/trends.json"
+LEGACY_HISTORY_FILE = "daily_history.json"
+MAX_HISTORY         = 365   # manifest 보관 일수 (날짜별 파일 + 압축 형식이라 단일 파일 시절의 30일 제한이 없음)
+HEADLINE_CHARS      = 120
+
+Reader = Callable[[str, object], object]
+EntryLoader = Callable[[str], "dict | None"]
+
+
+def shard_path(date_str: str) -> str:
+    return f"{HISTORY_DIR}/{date_str}.json"
+
+
+def _headline(report: str) -> str:
+    """리포트 첫 본문 줄 (Markdown 기호·인용 번호 제거) → archive 목록 미리보기"""
+    for line in (report or "").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        line = re.sub(r"<[^>]+>", "", line)   # inject_links_to_report가 넣은 인용 링크
+        line = re.sub(r"\[\d+\]|\[([^\]]+)\]\([^)]*\)", r"\1", line)
+        line = re.sub(r"^[-*>\d.\s]+|[*_`]", "", line)
+        line = re.sub(r"\s+([.,])", r"\1", line).strip()
+        if line:
+            return line[:HEADLINE_CHARS]
+    return ""
+
+
+def manifest_row(entry: dict) -> dict:
+    return {
+        "date":           entry["date"],
+        "auto_generated": bool(entry.get("auto_generated")),
+        "generated_at":   entry.get("generated_at", ""),
+        "articles":       len(entry.get("articles") or []),
+        "categories":     list((entry.get("categories") or {}).keys()),
+        "headline":       _headline(entry.get("report", "")),
+    }
+
+
+def upsert_manifest(manifest: list[dict], entry: dict, limit: int = MAX_HISTORY) -> list[dict]:
+    """같은 날짜 행을 바꾸고 최신순 정렬 후 limit건만 유지"""
+    rows = [row for row in manifest if row.get("date") != entry["date"]]
+    rows.append(manifest_row(entry))
+    rows.sort(key=lambda row: row["date"], reverse=True)
+    return rows[:limit]
+
+
+def _legacy_entries(read: Reader) -> list[dict]:
+    return [h for h in read(LEGACY_HISTORY_FILE, []) if isinstance(h, dict) and h.get("date")]
+
+
+def load_manifest(read: Reader) -> list[dict]:
+    """manifest (없으면 기존 단일 파일에서 만든 임시 manifest)"""
+    manifest = read(MANIFEST_FILE, None)
+    if isinstance(manifest, list):
+        return manifest
+    return [manifest_row(entry) for entry in _legacy_entries(read)]
+
+
+def load_legacy(read: Reader) -> list[dict]:
+    """아직 옮기지 않은 기존 단일 파일의 항목. manifest가 있으면(이전 완료) 파일을 읽지 않고 빈 목록.
+    호출 측이 한 번 읽어 두고 load_entry에 넘긴다 (날짜마다 큰 파일을 다시 읽지 않도록)"""
+    if isinstance(read(MANIFEST_FILE, None), list):
+        return []
+    return _legacy_entries(read)
+
+
+def load_entry(read: Reader, date_str: str, legacy: list[dict] | None = None) -> dict | None:
+    """날짜 1건의 전체 항목. 날짜 파일이 없으면 legacy(load_legacy 결과)에서 찾음"""
+    entry = read(shard_path(date_str), None)
+    if isinstance(entry, dict):
+        return entry
+    return next((h for h in legacy or () if h.get("date") == date_str), None)
+
+
+def migrate_legacy_history(legacy: list[dict], batch, limit: int = MAX_HISTORY, skip: str | None = None) -> list[dict]:
+    """기존 단일 파일의 항목(_legacy_entries)을 날짜별 파일로 batch에 추가. 옮길 항목의 manifest 반환.
+    skip: 곧 새 내용으로 저장할 날짜 (이전 대상에서 제외)"""
+    manifest: list[dict] = []
+    for entry in legacy[:limit]:
+        if entry["date"] != skip:
+            batch.put(shard_path(entry["date"]), encode_entry(entry))
+            manifest = upsert_manifest(manifest, entry, limit)
+    if legacy:
+        logger.info(f"히스토리 이전: {LEGACY_HISTORY_FILE} {len(legacy)}건 → {HISTORY_DIR}/")
+    return manifest
+
+
+def stage_entry(read: Reader, batch, entry: dict, limit: int = MAX_HISTORY) -> None:
+    """날짜 파일 + manifest + 파생 파일(검색 색인, 인용 기사 색인, 트렌드 집계) 갱신을 batch(github_store.Batch)에
+    추가 → 호출 측이 커밋 1개로 반영. manifest·파생 파일은 update로 넣어 동시 커밋 충돌 시 최신 내용에 다시 합쳐진다.
+    manifest가 아직 없으면 기존 daily_history.json 항목도 같은 커밋으로 이전.
+    manifest 보관 기간(limit) 밖으로 밀려나는 날짜의 파일은 batch.delete로 같은 커밋에서 지움."""
+    base = read(MANIFEST_FILE, None)
+    legacy: dict[str, dict] = {}
+    if not isinstance(base, list):
+        entries = _legacy_entries(read)
+        legacy = {h["date"]: h for h in entries}
+        base = migrate_legacy_history(entries, batch, limit, skip=entry["date"])
+    others = [row["date"] for row in base if row.get("date") and row["date"] != entry["date"]]
+    loaded: dict[str, dict | None] = {}
+
+    def _load(date_str):   # 파생 파일을 처음 만들 때 여러 개가 같은 날짜를 읽어도 한 번만 요청
+        if date_str not in loaded:
+            # 이전 중이면 날짜 파일은 아직 커밋 전 → 이미 읽은 기존 파일 항목 사용
+            loaded[date_str] = legacy[date_str] if date_str in legacy else load_entry(read, date_str)
+        return loaded[date_str]
+
+    def _merge(current):
+        return upsert_manifest(current if isinstance(current, list) else base, entry, limit)
+
+    def _reindex(current):
+        index = SearchIndex.from_json(current)
+        if index is None:   # 색인이 없거나 형식이 바뀜 → 보관 중인 날짜 전체로 다시 만듦 (최초 1회)
+            index = build_search_index(_load, others)
+        index.add(entry)
+        index.prune(limit)
+        return compress_document(index.to_json())
+
+    def _mark_seen(current):
+        seen = SeenIndex.from_json(current)
+        if seen is None:    # 색인이 없음 → 최근 SEEN_DAYS일 항목으로 시작
+            seen = build_seen_index(_load, others, entry["date"])
+        seen.add(entry["date"], entry_articles(entry))
+        seen.expire(entry["date"])
+        return seen.to_json()
+
+    def _rollup(current):
+        rollup = TrendRollup.from_json(current)
+        if rollup is None:
+            rollup = build_trend_rollup(_load, others)
+        rollup.add(entry)
+        rollup.prune(limit)
+        return compress_document(rollup.to_json())
+
+    batch.put(shard_path(entry["date"]), encode_entry(entry))   # HISTORY_CODEC 형식 (읽기는 형식 무관)
+    kept = {row["date"] for row in upsert_manifest(base, entry, limit)}
+    for date_str in others:
+        if date_str not in kept:
+            batch.delete(shard_path(date_str))
+    batch.update(MANIFEST_FILE, _merge)
+    batch.update(SEARCH_INDEX_FILE, _reindex)
+    batch.update(SEEN_INDEX_FILE, _mark_seen)
+    batch.update(TRENDS_FILE, _rollup)
+
+
+def build_seen_index(load: EntryLoader, dates: list[str], today: str) -> SeenIndex:
+    """today 이전 SEEN_DAYS일 안의 날짜 항목으로 인용 기사 색인 생성"""
+    seen = SeenIndex()
+    cutoff = (date.fromisoformat(today) - timedelta(days=SEEN_DAYS)).isoformat()
+    for date_str in dates:
+        if cutoff <= date_str < today:
+            entry = load(date_str)
+            if entry:
+                seen.add(date_str, entry_articles(entry))
+    return seen
+
+
+def build_search_index(load: EntryLoader, dates: list[str]) -> SearchIndex:
+    """날짜 목록의 항목을 모두 읽어 검색 색인 생성"""
+    index = SearchIndex()
+    for date_str in dates:
+        entry = load(date_str)
+        if entry:
+            index.add(entry)
+    if dates:
+        logger.info(f"검색 색인 생성: {len(index)}/{len(dates)}일")
+    return index
+
+
+def build_trend_rollup(load: EntryLoader, dates: list[str]) -> TrendRollup:
+    """날짜 목록의 항목을 모두 읽어 트렌드 집계 생성"""
+    rollup = TrendRollup()
+    for date_str in dates:
+        entry = load(date_str)
+        if entry:
+            rollup.add(entry)
+    return rollup
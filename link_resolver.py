@@ -0,0 +1,210 @@
+"""
+link_resolver.py
+────────────────
+news.google.com/rss/articles/... 리다이렉트 링크 → 언론사 원문(canonical) URL 일괄 변환.
+Google News 주소는 endpoints.GOOGLE_NEWS_BASE 기준 (mock_services 대역 서버로도 같은 경로를 탐).
+
+- 구형 기사 ID는 base64 안에 원문 URL이 그대로 들어 있어 네트워크 없이 복원
+- 신형 ID(AU_yqL...)는 기사 페이지의 서명값(data-n-a-sg/ts)으로 batchexecute API를 호출해 복원
+- 동시 요청 수 + 초당 요청 수를 제한하고, 단계 전체에 마감 시간을 둠 (실패 시 원래 링크 유지)
+- 결과는 .cache/links.json에 영구 보관 → 같은 링크는 날짜가 바뀌어도 한 번만 변환
+- 변환 후 같은 원문 URL을 가리키는 기사는 news_dedupe.merge_by_link로 합침
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from endpoints import GOOGLE_NEWS_BASE
+from news_dedupe import merge_by_link
+from news_fetcher import get_session, run_coro
+
+logger = logging.getLogger(__name__)
+
+LINK_CACHE_FILE   = os.environ.get("LINK_CACHE_FILE", os.path.join(".cache", "links.json"))
+LINK_CACHE_DAYS   = 90       # 이보다 오래된 매핑은 저장 시 정리
+FAILED_RETRY_SEC  = 24 * 3600
+RESOLVE_CONCURRENCY = 6
+RESOLVE_RATE        = 5.0    # 초당 최대 요청 수 (Google 측 차단 방지)
+RESOLVE_TIMEOUT     = 6.0    # 링크 1건당
+RESOLVE_DEADLINE    = 30.0   # 단계 전체
+
+_GOOGLE_HOST    = urlparse(GOOGLE_NEWS_BASE).netloc
+_GOOGLE_ARTICLE = re.compile(rf"^https?://{re.escape(GOOGLE_NEWS_BASE.split('://', 1)[-1])}/(?:rss/)?articles/([^?/#]+)")
+_BATCH_URL      = f"{GOOGLE_NEWS_BASE}/_/DotsSplashUi/data/batchexecute"
+_TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|ocid|cmpid)$", re.I)
+
+_cache_lock = threading.Lock()
+
+
+def canonicalize(url: str) -> str:
+    """추적용 쿼리(utm_* 등)와 fragment 제거"""
+    parsed = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+             if not _TRACKING_PARAMS.match(k)]
+    return urlunparse(parsed._replace(query=urlencode(query), fragment=""))
+
+
+def is_google_link(url: str) -> bool:
+    """Google News(GOOGLE_NEWS_BASE) 호스트의 링크인지 (아직 원문으로 바뀌지 않은 링크)"""
+    return urlparse(url or "").netloc == _GOOGLE_HOST
+
+
+def google_article_id(link: str) -> str | None:
+    """Google News 기사 링크 → 기사 ID (쿼리 제외). Google 링크가 아니면 None"""
+    match = _GOOGLE_ARTICLE.match(link or "")
+    return match.group(1) if match else None
+
+
+def _decode_offline(article_id: str) -> str | None:
+    try:
+        raw = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except (ValueError, TypeError):
+        return None
+    match = re.search(rb"https?://[\x21-\x7e]+", raw)
+    if not match:
+        return None
+    url = match.group().decode("ascii")
+    return None if is_google_link(url) else url
+
+
+def _decode_online(article_id: str) -> str | None:
+    session = get_session()
+    page = session.get(f"{GOOGLE_NEWS_BASE}/rss/articles/{article_id}", timeout=RESOLVE_TIMEOUT)
+    page.raise_for_status()
+    if not is_google_link(page.url):
+        return page.url  # HTTP 리다이렉트로 바로 원문에 도달한 경우
+    sg = re.search(r'data-n-a-sg="([^"]+)"', page.text)
+    ts = re.search(r'data-n-a-ts="([^"]+)"', page.text)
+    if not (sg and ts):
+        return None
+    inner = (
+        '["garturlreq",[["X","X",["X","X"],null,null,1,1,"US:en",null,1,null,null,null,null,null,0,1],'
+        f'"X","X",1,[1,1,1],1,1,null,0,0,null,0],"{article_id}",{ts.group(1)},"{sg.group(1)}"]'
+    )
+    res = session.post(
+        _BATCH_URL,
+        data={"f.req": json.dumps([[["Fbv4je", inner, None, "generic"]]])},
+        headers={"Content-Type": "application/x-www-form-urlencoded;charset=UTF-8"},
+        timeout=RESOLVE_TIMEOUT,
+    )
+    res.raise_for_status()
+    payload = json.loads(res.text.split("\n\n", 1)[1])[:-2]
+    return json.loads(payload[0][2])[1]
+
+
+def resolve_one(link: str) -> str | None:
+    """Google News 링크 1건 → 원문 URL (Google 링크가 아니면 그대로, 실패 시 None)"""
+    match = _GOOGLE_ARTICLE.match(link or "")
+    if not match:
+        return link or None
+    article_id = match.group(1)
+    url = _decode_offline(article_id) or _decode_online(article_id)
+    return canonicalize(url) if url else None
+
+
+# ── 영구 캐시 ───────────────────────────────────────────────
+def load_link_cache(path: str = LINK_CACHE_FILE) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_link_cache(cache: dict, path: str = LINK_CACHE_FILE) -> None:
+    cutoff = time.time() - LINK_CACHE_DAYS * 86400
+    pruned = {k: v for k, v in cache.items() if v.get("at", 0) >= cutoff}
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with _cache_lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(pruned, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"링크 캐시 저장 실패: {e}")
+
+
+class _RateLimiter:
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def resolve_links_async(links: list[str], cache: dict, concurrency: int = RESOLVE_CONCURRENCY,
+                              rate: float = RESOLVE_RATE, deadline: float = RESOLVE_DEADLINE) -> dict[str, str]:
+    """{원래 링크: 원문 URL} (변환 성공분만). cache는 제자리에서 갱신된다."""
+    now = time.time()
+    resolved: dict[str, str] = {}
+    todo = []
+    for link in dict.fromkeys(links):
+        hit = cache.get(link)
+        if hit and hit.get("url"):
+            resolved[link] = hit["url"]
+        elif hit and now - hit.get("at", 0) < FAILED_RETRY_SEC:
+            continue  # 최근 실패한 링크는 재시도하지 않음
+        elif _GOOGLE_ARTICLE.match(link or ""):
+            todo.append(link)
+    if not todo:
+        return resolved
+
+    sem = asyncio.Semaphore(concurrency)
+    limiter = _RateLimiter(rate)
+
+    async def _resolve(link):
+        async with sem:
+            await limiter.wait()
+            try:
+                url = await asyncio.wait_for(asyncio.to_thread(resolve_one, link), timeout=RESOLVE_TIMEOUT * 2)
+            except Exception as e:
+                logger.debug(f"링크 변환 실패: {link} ({e})")
+                url = None
+        cache[link] = {"url": url, "at": time.time()}
+        if url:
+            resolved[link] = url
+
+    tasks = [asyncio.ensure_future(_resolve(link)) for link in todo]
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logger.warning(f"링크 변환 마감 시간 초과 → {len(pending)}건은 Google 링크 유지")
+    return resolved
+
+
+def resolve_article_links(articles: list[dict], cache_path: str = LINK_CACHE_FILE) -> list[dict]:
+    """fetch_news 결과의 Link를 원문 URL로 교체하고, 같은 원문을 가리키는 기사는 하나로 합친 새 목록을 반환.
+    Alternates 링크는 추가 요청 없이 캐시에 있는 것만 교체한다."""
+    links = [a.get("Link", "") for a in articles]
+    cache = load_link_cache(cache_path)
+    resolved = run_coro(resolve_links_async(links, cache))
+    save_link_cache(cache, cache_path)
+
+    def _lookup(link):
+        hit = resolved.get(link) or (cache.get(link) or {}).get("url")
+        return hit or link
+
+    result = []
+    for article in articles:
+        item = dict(article, Link=_lookup(article.get("Link", "")))
+        if "Alternates" in item:
+            item["Alternates"] = [dict(alt, Link=_lookup(alt.get("Link", ""))) for alt in item["Alternates"]]
+        result.append(item)
+    logger.info(f"원문 링크 변환: {sum(1 for l in links if l in resolved)}/{len(links)}건")
+    return merge_by_link(result)
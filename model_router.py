@@ -0,0 +1,196 @@
+"""
+model_router.py
+───────────────
+Gemini 모델 선택기: 모델별 호출 기록을 .cache/model_stats.json에 남기고,
+예상 완료 시간이 짧은 모델부터 시도하도록 후보 순서를 정한다.
+
+- 기록: 모델별 최근 STATS_WINDOW건의 (시각, 결과, 지연 시간)
+  결과 = ok / 429 / 5xx / 404 / 4xx(그 밖의 요청 오류) / truncated / error(네트워크 등)
+- 예상 완료 시간 = 성공 응답 p50 지연 ÷ 성공 확률 (기록이 없으면 사전값)
+  최근 429를 받은 모델은 잠시 뒤로, 404(사용 불가) 모델은 하루 동안 제외
+- run(): 주 모델 응답이 hedge_after초 안에 오지 않으면 예비 모델에 같은 요청을 보내고
+  먼저 도착한 정상 응답을 사용 (늦게 끝난 쪽도 기록에는 반영)
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+MODEL_STATS_FILE  = os.environ.get("MODEL_STATS_FILE", os.path.join(".cache", "model_stats.json"))
+STATS_WINDOW      = 50          # 모델별 보관 기록 수
+PRIOR_LATENCY     = 20.0        # 기록이 없는 모델의 예상 지연(초)
+PRIOR_SUCCESSES   = 2           # 성공 확률 추정 시 가상 성공 횟수 (기록 몇 건으로 과민 반응하지 않도록)
+THROTTLE_COOLDOWN = 60.0        # 마지막 429 이후 이 시간 동안은 후순위
+UNAVAILABLE_TTL   = 24 * 3600   # 404 모델 제외 기간
+MIN_HEDGE_SAMPLES = 5           # p95를 hedge 기준으로 쓰기 위한 최소 성공 기록 수
+
+OUTCOMES = ("ok", "429", "5xx", "404", "4xx", "truncated", "error")
+
+
+class Attempt(NamedTuple):
+    model: str
+    outcome: str          # OUTCOMES 중 하나
+    text: str | None      # outcome == "ok"일 때 응답 텍스트
+    latency: float
+
+
+def classify_status(status_code: int) -> str:
+    """HTTP 상태 코드 → 기록용 결과 분류 (200은 호출 측이 ok/truncated로 판정)"""
+    if status_code == 429:
+        return "429"
+    if status_code == 404:
+        return "404"
+    if status_code >= 500:
+        return "5xx"
+    return "4xx"
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    idx = min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[idx]
+
+
+class ModelRouter:
+    def __init__(self, path: str = MODEL_STATS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._stats: dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self._stats = {}
+
+    # ── 기록 ────────────────────────────────────────────────
+    def record(self, model: str, outcome: str, latency: float) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(model, {"events": []})
+            entry["events"] = (entry["events"] + [[round(time.time(), 1), outcome, round(latency, 2)]])[-STATS_WINDOW:]
+            if outcome == "404":
+                entry["unavailable_at"] = time.time()
+            elif outcome == "ok":
+                entry.pop("unavailable_at", None)
+        self.save()
+
+    def save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{threading.get_ident()}.tmp"
+            with self._lock:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self._stats, f, separators=(",", ":"))
+                os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"모델 통계 저장 실패: {e}")
+
+    # ── 통계 ────────────────────────────────────────────────
+    def summary(self, model: str) -> dict:
+        """p50/p95 지연(성공 응답 기준)과 결과별 비율"""
+        events = self._stats.get(model, {}).get("events", [])
+        n = len(events)
+        ok_lat = [lat for _, outcome, lat in events if outcome == "ok"]
+        counts = {o: sum(1 for _, outcome, _ in events if outcome == o) for o in OUTCOMES}
+        return {
+            "n": n,
+            "p50": _percentile(ok_lat, 0.5) if ok_lat else None,
+            "p95": _percentile(ok_lat, 0.95) if ok_lat else None,
+            **{f"rate_{o}": (counts[o] / n if n else 0.0) for o in OUTCOMES},
+        }
+
+    def expected_time(self, model: str) -> float:
+        events = self._stats.get(model, {}).get("events", [])
+        ok_lat = [lat for _, outcome, lat in events if outcome == "ok"]
+        latency = _percentile(ok_lat, 0.5) if ok_lat else PRIOR_LATENCY
+        success = (len(ok_lat) + PRIOR_SUCCESSES) / (len(events) + PRIOR_SUCCESSES)
+        return latency / max(success, 0.05)
+
+    def _available(self, model: str, now: float) -> bool:
+        return now - self._stats.get(model, {}).get("unavailable_at", 0) >= UNAVAILABLE_TTL
+
+    def throttled(self, model: str, now: float | None = None) -> bool:
+        """마지막 호출이 THROTTLE_COOLDOWN 안에 받은 429인지"""
+        now = time.time() if now is None else now
+        events = self._stats.get(model, {}).get("events", [])
+        return bool(events) and events[-1][1] == "429" and now - events[-1][0] < THROTTLE_COOLDOWN
+
+    def candidates(self, base: list[str]) -> list[str]:
+        """기본 후보 + 실행 중 발견돼(_get_best_model 등) 성공 기록이 남은 모델 (기본 후보 먼저, 중복 제거).
+        응답 캐시 조회와 호출 후보에 같은 목록을 써서 발견된 모델의 캐시도 다음 실행에서 재사용한다."""
+        with self._lock:
+            known = [m for m, entry in self._stats.items() if any(e[1] == "ok" for e in entry.get("events", []))]
+        return list(dict.fromkeys([*base, *known]))
+
+    def available(self, candidates: list[str]) -> list[str]:
+        """404로 제외되지 않은 후보 (입력 순서, 중복 제거)"""
+        now = time.time()
+        return [m for m in dict.fromkeys(candidates) if self._available(m, now)]
+
+    def order(self, candidates: list[str]) -> list[str]:
+        """예상 완료 시간 순 (동률이면 입력 순서). 404로 제외된 모델은 전부 제외될 때만 남김."""
+        now = time.time()
+        candidates = list(dict.fromkeys(candidates))
+        available = self.available(candidates) or candidates
+        ranked = sorted(
+            enumerate(available),
+            key=lambda im: (self.throttled(im[1], now), self.expected_time(im[1]), im[0]),
+        )
+        return [m for _, m in ranked]
+
+    def hedge_delay(self, model: str, default: float) -> float:
+        """예비 요청을 보낼 시점: 성공 기록이 충분하면 주 모델의 p95, 아니면 default"""
+        summary = self.summary(model)
+        ok_count = round(summary["n"] * summary["rate_ok"])
+        return summary["p95"] if ok_count >= MIN_HEDGE_SAMPLES else default
+
+    # ── 호출 ────────────────────────────────────────────────
+    def _timed(self, fn: Callable[[str], tuple[str, str | None]], model: str) -> Attempt:
+        started = time.monotonic()
+        try:
+            outcome, text = fn(model)
+        except Exception as e:
+            logger.warning(f"모델 호출 예외 [{model}]: {e}")
+            outcome, text = "error", None
+        attempt = Attempt(model, outcome, text, time.monotonic() - started)
+        self.record(model, attempt.outcome, attempt.latency)
+        return attempt
+
+    def run(self, fn: Callable[[str], tuple[str, str | None]], primary: str,
+            backup: str | None = None, hedge_after: float | None = None) -> Attempt:
+        """fn(model) → (결과 분류, 텍스트). hedge_after가 있으면 그 시간 뒤 backup에도 요청.
+        정상 응답이 하나라도 오면 그것을, 아니면 주 모델의 결과를 반환."""
+        if not backup or hedge_after is None:
+            return self._timed(fn, primary)
+
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gemini-hedge")
+        try:
+            first = executor.submit(self._timed, fn, primary)
+            done, _ = wait([first], timeout=hedge_after)
+            if done:
+                return first.result()  # 시간 안에 끝났으면 실패라도 그대로 (재시도는 호출 측 몫)
+            logger.info(f"{primary} 응답 지연 {hedge_after:.0f}s 초과 → {backup}에 예비 요청")
+            pending = {first, executor.submit(self._timed, fn, backup)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.result().outcome == "ok":
+                        return future.result()
+            return first.result()
+        finally:
+            executor.shutdown(wait=False)
+
+
+_default_router: ModelRouter | None = None
+
+
+def get_model_router() -> ModelRouter:
+    """프로세스 전역 기본 라우터 인스턴스"""
+    global _default_router
+    if _default_router is None:
+        _default_router = ModelRouter()
+    return _default_router
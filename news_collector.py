@@ -0,0 +1,149 @@
+"""
+news_collector.py
+─────────────────
+전체 기사 예산(NEWS_LIMIT)을 기준으로 키워드 fan-out을 조기 종료하는 수집기.
+app.py / generate_report.py의 fetch_news가 공통으로 사용한다.
+
+- 키워드 우선순위(keywords.json 순서)에 따라 키워드별 할당량을 차등 배분.
+  OR 요청 피드도 파싱하면서 기사를 제목에 매칭된 키워드별로 세어 키워드마다 자기 할당량에서 멈춤
+- 피드가 끝나는 대로 파싱하되, 결과는 항상 우선순위 순서로 이어 붙인다
+  → as_completed 순서에 따라 기사 목록(=인용 번호)이 달라지지 않음
+- 우선순위 앞쪽부터 연속으로 완료된 요청들만으로 시간필터 통과 고유 기사가 예산을 채우면
+  남은(후순위) 요청은 기다리지 않고 취소 → 같은 피드라면 결과가 항상 같다
+- 여러 카테고리(keywords.json)는 키워드 합집합을 한 번만 수집하고 "Keywords" 태그로 나눈다.
+  OR 요청은 카테고리 안에서만 묶으므로 한 요청의 결과가 여러 카테고리에 섞이지 않는다
+- exclude(seen_index.SeenFilter)에 걸린 기사는 파싱 단계에서 빠지므로 할당량·예산은 새 기사로만 채운다
+"""
+
+import logging
+import math
+from contextlib import aclosing
+from typing import Callable
+
+from news_dedupe import normalize_title
+from news_fetcher import DEFAULT_DEADLINE, build_rss_url, iter_feeds, run_coro
+from news_window import TimeWindow
+from query_planner import QueryPlan, normalize_keyword, plan_keywords, plan_queries, tag_keywords
+from rss_parser import parse_keyword_feed
+
+logger = logging.getLogger(__name__)
+
+OVERSAMPLE  = 1.5     # 시간필터/근사중복 제거로 줄어드는 몫을 감안한 전체 할당량 배수
+STOP_MARGIN = 1.25    # 고유 기사가 예산 × 이 값에 도달하면 나머지 요청 취소
+MIN_PER_KW  = 2       # 후순위 키워드도 최소 이만큼은 할당
+UNMATCHED   = ""      # OR 요청에서 제목에 키워드가 없는 기사의 할당량 버킷
+
+
+def allocate_quotas(keywords: list[str], budget: int, oversample: float = OVERSAMPLE,
+                    floor: int = MIN_PER_KW) -> dict[str, int]:
+    """키워드별 할당량: 앞 순위일수록 가중치 1 → 0.5로 완만하게 감소"""
+    n = max(len(keywords), 1)
+    weights = [1 / (1 + i / n) for i in range(len(keywords))]
+    total = budget * oversample
+    weight_sum = sum(weights) or 1
+    return {kw: max(floor, round(total * w / weight_sum)) for kw, w in zip(keywords, weights)}
+
+
+def plan_quotas(plan: QueryPlan, quotas: dict[str, int]) -> dict[str, int]:
+    """요청 1건의 키워드별 할당량 (covered 키워드도 자기 할당량). OR 요청은 제목으로 키워드를 알 수 없는
+    (본문 매칭) 기사 몫으로 UNMATCHED 버킷에 요청 내 가장 작은 할당량을 따로 둔다"""
+    norm = {normalize_keyword(kw): q for kw, q in quotas.items()}
+    per_term = {kw: norm.get(normalize_keyword(kw), MIN_PER_KW) for kw in plan.terms}
+    if len(plan.terms) > 1:
+        per_term[UNMATCHED] = min(per_term.values())
+    for kw in plan.covered:
+        per_term[kw] = norm.get(normalize_keyword(kw), MIN_PER_KW)
+    return per_term
+
+
+def _parse(plan: QueryPlan, content: bytes | None, quota: dict[str, int], window: TimeWindow | None,
+           strip_text: bool, exclude: Callable[[dict], bool] | None = None) -> tuple[list[dict], list[dict]]:
+    def buckets(entry: dict) -> list[str]:
+        return plan_keywords(entry["Title"], plan) or [UNMATCHED]
+
+    try:
+        filtered, raw = parse_keyword_feed(content, quota, window, strip_text=strip_text, exclude=exclude,
+                                           buckets=buckets)
+    except Exception as e:
+        logger.warning(f"뉴스 파싱 오류 [q={plan.query}]: {e}")
+        return [], []
+    tag_keywords(filtered + raw, plan)
+    return filtered, raw
+
+
+async def collect_news_async(keywords: list[str], days: int, window: TimeWindow | None, budget: int,
+                             deadline: float = DEFAULT_DEADLINE, strip_text: bool = True,
+                             exclude: Callable[[dict], bool] | None = None,
+                             groups: list[list[str]] | None = None) -> tuple[list[dict], list[dict]]:
+    """(시간필터 통과 기사, 원본 기사)를 키워드 우선순위 순서로 반환 (중복 제거 전).
+    groups: 카테고리별 키워드 목록 (plan_queries - 같은 카테고리 키워드끼리만 OR 쿼리로 묶음)"""
+    plans = plan_queries(keywords, days, groups=groups)
+    quotas = allocate_quotas(keywords, budget)
+    plan_quota = [plan_quotas(plan, quotas) for plan in plans]
+    urls = [build_rss_url(plan.query, days) for plan in plans]
+    plans_by_url: dict[str, list[int]] = {}
+    for i, url in enumerate(urls):
+        plans_by_url.setdefault(url, []).append(i)
+    logger.info(f"RSS 요청 계획: 키워드 {len(keywords)}개 → 요청 {len(plans)}건")
+
+    target = math.ceil(budget * STOP_MARGIN)
+    results: list[tuple[list[dict], list[dict]] | None] = [None] * len(plans)
+    seen: set[str] = set()
+    prefix = 0
+
+    async with aclosing(iter_feeds(urls, deadline=deadline)) as feeds:
+        async for url, body in feeds:
+            for i in plans_by_url[url]:
+                results[i] = _parse(plans[i], body, plan_quota[i], window, strip_text, exclude)
+            # 우선순위 앞쪽부터 연속으로 끝난 요청까지만 예산 계산에 반영하고,
+            # 예산을 채운 최소 접두 구간에서 멈춤 → 완료 순서와 무관하게 같은 결과
+            while prefix < len(plans) and results[prefix] is not None and len(seen) < target:
+                for entry in results[prefix][0]:
+                    seen.add(normalize_title(entry["Title"], entry["Source"]))
+                prefix += 1
+            if len(seen) >= target:
+                if prefix < len(plans):
+                    logger.info(f"기사 예산 충족 ({len(seen)}/{target}) → 후순위 요청 {len(plans) - prefix}건 제외")
+                break
+
+    filtered_all: list[dict] = []
+    raw_all: list[dict] = []
+    for done in results[:prefix]:
+        filtered_all.extend(done[0])
+        raw_all.extend(done[1])
+    return filtered_all, raw_all
+
+
+def collect_news(keywords: list[str], days: int, window: TimeWindow | None, budget: int,
+                 deadline: float = DEFAULT_DEADLINE, strip_text: bool = True,
+                 exclude: Callable[[dict], bool] | None = None,
+                 groups: list[list[str]] | None = None) -> tuple[list[dict], list[dict]]:
+    """collect_news_async의 동기 래퍼 (fetch_news에서 호출)"""
+    return run_coro(collect_news_async(keywords, days, window, budget, deadline=deadline,
+                                       strip_text=strip_text, exclude=exclude, groups=groups))
+
+
+def merge_category_keywords(categories: dict[str, list[str]]) -> list[str]:
+    """카테고리별 키워드 → 한 번에 수집할 키워드 목록 (할당량·요청 순서의 우선순위).
+    카테고리를 번갈아 가며 이어 붙여 어느 카테고리도 상위 키워드가 뒤로 밀리지 않게 한다.
+    OR 쿼리 묶음은 collect_news(groups=카테고리별 목록)가 카테고리 안에서만 만든다."""
+    merged: dict[str, str] = {}
+    lists = list(categories.values())
+    for i in range(max((len(kws) for kws in lists), default=0)):
+        for kws in lists:
+            if i < len(kws):
+                merged.setdefault(normalize_keyword(kws[i]), kws[i])
+    return list(merged.values())
+
+
+def assign_categories(articles: list[dict], categories: dict[str, list[str]]) -> dict[str, list[dict]]:
+    """기사의 "Keywords" 태그(실제로 매칭된 키워드)로 카테고리 귀속 (한 기사가 여러 카테고리에 들어갈 수 있음,
+    순서 유지). 태그가 없는 기사(OR 요청에서 본문으로만 걸린 기사)는 어느 카테고리에도 넣지 않는다."""
+    norm = {cat: {normalize_keyword(kw) for kw in kws} for cat, kws in categories.items()}
+    result: dict[str, list[dict]] = {cat: [] for cat in categories}
+    for item in articles:
+        tags = {normalize_keyword(kw) for kw in item.get("Keywords") or ()}
+        for cat, kws in norm.items():
+            if tags & kws:
+                result[cat].append(item)
+    return result
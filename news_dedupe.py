@@ -0,0 +1,172 @@
+"""
+news_dedupe.py
+──────────────
+Google News 기사 근사 중복(여러 매체가 같은 기사를 재배포한 경우) 묶기.
+
+- 제목 정규화: " - 매체명" 꼬리, [단독]/(종합) 같은 태그, 문장부호·공백 제거 (문자 종류 무관 - 한자·가나 제목 유지).
+  정규화 결과가 비면 원문 제목(공백 정리)으로 비교
+- 문자 3-gram 집합 → One-Permutation MinHash 서명 (항목당 n-gram 수에 비례, 순열 반복 없음)
+- LSH 밴드 버킷으로 후보 쌍만 뽑고 실제 Jaccard 유사도로 확인 → 유니온 파인드로 클러스터링.
+  제목의 숫자 토큰이 다르면 유사도와 무관하게 합치지 않음 ("2분기 실적" vs "3분기 실적")
+- 각 클러스터의 첫 기사(입력 순서)를 대표로 남기고 나머지는 Alternates(출처, 링크)로 접어 둔다
+- 원문 URL 변환 후에는 merge_by_link로 같은 URL 기사를 한 번 더 합친다
+"""
+
+import re
+import zlib
+
+SHINGLE_SIZE   = 3
+NUM_BINS       = 32      # MinHash 서명 길이 (2의 거듭제곱)
+BAND_ROWS      = 2       # 밴드당 bin 수 → 16개 밴드, Jaccard 0.5 쌍의 후보 검출률 ≈ 99%
+DUP_THRESHOLD  = 0.5     # 이 값 이상이면 같은 기사로 간주
+
+_BIN_BITS  = NUM_BINS.bit_length() - 1
+_BIN_MASK  = NUM_BINS - 1
+_EMPTY     = 1 << 32
+
+_SOURCE_TAIL = re.compile(r"\s+[-–—|]\s+[^-–—|]{1,30}$")
+_TAGS        = re.compile(r"[\[\(【<][^\]\)】>]{1,10}[\]\)】>]")
+_NON_WORD    = re.compile(r"[\W_]+")
+_NUMBER      = re.compile(r"\d+")
+
+
+def _strip_title(title: str, source: str) -> str:
+    """HTML 태그, " - 매체명" 꼬리, [단독] 같은 태그 제거"""
+    text = re.sub(r"<[^>]+>", "", title or "")
+    if source and text.endswith(source):
+        text = text[: -len(source)].rstrip(" -–—|")
+    else:
+        text = _SOURCE_TAIL.sub("", text)
+    return _TAGS.sub(" ", text)
+
+
+def normalize_title(title: str, source: str = "") -> str:
+    return _NON_WORD.sub("", _strip_title(title, source).lower())
+
+
+def title_numbers(title: str, source: str = "") -> frozenset[str]:
+    """제목의 숫자 토큰 ("2분기 영업익 10조" → {"2", "10"})"""
+    return frozenset(_NUMBER.findall(_strip_title(title, source)))
+
+
+def shingles(text: str, n: int = SHINGLE_SIZE) -> set[str]:
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def minhash_signature(grams: set[str]) -> tuple[int, ...]:
+    """One-Permutation Hashing: 해시 1회로 bin별 최솟값을 구하고 빈 bin은 회전 방식으로 채운다"""
+    bins = [_EMPTY] * NUM_BINS
+    for gram in grams:
+        h = zlib.crc32(gram.encode("utf-8"))
+        b, v = h & _BIN_MASK, h >> _BIN_BITS
+        if v < bins[b]:
+            bins[b] = v
+    if _EMPTY in bins and len(bins) != bins.count(_EMPTY):
+        original = bins[:]
+        for i in range(NUM_BINS):
+            if original[i] != _EMPTY:
+                continue
+            j, dist = (i + 1) & _BIN_MASK, 1
+            while original[j] == _EMPTY:
+                j = (j + 1) & _BIN_MASK
+                dist += 1
+            bins[i] = original[j] + dist * _EMPTY  # 빌려온 값이 원래 값과 충돌하지 않도록 오프셋
+    return tuple(bins)
+
+
+def cluster_titles(grams_list: list[set[str]], threshold: float = DUP_THRESHOLD,
+                   numbers: list[frozenset[str]] | None = None) -> list[int]:
+    """각 항목이 속한 클러스터 대표의 인덱스 목록 (대표 = 클러스터 내 가장 앞선 항목).
+    numbers가 있으면 숫자 토큰이 같은 항목끼리만 합친다."""
+    parent = list(range(len(grams_list)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    buckets: dict[tuple, list[int]] = {}
+    for idx, grams in enumerate(grams_list):
+        if not grams:
+            continue
+        sig = minhash_signature(grams)
+        checked = set()
+        for band in range(0, NUM_BINS, BAND_ROWS):
+            key = (band,) + sig[band:band + BAND_ROWS]
+            members = buckets.setdefault(key, [])
+            for other in members:
+                if other in checked:
+                    continue
+                checked.add(other)
+                ra, rb = find(idx), find(other)
+                if ra == rb or (numbers is not None and numbers[idx] != numbers[other]):
+                    continue
+                inter = len(grams & grams_list[other])
+                if inter / (len(grams) + len(grams_list[other]) - inter) >= threshold:
+                    parent[max(ra, rb)] = min(ra, rb)
+            members.append(idx)
+    return [find(i) for i in range(len(grams_list))]
+
+
+def dedupe_articles(items: list[dict], threshold: float = DUP_THRESHOLD) -> list[dict]:
+    """근사 중복 기사를 대표 1건으로 합친 목록 (입력 순서 유지).
+    대표 기사에는 접힌 재배포 기사의 {"Source", "Link"} 목록을 "Alternates"로 붙이고
+    "Keywords"는 클러스터 전체의 합집합으로 갱신한다."""
+    grams_list, numbers = [], []
+    for it in items:
+        title, source = it.get("Title", ""), it.get("Source", "")
+        text = normalize_title(title, source) or " ".join(title.split()).lower()
+        grams_list.append(shingles(text))
+        numbers.append(title_numbers(title, source))
+    roots = cluster_titles(grams_list, threshold, numbers)
+
+    result: list[dict] = []
+    rep_of: dict[int, dict] = {}
+    for idx, item in enumerate(items):
+        root = roots[idx]
+        rep = rep_of.get(root)
+        if rep is None:
+            rep = dict(item)
+            if "Keywords" in rep:
+                rep["Keywords"] = list(rep["Keywords"])
+            rep_of[root] = rep
+            result.append(rep)
+            continue
+        for kw in item.get("Keywords", []):
+            if kw not in rep.setdefault("Keywords", []):
+                rep["Keywords"].append(kw)
+        if item.get("Title") == rep.get("Title") and item.get("Source") == rep.get("Source"):
+            continue  # 다른 키워드로 중복 수집된 동일 기사
+        alternates = rep.setdefault("Alternates", [])
+        alt = {"Source": item.get("Source", ""), "Link": item.get("Link", "")}
+        if alt not in alternates:
+            alternates.append(alt)
+    return result
+
+
+def merge_by_link(items: list[dict]) -> list[dict]:
+    """같은 Link(원문 URL)를 가리키는 기사를 앞선 기사 하나로 합친다 (Keywords/Alternates 병합)"""
+    result: list[dict] = []
+    by_link: dict[str, dict] = {}
+    for item in items:
+        link = item.get("Link", "")
+        rep = by_link.get(link) if link else None
+        if rep is None:
+            item = dict(item)
+            for key in ("Keywords", "Alternates"):
+                if key in item:
+                    item[key] = list(item[key])
+            if link:
+                by_link[link] = item
+            result.append(item)
+            continue
+        for kw in item.get("Keywords", []):
+            if kw not in rep.setdefault("Keywords", []):
+                rep["Keywords"].append(kw)
+        for alt in [{"Source": item.get("Source", ""), "Link": link}] + item.get("Alternates", []):
+            if alt.get("Source") != rep.get("Source") and alt not in rep.setdefault("Alternates", []):
+                rep["Alternates"].append(alt)
+    return result
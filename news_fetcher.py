@@ -0,0 +1,145 @@
+"""
+news_fetcher.py
+───────────────
+Google News RSS 피드를 asyncio로 동시에 수집하는 공용 엔진.
+app.py / generate_report.py의 fetch_news가 공통 백엔드로 사용한다.
+
+- requests.Session 하나를 공유해 keep-alive 커넥션 풀을 재사용 (키워드마다 TLS 핸드셰이크 반복 방지)
+- asyncio.Semaphore로 동시 요청 수 제한, 요청별 마감 시간(deadline) 적용
+- 전체 수집 시간 ≈ 가장 느린 피드 1개 (기존: ceil(N/8) × 평균 피드 시간)
+- feed_cache의 Conditional-GET 디스크 캐시를 거쳐 재생성 시 네트워크 비용 최소화
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import AsyncIterator
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from endpoints import GOOGLE_NEWS_BASE
+from feed_cache import FeedCache, get_feed_cache
+from retry_policy import FEED_RETRY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 24     # Daily Report 키워드(22개)를 한 번에 띄울 수 있는 수준
+DEFAULT_DEADLINE    = 8.0    # 피드 1건당 최대 대기 시간 (초)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+
+def build_rss_url(kw: str, days: int) -> str:
+    """키워드 검색용 Google News RSS URL"""
+    return (
+        f"{GOOGLE_NEWS_BASE}/rss/search?"
+        f"q={quote(kw)}+when:{days}d&hl=ko&gl=KR&ceid=KR:ko"
+    )
+
+
+def get_session(pool_size: int = DEFAULT_CONCURRENCY) -> requests.Session:
+    """프로세스 전역 Session (keep-alive 커넥션 풀) - 최초 호출 시 1회 생성"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _get(url: str, deadline: float, cache: FeedCache | None, entry: dict | None) -> bytes:
+    headers = FeedCache.conditional_headers(entry)
+    started = time.monotonic()
+
+    def _request():
+        res = get_session().get(url, timeout=FEED_RETRY.timeout(deadline, started, budget=deadline),
+                                verify=False, headers=headers)
+        res.raise_for_status()
+        return res
+
+    # 일시적 오류(연결 끊김, 429, 5xx)는 피드 마감 시간 안에서만 짧게 재시도
+    res = FEED_RETRY.call(_request, what=f"피드 수집 {url}", budget=deadline)
+    if res.status_code == 304 and entry:
+        cache.refresh(url, entry)
+        return entry["body"]
+    if cache:
+        cache.store(url, res.content, res.headers)
+    return res.content
+
+
+async def _fetch_one(url, sem, executor, deadline, cache) -> bytes | None:
+    entry = cache.lookup(url) if cache else None
+    if entry and cache.is_fresh(entry):
+        return entry["body"]
+    loop = asyncio.get_running_loop()
+    async with sem:
+        try:
+            # requests 자체 timeout은 소켓 단위라 느린 스트리밍 응답을 끊지 못하므로 wait_for로 전체 마감을 건다
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, _get, url, deadline, cache, entry), timeout=deadline
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"피드 수집 시간 초과 ({deadline}s): {url}")
+        except Exception as e:
+            logger.warning(f"피드 수집 오류: {e}")
+    # 네트워크 실패 시 만료된 캐시라도 있으면 재사용
+    return entry["body"] if entry else None
+
+
+async def iter_feeds(urls: list[str], concurrency: int = DEFAULT_CONCURRENCY,
+                     deadline: float = DEFAULT_DEADLINE,
+                     use_cache: bool = True) -> AsyncIterator[tuple[str, bytes | None]]:
+    """URL 목록을 동시에 조회해 끝나는 순서대로 (url, 본문 | None)을 yield.
+    소비자가 중간에 멈추면(aclose) 남은 요청은 더 기다리지 않고 버린다."""
+    cache = get_feed_cache() if use_cache else None
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return
+    concurrency = max(1, min(concurrency, len(unique_urls)))
+    sem = asyncio.Semaphore(concurrency)
+    # 기본 executor는 CPU 수에 비례해 작게 잡히므로(Actions 러너 2코어 → 6개) 전용 풀을 사용
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=concurrency)
+
+    async def _run(url):
+        return url, await _fetch_one(url, sem, executor, deadline, cache)
+
+    tasks = [asyncio.ensure_future(_run(u)) for u in unique_urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        # 이미 시작된 요청은 자체 timeout으로 끝나도록 두고 결과만 버린다
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def fetch_feeds_async(urls: list[str], concurrency: int = DEFAULT_CONCURRENCY,
+                            deadline: float = DEFAULT_DEADLINE,
+                            use_cache: bool = True) -> dict[str, bytes | None]:
+    """URL 목록을 동시에 조회해 {url: 응답 본문 | None}을 반환 (실패한 URL은 None)"""
+    return {url: body async for url, body in iter_feeds(urls, concurrency, deadline, use_cache)}
+
+
+def run_coro(coro):
+    """이미 이벤트 루프가 돌고 있는 환경(노트북 등)에서도 코루틴을 동기 실행"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def fetch_feeds(urls: list[str], concurrency: int = DEFAULT_CONCURRENCY,
+                deadline: float = DEFAULT_DEADLINE, use_cache: bool = True) -> dict[str, bytes | None]:
+    """fetch_feeds_async의 동기 래퍼 (fetch_news에서 호출)"""
+    return run_coro(fetch_feeds_async(urls, concurrency=concurrency, deadline=deadline, use_cache=use_cache))
@@ -0,0 +1,114 @@
+"""
+news_window.py
+──────────────
+RSS pubDate 일괄 파싱 + 수집 시간 윈도우 필터.
+
+- pubDate(RFC-822)를 epoch 정수(UTC 초)로 한 번만 파싱하고 결과를 메모이즈
+  ("Sat, 22 Aug 2026 03:00:00 GMT" 형태는 strptime 없이 빠른 경로로 처리)
+- start_dt/end_dt(KST naive) 윈도우를 epoch 경계로 바꿔 정수 비교만으로 필터
+- 정렬도 같은 epoch를 재사용 → pd.to_datetime 재파싱 불필요
+"""
+
+import email.utils
+import time
+from datetime import datetime
+
+KST_OFFSET = 9 * 3600
+
+_MONTHS = {m: i for i, m in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), start=1)}
+_UTC_ZONES = {"GMT", "UTC", "UT", "Z"}
+
+
+def _days_from_civil(y: int, m: int, d: int) -> int:
+    """그레고리력 날짜 → 1970-01-01 기준 일수 (calendar.timegm보다 가벼운 정수 연산)"""
+    y -= m <= 2
+    era = (y if y >= 0 else y - 399) // 400
+    yoe = y - era * 400
+    doy = (153 * (m + (-3 if m > 2 else 9)) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def parse_pubdate(date_raw: str) -> int | None:
+    """RFC-822 pubDate → epoch(UTC 초). 해석 불가면 None."""
+    parts = date_raw.split()
+    # 빠른 경로: "Sat, 22 Aug 2026 03:00:00 GMT"
+    if len(parts) == 6 and parts[5] in _UTC_ZONES:
+        try:
+            month = _MONTHS[parts[2]]
+            hh, mm, ss = parts[4].split(":")
+            days = _days_from_civil(int(parts[3]), month, int(parts[1]))
+            return days * 86400 + int(hh) * 3600 + int(mm) * 60 + int(ss)
+        except (KeyError, ValueError):
+            pass
+    # 그 외(+0900 오프셋 등)는 표준 라이브러리 파서로 처리
+    try:
+        parsed = email.utils.parsedate_tz(date_raw)
+    except Exception:
+        return None
+    if parsed is None:
+        return None
+    return email.utils.mktime_tz(parsed)
+
+
+def kst_to_epoch(dt: datetime) -> int:
+    """KST 기준 naive datetime → epoch(UTC 초)"""
+    return _days_from_civil(dt.year, dt.month, dt.day) * 86400 \
+        + dt.hour * 3600 + dt.minute * 60 + dt.second - KST_OFFSET
+
+
+def format_kst(epoch: int | None) -> str | None:
+    """epoch → 'YYYY-MM-DD HH:MM:SS' (KST), 히스토리의 ParsedDate 형식"""
+    if epoch is None:
+        return None
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(epoch + KST_OFFSET))
+
+
+class TimeWindow:
+    """fetch_news 1회 동안 공유하는 시간 윈도우 + pubDate 파싱 메모"""
+
+    def __init__(self, start_dt: datetime, end_dt: datetime):
+        self.start_ts = kst_to_epoch(start_dt)
+        self.end_ts   = kst_to_epoch(end_dt)
+        self._epochs: dict[str, int | None] = {}
+        self._labels: dict[int, str] = {}
+
+    def parse(self, date_raws: list[str]) -> list[int | None]:
+        """pubDate 목록을 한 번에 epoch로 변환 (같은 문자열은 재파싱하지 않음)"""
+        memo = self._epochs
+        for raw in date_raws:
+            if raw not in memo:
+                memo[raw] = parse_pubdate(raw)
+        return [memo[raw] for raw in date_raws]
+
+    def mask(self, epochs: list[int | None]) -> list[bool]:
+        """윈도우 포함 여부 (파싱 실패 시 포함 - 기존 동작 유지)"""
+        lo, hi = self.start_ts, self.end_ts
+        return [e is None or lo <= e <= hi for e in epochs]
+
+    def labels(self, epochs: list[int | None]) -> list[str | None]:
+        labels = self._labels
+        out = []
+        for e in epochs:
+            if e is None:
+                out.append(None)
+                continue
+            label = labels.get(e)
+            if label is None:
+                label = labels[e] = format_kst(e)
+            out.append(label)
+        return out
+
+    def epoch_of(self, date_raw: str) -> int | None:
+        if date_raw not in self._epochs:
+            self.parse([date_raw])
+        return self._epochs[date_raw]
+
+    def sort_recent_first(self, items: list[dict]) -> list[dict]:
+        """최신순 정렬 (날짜 없는 항목은 뒤로) - 이미 파싱한 epoch를 재사용"""
+        keyed = [(self.epoch_of(item.get("Date") or ""), item) for item in items]
+        dated   = [pair for pair in keyed if pair[0] is not None]
+        undated = [item for ts, item in keyed if ts is None]
+        dated.sort(key=lambda pair: pair[0], reverse=True)
+        return [item for _, item in dated] + undated
@@ -0,0 +1,144 @@
+"""
+prompt_packer.py
+────────────────
+뉴스 컨텍스트를 입력 토큰 예산 안에 채워 넣는 프롬프트 패커.
+
+- 토큰 수는 로컬에서 근사 (한글 음절·숫자·기타 비ASCII ≈ 1토큰, 영문/공백 ≈ 4자 1토큰)
+  → Gemini countTokens 호출 없이 보수적으로(많게) 추정
+- 기사 순위: 최신성(반감기 12시간) + 키워드 커버리지(아직 다루지 않은 키워드를 새로 덮을수록 가산)
+- 순위 순서대로 예산을 채우고, 본문 발췌까지는 안 들어가면 제목만 넣는다
+- 프롬프트 안의 번호([1], [2] ...)는 패킹 순서를 따르므로 호출 측은 반환된 articles를 그대로
+  인용 링크 주입/저장에 써야 한다
+"""
+
+import logging
+import os
+import re
+import time
+from typing import NamedTuple
+
+from news_window import parse_pubdate
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", 6000))  # 뉴스 컨텍스트 입력 토큰 예산
+RECENCY_HALF_LIFE_H = 12.0
+RECENCY_WEIGHT      = 1.0
+COVERAGE_WEIGHT     = 1.0
+UNDATED_RECENCY     = 0.25     # 발행 시각을 모르는 기사의 최신성 점수
+
+_DIGIT       = re.compile(r"[0-9]")
+_ASCII_PUNCT = re.compile(r"[!-/:-@\[-`{-~]")
+_NON_ASCII   = re.compile(r"[^\x00-\x7f]")
+_TAG         = re.compile(r"<[^>]+>")
+
+
+def char_tokens(ch: str) -> float:
+    """문자 1개의 토큰 비용 (estimate_tokens와 같은 기준)"""
+    if ch.isascii():
+        if ch.isdigit():
+            return 1.0         # Gemini 토크나이저는 숫자를 한 자리씩 자름
+        return 0.5 if _ASCII_PUNCT.match(ch) else 0.25
+    return 1.0
+
+
+def estimate_tokens(text: str) -> int:
+    """로컬 토큰 수 추정 (한국어 뉴스 제목/본문 기준, 실제보다 약간 많게)"""
+    if not text:
+        return 0
+    non_ascii = len(_NON_ASCII.findall(text))
+    digits = len(_DIGIT.findall(text))
+    punct = len(_ASCII_PUNCT.findall(text))
+    rest = len(text) - non_ascii - digits - punct
+    return int(non_ascii + digits + punct * 0.5 + rest * 0.25 + 0.999)
+
+
+def format_news_line(index: int, item: dict, body: str | None = None, source_label: str = "출처") -> str:
+    """프롬프트의 기사 1건: "[번호] 제목 (출처: 매체)" + 본문 발췌 줄"""
+    line = f"[{index}] {_TAG.sub('', item['Title'])} ({source_label}: {item['Source']})"
+    if body:
+        line += f"\n    └ 본문 발췌: {body}"
+    return line
+
+
+def format_news_context(news_data: list[dict], bodies: dict[str, str] | None = None,
+                        source_label: str = "출처") -> str:
+    bodies = bodies or {}
+    return "\n".join(
+        format_news_line(i + 1, item, bodies.get(item.get("Link")), source_label)
+        for i, item in enumerate(news_data)
+    )
+
+
+class PackedContext(NamedTuple):
+    articles: list[dict]         # 프롬프트에 들어간 기사 (번호 순서)
+    bodies: dict[str, str]       # 실제로 포함된 본문 발췌만
+    text: str                    # format_news_context(articles, bodies) 결과
+    tokens: int                  # text의 추정 토큰 수
+    dropped: int                 # 예산 초과로 빠진 기사 수
+
+
+def _recency(item: dict, now: float) -> float:
+    epoch = parse_pubdate(item.get("Date") or "")
+    if epoch is None:
+        return UNDATED_RECENCY
+    age_h = max(now - epoch, 0) / 3600
+    return 0.5 ** (age_h / RECENCY_HALF_LIFE_H)
+
+
+def rank_articles(articles: list[dict], now: float | None = None) -> list[dict]:
+    """최신성 + 키워드 커버리지 순위 (탐욕적 선택: 이미 다룬 키워드는 가산이 줄어듦).
+    키워드 우선순위는 기사 목록에 처음 등장한 순서(= 수집기의 keywords.json 순서)를 따른다."""
+    now = time.time() if now is None else now
+    order: dict[str, int] = {}
+    for item in articles:
+        for kw in item.get("Keywords") or ():
+            order.setdefault(kw, len(order))
+    n = max(len(order), 1)
+    weight = {kw: 1 / (1 + i / n) for kw, i in order.items()}
+
+    recency = [_recency(item, now) for item in articles]
+    remaining = list(range(len(articles)))
+    covered: set[str] = set()
+    ranked: list[dict] = []
+    while remaining:
+        def score(i):
+            kws = articles[i].get("Keywords") or ()
+            gain = sum(weight[kw] if kw not in covered else 0.2 * weight[kw] for kw in kws)
+            return RECENCY_WEIGHT * recency[i] + COVERAGE_WEIGHT * gain
+        best = max(remaining, key=lambda i: (score(i), -i))  # 동점이면 원래 순서
+        remaining.remove(best)
+        ranked.append(articles[best])
+        covered.update(articles[best].get("Keywords") or ())
+    return ranked
+
+
+def pack_news_context(articles: list[dict], bodies: dict[str, str] | None = None,
+                      budget: int = PROMPT_TOKEN_BUDGET, source_label: str = "출처",
+                      now: float | None = None) -> PackedContext:
+    """순위가 높은 기사부터 예산이 찰 때까지 프롬프트에 넣는다"""
+    bodies = bodies or {}
+    packed: list[dict] = []
+    kept_bodies: dict[str, str] = {}
+    lines: list[str] = []
+    used = 0
+    for item in rank_articles(articles, now):
+        index = len(packed) + 1
+        body = bodies.get(item.get("Link"))
+        line = format_news_line(index, item, body, source_label)
+        cost = estimate_tokens(line) + 1  # 줄바꿈
+        if body and used + cost > budget:
+            line = format_news_line(index, item, None, source_label)  # 본문 발췌 없이 제목만
+            cost, body = estimate_tokens(line) + 1, None
+        if used + cost > budget:
+            continue  # 더 짧은 후순위 기사는 들어갈 수 있으므로 계속
+        packed.append(item)
+        lines.append(line)
+        if body:
+            kept_bodies[item["Link"]] = body
+        used += cost
+
+    result = PackedContext(packed, kept_bodies, "\n".join(lines), used, len(articles) - len(packed))
+    logger.info(f"프롬프트 패킹: {len(packed)}/{len(articles)}건 (본문 발췌 {len(kept_bodies)}건), "
+                f"약 {used:,}/{budget:,} 토큰")
+    return result
@@ -0,0 +1,124 @@
+"""
+query_planner.py
+────────────────
+키워드 목록 → Google News RSS 요청 계획.
+
+1) 정규화(공백 정리 + 대소문자 무시) 후 중복 키워드 제거. 다른 키워드의 단어를 모두 포함하는 키워드
+   ("반도체 소재 공급망" ⊃ "반도체 소재")는 짧은 쪽 검색 결과에 이미 들어 있으므로 따로 요청하지 않고
+   그 요청의 covered로 붙여 제목 매칭으로만 태그한다 (카테고리 귀속은 assign_categories 그대로)
+2) 키워드를 URL 길이 한도 안에서 OR 쿼리로 묶음 (카테고리가 여럿이면 카테고리 안에서만). 여러 단어 키워드는 따옴표 없이 괄호로만 묶어
+   단일 키워드 검색과 같은 의미(단어 AND, 구문 일치 아님)를 유지 → "(반도체 소재) OR HBM"
+수집된 기사는 제목에 포함된 단어로 원래 키워드에 다시 매핑한다 (match_keywords / tag_keywords).
+"""
+
+from typing import NamedTuple
+
+from news_fetcher import build_rss_url
+
+MAX_TERMS_PER_QUERY = 4      # OR로 묶는 최대 키워드 수 (피드 1건 최대 100건을 나눠 쓰므로 과도하게 묶지 않음)
+MAX_URL_LEN         = 1024
+
+
+class QueryPlan(NamedTuple):
+    query: str                   # RSS 검색어 (단일 키워드면 키워드 그대로 → 기존 캐시 키와 동일)
+    terms: tuple[str, ...]       # OR 쿼리에 들어간 원래 키워드
+    covered: tuple[str, ...] = ()  # 따로 요청하지 않고 이 요청 결과에서 제목으로 골라내는 키워드 (terms 중 하나의 단어를 모두 포함)
+
+
+def normalize_keyword(kw: str) -> str:
+    return " ".join(kw.split()).casefold()
+
+
+def _terms(kw: str) -> frozenset[str]:
+    return frozenset(normalize_keyword(kw).split())
+
+
+def _query_term(kw: str) -> str:
+    return f"({kw})" if " " in kw else kw
+
+
+def _or_query(group: list[str]) -> str:
+    return group[0] if len(group) == 1 else " OR ".join(_query_term(k) for k in group)
+
+
+def plan_queries(keywords: list[str], days: int, max_terms: int = MAX_TERMS_PER_QUERY,
+                 max_url_len: int = MAX_URL_LEN, groups: list[list[str]] | None = None) -> list[QueryPlan]:
+    """키워드 목록을 최소한의 RSS 요청으로 묶는다 (입력 순서 = 우선순위 유지).
+    groups(카테고리별 키워드 목록)가 있으면 같은 그룹의 키워드끼리만 OR 쿼리로 묶고, 요청은 각 요청의
+    첫 키워드 순위대로 정렬한다. 여러 그룹에 있는 키워드는 처음 나온 그룹 소속.
+    다른 키워드에 포함되는 키워드는 그 키워드(우선순위가 가장 높은 것) 요청의 covered로 옮긴다."""
+    unique: dict[str, str] = {}
+    for kw in keywords:
+        norm = normalize_keyword(kw)
+        if norm and norm not in unique:
+            unique[norm] = " ".join(kw.split())
+
+    group_of: dict[str, int] = {}
+    for g, members in enumerate(groups or []):
+        for kw in members:
+            group_of.setdefault(normalize_keyword(kw), g)
+
+    # 단어 집합이 다른 키워드의 단어 집합을 포함하면 중복 요청 → 포함되는 키워드 중 (같은 그룹 우선) 첫 키워드에 귀속
+    words = {norm: _terms(norm) for norm in unique}
+    cover: dict[str, str] = {}
+    for norm in unique:
+        subsets = [other for other in unique if words[other] < words[norm]]
+        same = [other for other in subsets if group_of.get(other, -1) == group_of.get(norm, -1)]
+        if subsets:
+            cover[norm] = (same or subsets)[0]
+    covered_by: dict[str, list[str]] = {}
+    for norm, by in cover.items():
+        while by in cover:
+            by = cover[by]
+        covered_by.setdefault(unique[by], []).append(unique[norm])
+    unique = {norm: kw for norm, kw in unique.items() if norm not in cover}
+
+    grouped: dict[int, list[str]] = {}
+    for norm, kw in unique.items():
+        grouped.setdefault(group_of.get(norm, -1), []).append(kw)
+
+    rank = {kw: i for i, kw in enumerate(unique.values())}
+    plans = [plan for members in grouped.values() for plan in _pack(members, days, max_terms, max_url_len)]
+    plans = [plan._replace(covered=tuple(kw for term in plan.terms for kw in covered_by.get(term, ())))
+             for plan in plans]
+    return sorted(plans, key=lambda plan: rank[plan.terms[0]])
+
+
+def _pack(keywords: list[str], days: int, max_terms: int, max_url_len: int) -> list[QueryPlan]:
+    """순서대로 URL 길이·키워드 수 한도 안에서 OR 쿼리로 묶음"""
+    plans: list[QueryPlan] = []
+    group: list[str] = []
+    for kw in keywords:
+        candidate = group + [kw]
+        if group and (len(candidate) > max_terms
+                      or len(build_rss_url(_or_query(candidate), days)) > max_url_len):
+            plans.append(QueryPlan(_or_query(group), tuple(group)))
+            group = [kw]
+        else:
+            group = candidate
+    if group:
+        plans.append(QueryPlan(_or_query(group), tuple(group)))
+    return plans
+
+
+def match_keywords(title: str, keywords: tuple[str, ...] | list[str]) -> list[str]:
+    """제목에 단어가 모두 들어 있는 키워드 목록"""
+    text = title.casefold()
+    return [kw for kw in keywords if all(t in text for t in _terms(kw))]
+
+
+def plan_keywords(title: str, plan: QueryPlan) -> list[str]:
+    """기사가 실제로 해당하는 키워드. 단일 키워드 요청은 그 키워드 (기존 키워드별 수집과 같음),
+    OR 요청은 제목에 매칭된 키워드만 - 본문으로만 걸린 기사는 어느 키워드인지 알 수 없으므로 빈 목록.
+    covered 키워드는 제목에 매칭될 때만 추가"""
+    if len(plan.terms) == 1:
+        return [*plan.terms, *match_keywords(title, plan.covered)]
+    return match_keywords(title, plan.terms + plan.covered)
+
+
+def tag_keywords(entries: list[dict], plan: QueryPlan) -> None:
+    """수집 기사에 "Keywords"(plan_keywords 결과, 빈 목록일 수 있음)를 기록"""
+    for entry in entries:
+        if "Keywords" in entry:
+            continue  # filtered/raw 목록이 같은 dict를 공유
+        entry["Keywords"] = plan_keywords(entry.get("Title", ""), plan)
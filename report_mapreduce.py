@@ -0,0 +1,68 @@
+"""
+report_mapreduce.py
+───────────────────
+기사 묶음(클러스터)별 요약 → 최종 병합으로 리포트를 만드는 map-reduce 모드의 공용 부품.
+Gemini 호출과 최종 프롬프트는 generate_report.py가 담당하고, 여기서는 순수 함수만 둔다.
+
+- 클러스터: 기사의 첫 번째 매칭 키워드(= keywords.json 우선순위가 가장 높은 키워드) 기준으로 묶고,
+  작은 묶음은 "기타"로 합쳐 클러스터 수를 제한
+- map 프롬프트는 클러스터 안에서 [1]..[k] 지역 번호를 쓰고 (작은 번호가 인용 정확도가 높음),
+  응답의 인용을 전체 기사 목록 번호로 바꿔 reduce 단계에 넘긴다
+- 최종 리포트의 인용은 전체 목록 범위를 벗어나면 제거 → inject_links_to_report의 [n] 규칙 유지
+"""
+
+import re
+from typing import NamedTuple
+
+MAX_CLUSTERS      = 6
+MIN_CLUSTER_SIZE  = 4      # 이보다 작은 묶음은 "기타"로
+OTHER_LABEL       = "기타"
+
+_CITATION = re.compile(r"\[(\d+(?:\s*,\s*\d+)*)\]")
+
+
+class Cluster(NamedTuple):
+    label: str
+    articles: list[dict]
+
+
+def cluster_articles(articles: list[dict], max_clusters: int = MAX_CLUSTERS,
+                     min_size: int = MIN_CLUSTER_SIZE) -> list[Cluster]:
+    """키워드 그룹별 클러스터 (키워드 우선순위 순서, "기타"는 마지막)"""
+    groups: dict[str, list[dict]] = {}
+    for item in articles:
+        keywords = item.get("Keywords") or [OTHER_LABEL]
+        groups.setdefault(keywords[0], []).append(item)
+
+    big = [kw for kw, items in groups.items() if kw != OTHER_LABEL and len(items) >= min_size]
+    keep = set(sorted(big, key=lambda kw: -len(groups[kw]))[:max_clusters - 1])
+    clusters = [Cluster(kw, groups[kw]) for kw in groups if kw in keep]
+    others = [item for kw, items in groups.items() if kw not in keep for item in items]
+    if others:
+        clusters.append(Cluster(OTHER_LABEL, others))
+    return clusters
+
+
+def build_map_prompt(label: str, news_context: str) -> str:
+    return f"""당신은 반도체 소재 산업 애널리스트입니다.
+아래는 '{label}' 주제로 묶인 뉴스입니다. 이 뉴스만 근거로 핵심 사실과 의미를 정리하세요.
+
+[작성 원칙] 1) 불릿 4~7개, 각 1~2문장, 중요한 것부터. 2) 모든 불릿 끝에 근거 뉴스 번호 [1][2] 인용.
+3) 뉴스에 없는 내용 추측 금지. 제목 나열/번역 금지.
+
+[뉴스 데이터]
+{news_context}
+"""
+
+
+def remap_citations(text: str, mapping: dict[int, int]) -> str:
+    """[i] / [i, j] 인용을 mapping(지역 번호 → 전체 번호)에 따라 [g_i][g_j]로 바꿈. 없는 번호는 제거."""
+    def _replace(match):
+        numbers = [int(n) for n in re.split(r"\s*,\s*", match.group(1))]
+        return "".join(f"[{mapping[n]}]" for n in numbers if n in mapping)
+    return _CITATION.sub(_replace, text)
+
+
+def sanitize_citations(text: str, total: int) -> str:
+    """전체 기사 수를 벗어난 인용 제거 + [i, j] 형식을 [i][j]로 정리"""
+    return remap_citations(text, {n: n for n in range(1, total + 1)})
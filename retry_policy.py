@@ -0,0 +1,147 @@
+"""
+retry_policy.py
+───────────────
+외부 호출(Gemini / Google News / GitHub) 공용 재시도 정책.
+
+- 지수 백오프 + full jitter: 대기 = uniform(0, min(max_delay, base_delay × 2^n))
+- Retry-After(초 또는 HTTP-date) / GitHub x-ratelimit-reset 헤더가 있으면 그 시각까지 대기
+- 재시도 분류: 연결 오류·타임아웃·408/425/429/5xx·GitHub 2차 rate limit(403)만 재시도,
+  나머지(400/401/404/409 ...)는 즉시 실패
+- 실행 전체 마감(run deadline): generate_report.py는 워크플로 timeout-minutes(15분) 안에 끝나도록
+  시작 시 설정하고, 대기 시간이 마감을 넘기면 재시도하지 않고 마지막 오류를 그대로 올린다
+"""
+
+import email.utils
+import logging
+import random
+import time
+from typing import Callable, TypeVar
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504})
+MIN_CALL_TIMEOUT = 1.0       # 마감 직전이라도 요청 1건에 최소로 주는 시간(초)
+
+T = TypeVar("T")
+
+_run_deadline: float | None = None   # time.monotonic() 기준
+
+
+class DeadlineExceeded(TimeoutError):
+    """실행 전체 마감 시간이 지나 더 이상 외부 호출을 시작하지 않음"""
+
+
+def set_run_deadline(seconds: float | None) -> None:
+    """지금부터 seconds초 뒤를 실행 전체 마감으로 설정 (None이면 해제)"""
+    global _run_deadline
+    _run_deadline = None if seconds is None else time.monotonic() + seconds
+
+
+def run_remaining() -> float | None:
+    """실행 마감까지 남은 시간(초). 마감이 없으면 None."""
+    return None if _run_deadline is None else _run_deadline - time.monotonic()
+
+
+def parse_retry_after(headers) -> float | None:
+    """Retry-After(초 / HTTP-date) 또는 GitHub x-ratelimit-reset(epoch) → 대기 초"""
+    if not headers:
+        return None
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if value:
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+    reset = headers.get("x-ratelimit-reset") or headers.get("X-RateLimit-Reset")
+    remaining = headers.get("x-ratelimit-remaining") or headers.get("X-RateLimit-Remaining")
+    if reset and remaining == "0":
+        try:
+            return max(float(reset) - time.time(), 0.0)
+        except ValueError:
+            return None
+    return None
+
+
+def classify_exception(exc: BaseException) -> tuple[bool, float | None]:
+    """(재시도 여부, 서버가 지정한 대기 초)"""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True, None
+    response = getattr(exc, "response", None)
+    if isinstance(exc, requests.HTTPError) and response is not None:
+        return response.status_code in RETRYABLE_STATUS, parse_retry_after(response.headers)
+    # PyGithub GithubException (github 패키지를 직접 import하지 않고 속성으로 판별)
+    status = getattr(exc, "status", None)
+    if isinstance(status, int):
+        headers = getattr(exc, "headers", None) or {}
+        if status in RETRYABLE_STATUS:
+            return True, parse_retry_after(headers)
+        if status == 403 and "rate limit" in str(getattr(exc, "data", "")).lower():
+            return True, parse_retry_after(headers)
+    return False, None
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 30.0,
+                 budget: float | None = None):
+        """budget: 이 정책으로 감싼 호출 1회(재시도 포함)의 시간 예산(초). 실행 마감과 더 이른 쪽을 따름."""
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        """attempt번째(0부터) 실패 뒤 대기 시간"""
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def stop_at(self, started: float, budget: float | None = None) -> float | None:
+        budget = self.budget if budget is None else budget
+        limits = [t for t in (_run_deadline, started + budget if budget else None) if t is not None]
+        return min(limits) if limits else None
+
+    def timeout(self, default: float, started: float | None = None, budget: float | None = None) -> float:
+        """요청 1건의 timeout: default와 남은 시간 중 작은 값"""
+        stop = self.stop_at(time.monotonic() if started is None else started, budget)
+        if stop is None:
+            return default
+        return max(min(default, stop - time.monotonic()), MIN_CALL_TIMEOUT)
+
+    def should_retry(self, attempt: int, delay: float, started: float, budget: float | None = None) -> bool:
+        """attempt번째 실패 뒤 delay만큼 기다렸다가 다시 시도해도 되는지"""
+        if attempt + 1 >= self.max_attempts:
+            return False
+        stop = self.stop_at(started, budget)
+        return stop is None or time.monotonic() + delay < stop
+
+    def call(self, fn: Callable[[], T], what: str = "",
+             classify: Callable[[BaseException], tuple[bool, float | None]] = classify_exception,
+             budget: float | None = None) -> T:
+        """fn()을 재시도 정책에 따라 호출. 재시도 불가/횟수·마감 소진 시 마지막 예외를 그대로 올림.
+        budget을 주면 이 호출에 한해 정책의 시간 예산 대신 사용."""
+        started = time.monotonic()
+        for attempt in range(self.max_attempts):
+            stop = self.stop_at(started, budget)
+            if stop is not None and time.monotonic() >= stop:
+                raise DeadlineExceeded(f"{what or '외부 호출'}: 실행 마감 시간 초과")
+            try:
+                return fn()
+            except Exception as e:
+                retryable, retry_after = classify(e)
+                delay = self.backoff(attempt, retry_after)
+                if not retryable or not self.should_retry(attempt, delay, started, budget):
+                    raise
+                logger.warning(f"{what} 재시도 {attempt + 1}/{self.max_attempts - 1} ({delay:.1f}s 후): {e}")
+                time.sleep(delay)
+        raise AssertionError("unreachable")
+
+
+# 호출 대상별 기본 정책
+GEMINI_RETRY = RetryPolicy(max_attempts=5, base_delay=2.0, max_delay=30.0)
+FEED_RETRY   = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=2.0)
+GITHUB_RETRY = RetryPolicy(max_attempts=4, base_delay=1.0, max_delay=20.0, budget=60.0)
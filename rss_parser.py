@@ -0,0 +1,151 @@
+"""
+rss_parser.py
+─────────────
+lxml iterparse 기반 Google News RSS 스트리밍 파서.
+
+BeautifulSoup 전체 트리를 만든 뒤 find_all('item')을 돌던 방식 대신,
+<item> 단위로 필요한 4개 필드만 뽑아 가벼운 레코드로 넘기고 처리한 요소는 즉시 비운다.
+키워드별 할당량(시간필터 통과 / 원본)이 모두 차면 나머지 문서는 읽지 않는다.
+pubDate 파싱과 시간필터는 news_window.TimeWindow가 청크 단위로 일괄 처리한다.
+"""
+
+import logging
+from io import BytesIO
+from itertools import islice
+from typing import Callable, Iterator, NamedTuple
+
+from lxml import etree
+
+from news_window import TimeWindow
+
+logger = logging.getLogger(__name__)
+
+
+class RssItem(NamedTuple):
+    title: str | None
+    link: str | None
+    source: str | None
+    pub_date: str | None
+
+
+_FIELDS = {"title": 0, "link": 1, "source": 2, "pubDate": 3}
+
+
+def _text(elem) -> str:
+    # BeautifulSoup의 tag.text와 동일하게 하위 요소 텍스트까지 모두 이어 붙임
+    return "".join(elem.itertext())
+
+
+def iter_items(content: bytes) -> Iterator[RssItem]:
+    """RSS 본문에서 <item>을 순서대로 yield. 없는 필드는 None."""
+    context = etree.iterparse(
+        BytesIO(content), events=("end",), tag="item",
+        recover=True, resolve_entities=False, no_network=True,
+    )
+    try:
+        for _, item in context:
+            values = [None, None, None, None]
+            for child in item:
+                idx = _FIELDS.get(child.tag) if isinstance(child.tag, str) else None
+                if idx is not None and values[idx] is None:
+                    values[idx] = _text(child)
+            yield RssItem(*values)
+            # 처리가 끝난 요소와 앞선 형제를 비워 메모리 사용량을 일정하게 유지
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+    finally:
+        del context
+
+
+def parse_keyword_feed(content: bytes | None, per_kw: int | dict[str, int], window: TimeWindow | None = None,
+                       strip_text: bool = True,
+                       exclude: Callable[[dict], bool] | None = None,
+                       buckets: Callable[[dict], list[str]] | None = None) -> tuple[list[dict], list[dict]]:
+    """단일 키워드 RSS 본문 → (시간필터 통과 목록, 원본 목록), 각각 per_kw건까지.
+
+    window     : 시간 윈도우. None이면 ParsedDate 계산과 시간필터를 생략 (app.py의 strict_time=False)
+    strip_text : 제목/링크/출처 앞뒤 공백 제거 여부 (generate_report.py=True, app.py=False)
+    exclude    : True를 돌려주는 항목은 건너뜀 (이전 리포트가 인용한 기사 → 할당량을 차지하지 않음)
+    buckets    : OR 쿼리 피드용. 항목 → 해당 키워드 목록, per_kw는 {키워드: 할당량}.
+                 항목은 자기 키워드 중 하나라도 할당량이 남았을 때만 받고, 받으면 자기 키워드 모두에 1건으로 센다
+    item을 청크 단위로 읽어 pubDate를 일괄 파싱하고, 할당량이 차면 나머지 문서는 읽지 않는다.
+    문서 중간에서 XML 오류가 나면 그때까지 모은 항목을 그대로 반환한다.
+    """
+    filtered: list[dict] = []
+    raw: list[dict] = []
+    if not content:
+        return filtered, raw
+
+    quotas = per_kw if buckets is not None else {"": per_kw}
+    if buckets is None:
+        buckets = _single_bucket
+    counts_f = dict.fromkeys(quotas, 0)
+    counts_r = dict.fromkeys(quotas, 0)
+    open_f = open_r = sum(q > 0 for q in quotas.values())   # 할당량이 남은 키워드 수
+
+    chunk_size = max(max(quotas.values(), default=0), 8)
+    items = iter_items(content)
+    try:
+        while True:
+            chunk = _slim_entries(islice(items, chunk_size), strip_text)
+            if chunk is None:
+                break
+            if window is not None:
+                epochs = window.parse([entry["Date"] for entry in chunk])
+                valid  = window.mask(epochs)
+                for entry, label in zip(chunk, window.labels(epochs)):
+                    entry["ParsedDate"] = label
+            else:
+                valid = [True] * len(chunk)
+            for entry, is_valid in zip(chunk, valid):
+                if exclude is not None and exclude(entry):
+                    continue
+                keys = [key for key in buckets(entry) if key in quotas]
+                if _take(counts_r, quotas, keys):
+                    raw.append(entry)
+                    open_r = sum(counts_r[k] < quotas[k] for k in quotas)
+                if is_valid and _take(counts_f, quotas, keys):
+                    filtered.append(entry)
+                    open_f = sum(counts_f[k] < quotas[k] for k in quotas)
+                if not open_f and not open_r:
+                    return filtered, raw  # 할당량 충족 → 나머지 문서는 파싱하지 않음
+    except etree.LxmlError as e:
+        logger.warning(f"RSS 파싱 중단 (부분 결과 사용): {e}")
+    finally:
+        items.close()
+    return filtered, raw
+
+
+def _single_bucket(entry: dict) -> list[str]:
+    return [""]
+
+
+def _take(counts: dict[str, int], quotas: dict[str, int], keys: list[str]) -> bool:
+    """keys 중 하나라도 할당량이 남았으면 keys 모두에 1건을 세고 True"""
+    if not any(counts[k] < quotas[k] for k in keys):
+        return False
+    for k in keys:
+        counts[k] += 1
+    return True
+
+
+def _slim_entries(items, strip_text: bool) -> list[dict] | None:
+    """RssItem 묶음 → 히스토리 형식 dict 목록 (제목 없는 항목 제외). 더 읽을 item이 없으면 None."""
+    entries, seen_any = [], False
+    for item in items:
+        seen_any = True
+        title = item.title or ""
+        if strip_text:
+            title = title.strip()
+        if not title:
+            continue
+        link = item.link or ""
+        src  = item.source if item.source is not None else "Google News"
+        if strip_text:
+            link, src = link.strip(), src.strip()
+        entries.append({
+            "Title": title, "Link": link, "Date": item.pub_date or "",
+            "Source": src, "ParsedDate": None,
+        })
+    return entries if seen_any else None
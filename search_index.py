@@ -0,0 +1,185 @@
+"""
+search_index.py
+───────────────
+리포트 아카이브 전문 검색용 역색인 (history/search_index.json, app.py 검색창).
+
+- 토큰: 한글은 띄어쓰기·조사와 무관하게 찾도록 글자 2-gram ("하이브리드" → 하이/이브/브리/리드),
+  영문·숫자는 단어 단위 (소문자, "HBM4" → "hbm4"). HTML 태그·URL·인용 번호는 제외
+- 문서 = 날짜 1건: Daily Report + 카테고리 리포트 본문 + 참고 기사 제목 (제목은 TITLE_WEIGHT배 가중)
+- 검색: 질의의 모든 토큰을 포함한 날짜만 (AND) → BM25 점수순. 한 글자 한글·영문 토큰은 접두어로 확장
+  ("hbm" → hbm3e, hbm4 ...)
+- 저장 형식: 날짜를 번호로 바꾼 posting 목록 {토큰: [번호, 빈도, 번호, 빈도, ...]}.
+  날짜 추가/교체/삭제는 해당 번호만 고치는 증분 갱신 (history_store.stage_entry가 저장 때마다 호출)
+"""
+
+import bisect
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import NamedTuple
+
+INDEX_VERSION = 1
+TITLE_WEIGHT  = 3      # 기사 제목에 나온 토큰의 빈도 가중치 (본문 1회 = 1)
+SEARCH_LIMIT  = 20
+BM25_K1       = 1.2
+BM25_B        = 0.75
+
+_NOISE = re.compile(r"<[^>]+>|https?://\S+|\[\d+\]")
+_RUN   = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+
+class SearchHit(NamedTuple):
+    date: str
+    score: float
+
+
+def _is_hangul(run: str) -> bool:
+    return "가" <= run[0] <= "힣"
+
+
+def _runs(text: str) -> list[str]:
+    text = unicodedata.normalize("NFKC", _NOISE.sub(" ", text or "")).lower()
+    return _RUN.findall(text)
+
+
+def tokenize(text: str) -> list[str]:
+    """본문 → 색인 토큰 (한글 2-gram / 영문·숫자 단어)"""
+    terms = []
+    for run in _runs(text):
+        if _is_hangul(run) and len(run) > 1:
+            terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            terms.append(run)
+    return terms
+
+
+def entry_terms(entry: dict) -> Counter:
+    """날짜 1건 → 토큰 빈도 (리포트 본문 + 기사 제목 가중)"""
+    sections = [entry] + [s for s in (entry.get("categories") or {}).values() if isinstance(s, dict)]
+    counts = Counter()
+    titles = set()
+    for section in sections:
+        counts.update(tokenize(section.get("report", "")))
+        titles.update(item.get("Title", "") for item in section.get("articles") or [] if isinstance(item, dict))
+    for title in titles:
+        for term in tokenize(title):
+            counts[term] += TITLE_WEIGHT
+    return counts
+
+
+class SearchIndex:
+    def __init__(self):
+        self.dates: list[str | None] = []      # 번호 → 날짜 (삭제된 번호는 None, 다음 추가 때 재사용)
+        self.lengths: list[int] = []           # 번호 → 문서 길이 (BM25 정규화)
+        self.postings: dict[str, list[int]] = {}
+        self._vocab: list[str] | None = None   # 접두어 확장용 정렬 목록 (검색 시 한 번 만듦)
+
+    @classmethod
+    def from_json(cls, data) -> "SearchIndex | None":
+        """저장된 색인 → SearchIndex. 없거나 형식 버전이 다르면 None (호출 측이 다시 만듦)"""
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+        index = cls()
+        index.dates = list(data["dates"])
+        index.lengths = list(data["lengths"])
+        index.postings = data["postings"]
+        return index
+
+    def to_json(self) -> dict:
+        return {"version": INDEX_VERSION, "dates": self.dates, "lengths": self.lengths, "postings": self.postings}
+
+    def __len__(self) -> int:
+        return sum(date is not None for date in self.dates)
+
+    def __contains__(self, date_str: str) -> bool:
+        return date_str in self.dates
+
+    # ── 증분 갱신 ────────────────────────────────────────────
+    def add(self, entry: dict) -> None:
+        """날짜 1건 추가 (같은 날짜가 있으면 교체)"""
+        self.remove(entry["date"])
+        doc = self.dates.index(None) if None in self.dates else len(self.dates)
+        if doc == len(self.dates):
+            self.dates.append(None)
+            self.lengths.append(0)
+        counts = entry_terms(entry)
+        self.dates[doc] = entry["date"]
+        self.lengths[doc] = sum(counts.values())
+        for term, tf in counts.items():
+            self.postings.setdefault(term, []).extend((doc, tf))
+        self._vocab = None
+
+    def remove(self, date_str: str) -> None:
+        if date_str not in self.dates:
+            return
+        doc = self.dates.index(date_str)
+        for term in list(self.postings):
+            pairs = self.postings[term]
+            kept = [v for i in range(0, len(pairs), 2) if pairs[i] != doc for v in pairs[i:i + 2]]
+            if not kept:
+                del self.postings[term]
+            elif len(kept) != len(pairs):
+                self.postings[term] = kept
+        self.dates[doc] = None
+        self.lengths[doc] = 0
+        self._vocab = None
+
+    def prune(self, limit: int) -> None:
+        """최신 limit개 날짜만 유지 (manifest 보관 기간과 맞춤)"""
+        live = sorted((date for date in self.dates if date is not None), reverse=True)
+        for date_str in live[limit:]:
+            self.remove(date_str)
+
+    # ── 검색 ────────────────────────────────────────────────
+    def _expand(self, term: str) -> list[str]:
+        """한 글자 한글·영문 토큰 → 그 글자/단어로 시작하는 색인 토큰들"""
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        start = bisect.bisect_left(self._vocab, term)
+        end = bisect.bisect_left(self._vocab, term + "\U0010ffff")
+        return self._vocab[start:end]
+
+    def _query_groups(self, query: str) -> list[list[str]]:
+        """질의 → [[대체 토큰 ...], ...] (그룹 사이는 AND, 그룹 안은 OR)"""
+        groups, seen = [], set()
+        for run in _runs(query):
+            if _is_hangul(run) and len(run) > 1:
+                grams = [[run[i:i + 2]] for i in range(len(run) - 1)]
+            else:
+                grams = [self._expand(run)]
+            for group in grams:
+                key = tuple(group)
+                if key not in seen:
+                    seen.add(key)
+                    groups.append(group)
+        return groups
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> list[SearchHit]:
+        groups = self._query_groups(query)
+        n_docs = len(self)
+        if not groups or not n_docs:
+            return []
+        avg_len = sum(self.lengths) / n_docs or 1.0
+
+        scores: dict[int, float] | None = None
+        for group in groups:
+            group_scores: dict[int, float] = {}
+            for term in group:
+                pairs = self.postings.get(term, [])
+                df = len(pairs) // 2
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for i in range(0, len(pairs), 2):
+                    doc, tf = pairs[i], pairs[i + 1]
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc] / avg_len)
+                    group_scores[doc] = group_scores.get(doc, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+            if scores is None:
+                scores = group_scores
+            else:
+                scores = {doc: score + group_scores[doc] for doc, score in scores.items() if doc in group_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: self.dates[item[0]], reverse=True)   # 동점이면 최신 날짜 먼저
+        ranked.sort(key=lambda item: -item[1])
+        return [SearchHit(self.dates[doc], round(score, 3)) for doc, score in ranked[:limit]]
@@ -0,0 +1,117 @@
+"""
+seen_index.py
+─────────────
+이전 날짜 리포트가 이미 인용한 기사 색인 (history/seen_articles.json).
+
+RSS 쿼리의 when:2d는 전날 수집 범위와 겹치고, 시간필터 폴백은 필터 전 원본을 다시 쓰므로
+같은 기사가 며칠 연속 리포트에 들어가곤 한다. 저장할 때 그날 인용한 기사의 키를 날짜별로 남겨 두고,
+fetch_news가 파싱 단계에서(할당량·기사 예산 계산 전에) 이미 인용된 기사를 건너뛴다.
+
+- 키: 정규화 제목(news_dedupe.normalize_title) + 링크 (Google News 기사 ID / 원문 URL, Alternates 포함).
+  8바이트 blake2b 해시만 저장 (원문 제목·URL을 다시 보관하지 않음, 충돌 확률 무시 가능)
+- 수집 시점의 Link는 아직 Google News 링크 → 링크 캐시(.cache/links.json)에 변환 결과가 있으면
+  원문 URL 키로도 대조 (추가 요청 없음)
+- 날짜별 키 목록이라 만료가 단순: 저장 때마다 SEEN_DAYS일보다 오래된 날짜를 버림
+- 대조는 기준 날짜 이전 날짜만 → 같은 날 리포트를 다시 만들 때 그날 기사가 빠지지 않음
+"""
+
+import hashlib
+from datetime import date, timedelta
+
+from link_resolver import canonicalize, google_article_id, load_link_cache
+from news_dedupe import normalize_title
+
+INDEX_VERSION   = 1
+SEEN_DAYS       = 7      # 이 기간 안에 인용된 기사는 다시 수집하지 않음
+HASH_BYTES      = 8
+MIN_TITLE_CHARS = 8      # 정규화 제목이 이보다 짧으면 제목 키를 만들지 않음 (일반적인 짧은 제목 오탐 방지)
+
+
+def _digest(key: str) -> str:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=HASH_BYTES).hexdigest()
+
+
+def _link_keys(link: str, link_cache: dict | None) -> list[str]:
+    if not link:
+        return []
+    article_id = google_article_id(link)
+    if article_id is None:
+        return ["u:" + canonicalize(link)]
+    keys = ["g:" + article_id]
+    resolved = ((link_cache or {}).get(link) or {}).get("url")
+    if resolved:
+        keys.append("u:" + canonicalize(resolved))
+    return keys
+
+
+def article_keys(article: dict, link_cache: dict | None = None) -> set[str]:
+    """기사 1건 → 대조용 키 해시 (제목 + 대표/Alternates 링크)"""
+    keys = []
+    title = normalize_title(article.get("Title", ""), article.get("Source", ""))
+    if len(title) >= MIN_TITLE_CHARS:
+        keys.append("t:" + title)
+    for alt in [article] + list(article.get("Alternates") or []):
+        keys.extend(_link_keys(alt.get("Link", ""), link_cache))
+    return {_digest(key) for key in keys}
+
+
+class SeenFilter:
+    """fetch_news의 exclude 판별 함수 (제외한 건수를 세어 로그에 씀)"""
+
+    def __init__(self, hashes: set[str], link_cache: dict):
+        self.hashes = hashes
+        self.link_cache = link_cache
+        self.skipped = 0
+
+    def __call__(self, article: dict) -> bool:
+        if self.hashes.isdisjoint(article_keys(article, self.link_cache)):
+            return False
+        self.skipped += 1
+        return True
+
+
+class SeenIndex:
+    def __init__(self):
+        self.days: dict[str, list[str]] = {}   # 날짜 → 그날 리포트가 인용한 기사 키 해시
+
+    @classmethod
+    def from_json(cls, data) -> "SeenIndex | None":
+        """저장된 색인 → SeenIndex. 없거나 형식 버전이 다르면 None"""
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return None
+        index = cls()
+        index.days = dict(data["days"])
+        return index
+
+    def to_json(self) -> dict:
+        return {"version": INDEX_VERSION, "days": dict(sorted(self.days.items(), reverse=True))}
+
+    def add(self, date_str: str, articles: list[dict]) -> None:
+        """그날 인용한 기사 기록 (같은 날짜는 교체 - 리포트 재생성 시 최신 기사 목록 기준)"""
+        hashes: set[str] = set()
+        for article in articles:
+            if isinstance(article, dict):
+                hashes |= article_keys(article)
+        self.days[date_str] = sorted(hashes)
+
+    def expire(self, today: str, keep_days: int = SEEN_DAYS) -> None:
+        cutoff = (date.fromisoformat(today) - timedelta(days=keep_days)).isoformat()
+        self.days = {d: hashes for d, hashes in self.days.items() if d >= cutoff}
+
+    def checker(self, before: str, keep_days: int = SEEN_DAYS, link_cache: dict | None = None) -> SeenFilter:
+        """before 날짜 직전 keep_days일 동안 인용된 기사를 거르는 판별 함수"""
+        cutoff = (date.fromisoformat(before) - timedelta(days=keep_days)).isoformat()
+        hashes = set()
+        for d, day_hashes in self.days.items():
+            if cutoff <= d < before:
+                hashes.update(day_hashes)
+        return SeenFilter(hashes, load_link_cache() if link_cache is None else link_cache)
+
+
+def entry_articles(entry: dict) -> list[dict]:
+    """히스토리 항목 1건이 인용한 기사 전체 (Daily Report + 카테고리 리포트)"""
+    articles = list(entry.get("articles") or [])
+    for section in (entry.get("categories") or {}).values():
+        if isinstance(section, dict):
+            articles.extend(section.get("articles") or [])
+    return articles
@@ -0,0 +1,307 @@
+"""
+sqlite_store.py
+───────────────
+자체 호스팅용 SQLite 저장소 (HISTORY_BACKEND=sqlite). GitHubStore와 같은 read_json / commit 인터페이스라
+app.py / generate_report.py의 로드·저장 함수와 history_store 레이아웃 코드가 그대로 동작한다.
+
+- 날짜 파일(history/YYYY-MM-DD.json)은 파일이 아니라 표로: reports(날짜 × 카테고리), articles,
+  article_keywords("Keywords" 태그). 날짜·출처·키워드 인덱스로 전체 로드 없이 조회 (entry / articles)
+- keywords.json은 keywords 표 (카테고리 × 순서), manifest·검색 색인 등 나머지 파일은 files 표에 JSON 그대로
+- WAL 모드: 읽기는 쓰기를 막지 않고, commit은 BEGIN IMMEDIATE 트랜잭션 1개
+  (update 함수도 같은 트랜잭션 안에서 현재 내용을 읽어 적용 → GitHub의 CAS 재시도가 필요 없음,
+  동시에 쓰는 프로세스는 busy_timeout 동안 대기)
+- 기존 daily_history.json과의 가져오기/내보내기:
+    python sqlite_store.py import [daily_history.json] [--keywords keywords.json] [--db history.db]
+    python sqlite_store.py export [daily_history.json] [--db history.db]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+from contextlib import closing, contextmanager
+
+from github_store import Batch
+from history_codec import decode_document
+from history_store import HISTORY_DIR, LEGACY_HISTORY_FILE, MAX_HISTORY, stage_entry
+
+logger = logging.getLogger(__name__)
+
+HISTORY_BACKEND = os.environ.get("HISTORY_BACKEND", "github")   # "github" | "sqlite"
+HISTORY_DB      = os.environ.get("HISTORY_DB", "history.db")
+BUSY_TIMEOUT    = 30          # 다른 프로세스가 쓰는 중일 때 대기 (초)
+KEYWORD_FILE    = "keywords.json"
+TOP_LEVEL       = ""          # reports.category: 최상위(Daily Report) 항목
+
+_SHARD = re.compile(rf"^{re.escape(HISTORY_DIR)}/(\d{{4}}-\d{{2}}-\d{{2}})\.json$")
+_SECTION_KEYS = ("report", "articles", "categories", "date")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    date           TEXT NOT NULL,
+    category       TEXT NOT NULL,          -- '' = 최상위 (Daily Report)
+    position       INTEGER NOT NULL,       -- 카테고리 순서
+    report         TEXT NOT NULL,
+    auto_generated INTEGER NOT NULL DEFAULT 0,
+    generated_at   TEXT NOT NULL DEFAULT '',
+    extra          TEXT NOT NULL DEFAULT '{}',   -- report/articles/categories 외 필드 (무손실 복원용)
+    PRIMARY KEY (date, category)
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id       INTEGER PRIMARY KEY,
+    date     TEXT NOT NULL,
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title    TEXT NOT NULL,
+    link     TEXT NOT NULL,
+    source   TEXT NOT NULL,
+    pub_date TEXT NOT NULL,
+    data     TEXT NOT NULL,                -- 기사 dict 원본 (JSON)
+    FOREIGN KEY (date, category) REFERENCES reports (date, category) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS article_keywords (
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    keyword    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    keyword  TEXT NOT NULL,
+    PRIMARY KEY (category, position)
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_date     ON reports (date);
+CREATE INDEX IF NOT EXISTS idx_articles_section ON articles (date, category, position);
+CREATE INDEX IF NOT EXISTS idx_articles_source  ON articles (source, date);
+CREATE INDEX IF NOT EXISTS idx_article_keywords ON article_keywords (keyword, article_id);
+CREATE INDEX IF NOT EXISTS idx_keywords_article ON article_keywords (article_id);
+"""
+
+
+class SqliteStore:
+    def __init__(self, path: str = HISTORY_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")   # DB 파일에 유지되는 설정
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # 연결은 호출마다 새로 (Streamlit 세션 스레드 간 공유 금지), autocommit 모드에서 트랜잭션은 직접 시작
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    # ── 읽기 ────────────────────────────────────────────────
+    def read_json(self, path: str, default, strict: bool = False, ref: str | None = None):
+        """GitHubStore.read_json과 같은 규약 (ref는 무시 - 항상 최신 커밋 상태)"""
+        try:
+            with closing(self._connect()) as conn:
+                data = self._read(conn, path)
+        except sqlite3.Error as e:
+            if strict:
+                raise
+            logger.warning(f"SQLite 읽기 실패 [{path}]: {e}")
+            return default
+        return default if data is None else data
+
+    def _read(self, conn: sqlite3.Connection, path: str):
+        shard = _SHARD.match(path)
+        if shard:
+            return self._entry(conn, shard.group(1))
+        if path == KEYWORD_FILE:
+            return self._keywords(conn)
+        row = conn.execute("SELECT data FROM files WHERE path = ?", (path,)).fetchone()
+        return decode_document(json.loads(row[0])) if row else None
+
+    def entry(self, date_str: str) -> dict | None:
+        """날짜 1건 (다른 날짜는 읽지 않음)"""
+        with closing(self._connect()) as conn:
+            return self._entry(conn, date_str)
+
+    def _entry(self, conn: sqlite3.Connection, date_str: str) -> dict | None:
+        reports = conn.execute("SELECT category, report, extra FROM reports WHERE date = ? ORDER BY position",
+                               (date_str,)).fetchall()
+        if not reports:
+            return None
+        articles: dict[str, list[dict]] = {}
+        for category, data in conn.execute("SELECT category, data FROM articles WHERE date = ? "
+                                           "ORDER BY category, position", (date_str,)):
+            articles.setdefault(category, []).append(json.loads(data))
+
+        entry: dict = {"date": date_str}
+        categories = {}
+        for category, report, extra in reports:
+            section = {"report": report, "articles": articles.get(category, []), **json.loads(extra)}
+            if category == TOP_LEVEL:
+                entry.update(section)
+            else:
+                categories[category] = section
+        if categories:
+            entry["categories"] = categories
+        return entry
+
+    def dates(self, limit: int | None = None) -> list[str]:
+        """저장된 날짜 (최신순)"""
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT DISTINCT date FROM reports ORDER BY date DESC LIMIT ?",
+                                (-1 if limit is None else limit,)).fetchall()
+        return [date_str for (date_str,) in rows]
+
+    def articles(self, since: str = "", until: str = "9999-12-31", source: str | None = None,
+                 keyword: str | None = None, limit: int = 200) -> list[dict]:
+        """기간·출처·키워드로 인용 기사 조회 (인덱스 사용, 최신순). 각 기사에 "date"/"category" 추가"""
+        sql = "SELECT a.date, a.category, a.data FROM articles a"
+        params: list = []
+        if keyword is not None:
+            sql += " JOIN article_keywords k ON k.article_id = a.id AND k.keyword = ?"
+            params.append(keyword)
+        sql += " WHERE a.date BETWEEN ? AND ?"
+        params += [since, until]
+        if source is not None:
+            sql += " AND a.source = ?"
+            params.append(source)
+        sql += " ORDER BY a.date DESC, a.category, a.position LIMIT ?"
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            return [{**json.loads(data), "date": d, "category": c or None}
+                    for d, c, data in conn.execute(sql, params)]
+
+    def _keywords(self, conn: sqlite3.Connection) -> dict | None:
+        rows = conn.execute("SELECT category, keyword FROM keywords ORDER BY rowid").fetchall()
+        if not rows:
+            return None
+        result: dict[str, list[str]] = {}
+        for category, keyword in rows:
+            result.setdefault(category, []).append(keyword)
+        return result
+
+    # ── 쓰기 ────────────────────────────────────────────────
+    def commit(self, batch: Batch, message: str) -> dict[str, object]:
+        """batch를 트랜잭션 1개로 반영. 반환: 경로 → 실제로 저장한 내용 (GitHubStore.commit과 같음)"""
+        if not batch:
+            return {}
+        with self._transaction() as conn:
+            contents = dict(batch.puts)
+            for path, fn in batch.updates.items():
+                contents[path] = fn(self._read(conn, path))
+            for path, data in contents.items():
+                self._write(conn, path, data)
+            for path in batch.deletes:
+                self._delete(conn, path)
+        logger.info(f"SQLite 커밋: {message} ({len(contents)}개 파일)")
+        return contents
+
+    def _write(self, conn: sqlite3.Connection, path: str, data) -> None:
+        shard = _SHARD.match(path)
+        if shard:
+            self._write_entry(conn, shard.group(1), decode_document(data))
+        elif path == KEYWORD_FILE:
+            conn.execute("DELETE FROM keywords")
+            conn.executemany("INSERT INTO keywords (category, position, keyword) VALUES (?, ?, ?)",
+                             [(category, i, kw) for category, kws in data.items() if isinstance(kws, list)
+                              for i, kw in enumerate(kws)])
+        else:
+            conn.execute("INSERT INTO files (path, data) VALUES (?, ?) "
+                         "ON CONFLICT (path) DO UPDATE SET data = excluded.data",
+                         (path, json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)))
+
+    def _delete(self, conn: sqlite3.Connection, path: str) -> None:
+        shard = _SHARD.match(path)
+        if shard:
+            conn.execute("DELETE FROM reports WHERE date = ?", (shard.group(1),))
+        else:
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _write_entry(self, conn: sqlite3.Connection, date_str: str, entry: dict) -> None:
+        conn.execute("DELETE FROM reports WHERE date = ?", (date_str,))   # articles/article_keywords는 CASCADE
+        sections = [(TOP_LEVEL, entry)] + list((entry.get("categories") or {}).items())
+        for position, (category, section) in enumerate(sections):
+            extra = {k: v for k, v in section.items() if k not in _SECTION_KEYS}
+            conn.execute(
+                "INSERT INTO reports (date, category, position, report, auto_generated, generated_at, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (date_str, category, position, section.get("report", ""), bool(entry.get("auto_generated")),
+                 entry.get("generated_at", ""), json.dumps(extra, ensure_ascii=False, default=str)))
+            for i, article in enumerate(section.get("articles") or []):
+                cursor = conn.execute(
+                    "INSERT INTO articles (date, category, position, title, link, source, pub_date, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (date_str, category, i, article.get("Title", ""), article.get("Link", ""),
+                     article.get("Source", ""), article.get("Date", ""),
+                     json.dumps(article, ensure_ascii=False, default=str)))
+                conn.executemany("INSERT INTO article_keywords (article_id, keyword) VALUES (?, ?)",
+                                 [(cursor.lastrowid, kw) for kw in dict.fromkeys(article.get("Keywords") or ())])
+
+
+# ── daily_history.json 가져오기 / 내보내기 ──────────────────
+def import_legacy(store: SqliteStore, history_path: str = LEGACY_HISTORY_FILE,
+                  keywords_path: str | None = None, limit: int = MAX_HISTORY) -> int:
+    """기존 단일 파일의 최신 limit개 항목을 오래된 날짜부터 저장 (manifest·색인·집계도 저장 경로 그대로 생성).
+    반환: 실제로 저장한 건수"""
+    with open(history_path, "r", encoding="utf-8") as f:
+        history = [h for h in json.load(f) if isinstance(h, dict) and h.get("date")]
+
+    def _read(path, default):
+        return store.read_json(path, default, strict=True)
+
+    imported = 0
+    for entry in sorted(history, key=lambda h: h["date"])[-limit:]:
+        batch = Batch()
+        stage_entry(_read, batch, entry, limit)
+        store.commit(batch, f"Import history {entry['date']}")
+        imported += 1
+    if keywords_path and os.path.exists(keywords_path):
+        with open(keywords_path, "r", encoding="utf-8") as f:
+            batch = Batch()
+            batch.put(KEYWORD_FILE, json.load(f))
+            store.commit(batch, f"Import {KEYWORD_FILE}")
+    return imported
+
+
+def export_legacy(store: SqliteStore, history_path: str = LEGACY_HISTORY_FILE, limit: int | None = None) -> int:
+    """저장된 항목을 기존 daily_history.json 형식(최신순 배열)으로 내보냄. 반환: 건수"""
+    history = [store.entry(date_str) for date_str in store.dates(limit)]
+    with open(history_path, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2, default=str)
+    return len(history)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    parser = argparse.ArgumentParser(description="SQLite 히스토리 저장소 ↔ daily_history.json")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", nargs="?", default=LEGACY_HISTORY_FILE)
+    parser.add_argument("--db", default=HISTORY_DB)
+    parser.add_argument("--keywords", default=None, help="import 시 함께 가져올 keywords.json")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    store = SqliteStore(args.db)
+    if args.command == "import":
+        count = import_legacy(store, args.path, args.keywords, args.limit or MAX_HISTORY)
+        print(f"{args.path} → {args.db}: {count}건")
+    else:
+        count = export_legacy(store, args.path, args.limit)
+        print(f"{args.db} → {args.path}: {count}건")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+trend_rollup.py
+───────────────
+키워드/출처/카테고리/시간대별 기사 수 일별 집계 (history/trends.json, app.py 트렌드 대시보드).
+
+대시보드가 매 rerun마다 모든 날짜 파일의 기사 목록을 훑지 않도록, 저장할 때(history_store.stage_entry)
+그날 항목의 집계 1행만 계산해 rollup 파일에 끼워 넣는다 (같은 날짜는 교체, MAX_HISTORY일 유지).
+
+하루 집계 = {
+  "articles":   그날 인용한 고유 기사 수 (Daily Report + 카테고리 리포트, 링크/제목 기준 중복 제거),
+  "keywords":   {키워드: 기사 수}   - 수집 시 붙은 "Keywords" 태그 (태그가 없는 옛 기사는 제외),
+  "sources":    {매체: 기사 수},
+  "categories": {카테고리: 리포트 인용 기사 수} (Daily Report 포함),
+  "windows":    {"06-09": 기사 수, ...} - 보도 시각(KST) TIME_WINDOW_H시간 단위,
+}
+"""
+
+from collections import Counter
+
+from news_window import KST_OFFSET, parse_pubdate
+
+ROLLUP_VERSION = 1
+TIME_WINDOW_H  = 3
+DAILY_REPORT   = "Daily Report"   # 최상위 report/articles의 카테고리 이름 (app.py / generate_report.py와 같음)
+
+
+def time_window(date_raw: str) -> str | None:
+    """pubDate → KST 시간대 구간 이름 ("06-09"). 해석 불가면 None"""
+    epoch = parse_pubdate(date_raw or "")
+    if epoch is None:
+        return None
+    start = (epoch + KST_OFFSET) % 86400 // 3600 // TIME_WINDOW_H * TIME_WINDOW_H
+    return f"{start:02d}-{start + TIME_WINDOW_H:02d}"
+
+
+def summarize_entry(entry: dict) -> dict:
+    """히스토리 항목 1건 → 하루 집계 행"""
+    sections = {DAILY_REPORT: entry}
+    sections.update({name: s for name, s in (entry.get("categories") or {}).items() if isinstance(s, dict)})
+
+    unique: dict[str, dict] = {}
+    categories = Counter()
+    for name, section in sections.items():
+        articles = [a for a in section.get("articles") or [] if isinstance(a, dict)]
+        categories[name] = len(articles)
+        for article in articles:
+            unique.setdefault(article.get("Link") or article.get("Title", ""), article)
+
+    keywords, sources, windows = Counter(), Counter(), Counter()
+    for article in unique.values():
+        keywords.update(set(article.get("Keywords") or ()))
+        sources[article.get("Source") or "Unknown"] += 1
+        window = time_window(article.get("Date", ""))
+        if window:
+            windows[window] += 1
+    return {
+        "articles":   len(unique),
+        "keywords":   dict(keywords.most_common()),
+        "sources":    dict(sources.most_common()),
+        "categories": dict(categories),
+        "windows":    dict(sorted(windows.items())),
+    }
+
+
+class TrendRollup:
+    def __init__(self):
+        self.days: dict[str, dict] = {}   # 날짜 → summarize_entry 결과
+
+    @classmethod
+    def from_json(cls, data) -> "TrendRollup | None":
+        """저장된 집계 → TrendRollup. 없거나 형식 버전이 다르면 None (호출 측이 다시 만듦)"""
+        if not isinstance(data, dict) or data.get("version") != ROLLUP_VERSION:
+            return None
+        rollup = cls()
+        rollup.days = dict(data["days"])
+        return rollup
+
+    def to_json(self) -> dict:
+        return {"version": ROLLUP_VERSION, "days": dict(sorted(self.days.items(), reverse=True))}
+
+    def add(self, entry: dict) -> None:
+        self.days[entry["date"]] = summarize_entry(entry)
+
+    def prune(self, limit: int) -> None:
+        self.days = dict(sorted(self.days.items(), reverse=True)[:limit])
+
+    def series(self, field: str, top: int | None = None, since: str = "") -> tuple[list[str], dict[str, list[int]]]:
+        """field("keywords"/"sources"/"categories"/"windows")의 날짜 오름차순 시계열.
+        반환: (날짜 목록, {이름: 날짜별 기사 수}) - top이면 기간 합계 상위 top개만"""
+        dates = sorted(d for d in self.days if d >= since)
+        totals = Counter()
+        for d in dates:
+            totals.update(self.days[d].get(field) or {})
+        names = [name for name, _ in totals.most_common(top)]
+        return dates, {name: [(self.days[d].get(field) or {}).get(name, 0) for d in dates] for name in names}